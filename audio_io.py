@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+In-memory audio loading for Whisper
+A single ffmpeg process decodes the input to raw 16 kHz mono PCM on a pipe,
+read straight into a preallocated NumPy buffer - no temporary WAV files.
+"""
+
+import json
+import subprocess
+import tempfile
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator, NamedTuple, Optional, Tuple, Union
+
+if TYPE_CHECKING:
+    import numpy as np
+
+SAMPLE_RATE = 16000
+
+# Output formats ffmpeg can write to the pipe and their NumPy dtypes
+SAMPLE_FORMATS = {
+    "f32le": "float32",
+    "s16le": "int16",
+}
+
+
+class AudioDecodeError(RuntimeError):
+    """ffmpeg could not decode the input"""
+
+
+class AudioDecodeInterrupted(AudioDecodeError):
+    """ffmpeg timed out or was killed by a signal; the input itself may be fine"""
+
+
+class MediaInfo(NamedTuple):
+    path: str
+    duration: Optional[float]
+    codec: Optional[str]
+    channels: Optional[int]
+    layout: Optional[str]
+    error: Optional[str]
+
+
+def probe_media(path: Union[str, Path]) -> MediaInfo:
+    """Duration and first audio stream of a file; error is set when it can't be decoded"""
+    try:
+        result = subprocess.run(
+            ["ffprobe", "-v", "error", "-select_streams", "a:0",
+             "-show_entries", "format=duration:stream=codec_name,channels,channel_layout",
+             "-of", "json", str(path)],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            timeout=30
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        # No ffprobe (or it hung): unknown, not undecodable; ffmpeg gets to try
+        return MediaInfo(str(path), None, None, None, None, None)
+    if result.returncode != 0:
+        msg = result.stderr.decode(errors="replace").strip().splitlines()
+        return MediaInfo(str(path), None, None, None, None, msg[-1] if msg else "ffprobe failed")
+    try:
+        data = json.loads(result.stdout or b"{}")
+    except ValueError:
+        data = {}
+    streams = data.get("streams") or []
+    try:
+        duration = float(data.get("format", {}).get("duration"))
+    except (TypeError, ValueError):
+        duration = None
+    if not streams:
+        return MediaInfo(str(path), duration, None, None, None, "no audio stream")
+    stream = streams[0]
+    error = "zero duration" if duration is not None and duration <= 0 else None
+    return MediaInfo(str(path), duration, stream.get("codec_name"), stream.get("channels"),
+                     stream.get("channel_layout"), error)
+
+
+def probe_duration(path: Union[str, Path]) -> Optional[float]:
+    """Media duration in seconds via ffprobe, or None if unknown"""
+    return probe_media(path).duration
+
+
+def ffmpeg_pcm_command(
+    path: Union[str, Path],
+    sample_rate: int = SAMPLE_RATE,
+    sample_format: str = "f32le",
+    start: Optional[float] = None,
+    duration: Optional[float] = None
+) -> list:
+    """ffmpeg arguments that write raw mono PCM to stdout"""
+    cmd = ["ffmpeg", "-nostdin", "-loglevel", "error", "-threads", "0"]
+    if start:
+        cmd += ["-ss", f"{start:.3f}"]
+    cmd += ["-i", str(path)]
+    if duration is not None:
+        cmd += ["-t", f"{duration:.3f}"]
+    cmd += ["-vn", "-f", sample_format, "-acodec", f"pcm_{sample_format}",
+            "-ac", "1", "-ar", str(sample_rate), "-"]
+    return cmd
+
+
+def load_audio(
+    path: Union[str, Path],
+    sample_rate: int = SAMPLE_RATE,
+    sample_format: str = "f32le",
+    timeout: Optional[float] = None,
+    duration: Optional[float] = None,
+    expected_s: Optional[float] = None
+) -> "np.ndarray":
+    """Decode any audio/video file (or its first duration seconds) to a float32 mono waveform in [-1, 1]
+
+    expected_s is the already probed length of the input; it only sizes the
+    buffer and saves another ffprobe run.
+    """
+    import numpy as np
+    if sample_format not in SAMPLE_FORMATS:
+        raise ValueError(f"Unsupported sample format: {sample_format}")
+    dtype = np.dtype(SAMPLE_FORMATS[sample_format])
+
+    # Size the buffer from the container duration (+1 s slack); grow if it lies
+    length = duration if duration is not None else expected_s or probe_duration(path)
+    capacity = int(length * sample_rate) + sample_rate if length else 60 * sample_rate
+    buf = np.empty(capacity, dtype=dtype)
+
+    proc = subprocess.Popen(
+        ffmpeg_pcm_command(path, sample_rate, sample_format, duration=duration),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE
+    )
+    timed_out = threading.Event()
+
+    def kill():
+        timed_out.set()
+        proc.kill()
+
+    timer = threading.Timer(timeout, kill) if timeout else None
+    if timer:
+        timer.start()
+    try:
+        filled = 0  # bytes
+        while True:
+            view = memoryview(buf).cast("B")
+            if filled == len(view):
+                grown = np.empty(len(buf) * 2, dtype=dtype)
+                grown[:len(buf)] = buf
+                buf = grown
+                continue
+            n = proc.stdout.readinto(view[filled:])
+            if not n:
+                break
+            filled += n
+        stderr = proc.stderr.read()
+        proc.wait()
+    finally:
+        if timer:
+            timer.cancel()
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+        proc.stdout.close()
+        proc.stderr.close()
+
+    if proc.returncode != 0:
+        if timed_out.is_set():
+            raise AudioDecodeInterrupted(f"ffmpeg timed out after {timeout}s")
+        if proc.returncode < 0:
+            raise AudioDecodeInterrupted(f"ffmpeg killed by signal {-proc.returncode}")
+        raise AudioDecodeError(stderr.decode(errors="replace").strip() or f"ffmpeg exit code {proc.returncode}")
+
+    samples = filled // dtype.itemsize
+    if samples == 0:
+        raise AudioDecodeError("No audio stream decoded")
+    audio = buf[:samples]
+    if dtype != np.float32:
+        return audio.astype(np.float32) / 32768.0
+    # Don't keep a mostly-empty buffer alive behind a small view
+    return audio.copy() if samples < 0.9 * len(buf) else audio
+
+
+def _read_samples(stream, buf: "np.ndarray", start: int) -> int:
+    """Fill buf[start:] from a pipe; return samples read (short only at EOF)"""
+    view = memoryview(buf).cast("B")
+    pos = start * buf.itemsize
+    while pos < len(view):
+        n = stream.readinto(view[pos:])
+        if not n:
+            break
+        pos += n
+    return pos // buf.itemsize - start
+
+
+def iter_audio_windows(
+    path: Union[str, Path],
+    window_s: float,
+    overlap_s: float = 0.0,
+    sample_rate: int = SAMPLE_RATE
+) -> Iterator[Tuple[float, "np.ndarray"]]:
+    """Stream fixed-length overlapping windows as (offset seconds, float32 samples)
+
+    Only one window is buffered at a time, so memory does not grow with the
+    length of the input.
+    """
+    import numpy as np
+    window = int(window_s * sample_rate)
+    overlap = int(overlap_s * sample_rate)
+    if window <= 0 or overlap < 0 or overlap >= window:
+        raise ValueError("window must be positive and longer than the overlap")
+    step = window - overlap
+
+    buf = np.empty(window, dtype=np.float32)
+    errors = tempfile.TemporaryFile()
+    proc = subprocess.Popen(
+        ffmpeg_pcm_command(path, sample_rate, "f32le"),
+        stdout=subprocess.PIPE,
+        stderr=errors
+    )
+    try:
+        filled = 0
+        offset = 0
+        yielded = False
+        while True:
+            filled += _read_samples(proc.stdout, buf, filled)
+            if filled == window:
+                yield offset / sample_rate, buf.copy()
+                yielded = True
+                buf[:overlap] = buf[step:]
+                filled = overlap
+                offset += step
+                continue
+            # EOF: emit the tail unless it only repeats the previous overlap
+            if filled > overlap or (not yielded and filled > 0):
+                yield offset / sample_rate, buf[:filled].copy()
+                yielded = True
+            break
+        proc.wait()
+        if proc.returncode != 0:
+            # Also after some windows: a decode error mid-file must not pass as a short file
+            errors.seek(0)
+            raise AudioDecodeError(errors.read().decode(errors="replace").strip()
+                                   or f"ffmpeg exit code {proc.returncode}")
+        if not yielded:
+            raise AudioDecodeError("No audio stream decoded")
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+        proc.stdout.close()
+        errors.close()
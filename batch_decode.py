@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Batched transcription of short clips
+Clips that fit in one 30 s Whisper window are padded to a mel window each,
+stacked and run through the encoder/decoder as one batch. Segments are then
+rebuilt per clip from the timestamp tokens. Clips whose batch decode looks
+unreliable (repetition or low confidence) are re-run alone through
+model.transcribe, which has the temperature fallback.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from audio_io import SAMPLE_RATE
+
+logger = logging.getLogger(__name__)
+
+# One Whisper window; longer clips need the sliding-window transcribe()
+MAX_CLIP_S = 30.0
+DEFAULT_BATCH_SIZE = 8
+
+# Same thresholds transcribe() uses to reject a decode
+COMPRESSION_RATIO_THRESHOLD = 2.4
+LOGPROB_THRESHOLD = -1.0
+NO_SPEECH_THRESHOLD = 0.6
+
+_TIME_PRECISION = 0.02  # seconds per timestamp token
+
+
+def parse_timestamp_tokens(
+    tokens: List[int],
+    tokenizer: Any,
+    duration: float
+) -> List[Dict[str, Any]]:
+    """Split one decoded token sequence into segments at its timestamp tokens"""
+    ts_begin = tokenizer.timestamp_begin
+    segments: List[Dict[str, Any]] = []
+    text_tokens: List[int] = []
+    start: Optional[float] = None
+
+    def close(end: float):
+        text = tokenizer.decode(text_tokens)
+        if text.strip():
+            seg_start = min(start if start is not None else (segments[-1]["end"] if segments else 0.0), duration)
+            segments.append({
+                "id": len(segments),
+                "seek": 0,
+                "start": seg_start,
+                "end": max(seg_start, min(end, duration)),
+                "text": text,
+                "tokens": list(text_tokens),
+            })
+
+    for tok in tokens:
+        if tok >= ts_begin:
+            t = (tok - ts_begin) * _TIME_PRECISION
+            if text_tokens:
+                close(t)
+                text_tokens, start = [], None
+            else:
+                start = t
+        elif tok < tokenizer.eot:
+            text_tokens.append(tok)
+    if text_tokens:
+        # Last segment without a closing timestamp runs to the end of the clip
+        close(duration)
+    return segments
+
+
+def _reliable(res: Any) -> bool:
+    return (res.compression_ratio <= COMPRESSION_RATIO_THRESHOLD
+            and res.avg_logprob >= LOGPROB_THRESHOLD)
+
+
+def _is_silence(res: Any) -> bool:
+    return res.no_speech_prob > NO_SPEECH_THRESHOLD and res.avg_logprob < LOGPROB_THRESHOLD
+
+
+def transcribe_batch(
+    model: Any,
+    clips: List[np.ndarray],
+    language: Optional[str] = None,
+    vad_params: Optional[Dict[str, Any]] = None
+) -> List[Dict[str, Any]]:
+    """Transcribe clips of at most MAX_CLIP_S in one forward pass
+
+    Returns one transcribe()-shaped result per clip, in input order. With
+    vad_params set, each clip is reduced to its speech regions first.
+    """
+    import torch
+    import whisper
+    from whisper.tokenizer import get_tokenizer
+
+    results: List[Optional[Dict[str, Any]]] = [None] * len(clips)
+    time_maps: List[Optional[list]] = [None] * len(clips)
+    audio_in: List[np.ndarray] = []
+    index: List[int] = []
+    for i, clip in enumerate(clips):
+        if len(clip) > MAX_CLIP_S * SAMPLE_RATE:
+            raise ValueError(f"Clip {i} is longer than {MAX_CLIP_S:.0f}s")
+        if vad_params is not None:
+            from vad import compact_speech, detect_speech
+            regions = detect_speech(clip, **vad_params)
+            if not regions:
+                results[i] = {"text": "", "segments": [], "language": language}
+                continue
+            clip, time_maps[i] = compact_speech(clip, regions)
+        audio_in.append(clip)
+        index.append(i)
+
+    if audio_in:
+        mel = torch.stack([
+            whisper.log_mel_spectrogram(whisper.pad_or_trim(torch.from_numpy(clip)), model.dims.n_mels)
+            for clip in audio_in
+        ]).to(model.device)
+        options = whisper.DecodingOptions(
+            task="transcribe", language=language, temperature=0.0,
+            without_timestamps=False, fp16=model.device.type == "cuda"
+        )
+        decoded = whisper.decode(model, mel, options)
+        del mel
+
+        retry = 0
+        for clip, i, res in zip(audio_in, index, decoded):
+            if _is_silence(res):
+                results[i] = {"text": "", "segments": [], "language": res.language}
+                continue
+            if not _reliable(res):
+                # Rare: repeat loops or garbage; decode alone with temperature fallback
+                retry += 1
+                results[i] = model.transcribe(clip, language=language, task="transcribe", verbose=None)
+            else:
+                tokenizer = get_tokenizer(model.is_multilingual, num_languages=model.num_languages,
+                                          language=res.language, task="transcribe")
+                segments = parse_timestamp_tokens(res.tokens, tokenizer, len(clip) / SAMPLE_RATE)
+                for seg in segments:
+                    seg.update(temperature=0.0, avg_logprob=res.avg_logprob,
+                               compression_ratio=res.compression_ratio,
+                               no_speech_prob=res.no_speech_prob)
+                results[i] = {"text": "".join(s["text"] for s in segments),
+                              "segments": segments, "language": res.language}
+            if time_maps[i] is not None:
+                from vad import map_segments
+                results[i]["segments"] = map_segments(results[i]["segments"], time_maps[i])
+        if retry:
+            logger.info(f"Batch decode: {retry} of {len(audio_in)} clips re-decoded one by one")
+    return results
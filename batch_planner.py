@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Batch planning before any model work
+Every input is probed concurrently with ffprobe (duration, audio codec,
+channel layout). Files without a decodable audio stream are rejected up
+front instead of failing after the model is loaded. The rest are ordered
+longest first: a worker pool that always takes the next file then runs the
+LPT (longest processing time) schedule, which keeps the last worker from
+starting a long file just as the others run out of work. The same greedy
+packing predicts each worker's load and the batch makespan, from the
+real-time factor of the latest run report for the model (or a rough default).
+
+Usage: python3 batch_planner.py [--jobs N] [--model small] [--report-dir reports] FILE_OR_DIR...
+"""
+
+import argparse
+import heapq
+import json
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from audio_io import MediaInfo, probe_media
+from progress import format_hms
+
+PROBE_WORKERS = 8
+
+# Rough CPU real-time factors per model, used until a run report exists
+DEFAULT_RTF = {
+    "tiny": 0.1, "base": 0.2, "small": 0.5, "medium": 1.5,
+    "large-v1": 3.0, "large-v2": 3.0, "large-v3": 3.0, "large-v3-turbo": 1.0,
+}
+# estimate_rtf() source when no run report has a usable RTF
+DEFAULT_RTF_SOURCE = "default estimate"
+
+
+def probe_all(files: List[str], workers: int = PROBE_WORKERS) -> List[MediaInfo]:
+    if not files:
+        return []
+    with ThreadPoolExecutor(max_workers=min(workers, len(files))) as pool:
+        return list(pool.map(probe_media, files))
+
+
+def pack_bins(infos: List[MediaInfo], bins: int, unknown_s: float = 0.0) -> List[List[MediaInfo]]:
+    """Greedy LPT: longest file first, each onto the least loaded worker
+
+    Files of unknown duration weigh unknown_s.
+    """
+    out: List[List[MediaInfo]] = [[] for _ in range(max(1, bins))]
+    heap = [(0.0, i) for i in range(len(out))]
+    for info in sorted(infos, key=lambda i: -(i.duration or unknown_s)):
+        load, i = heapq.heappop(heap)
+        out[i].append(info)
+        heapq.heappush(heap, (load + (info.duration or unknown_s), i))
+    return out
+
+
+class Plan:
+    """Accepted files in run order, rejected files and the per-worker packing"""
+
+    def __init__(self, infos: List[MediaInfo], jobs: int):
+        # Unknown durations sort last (stable: input order among them)
+        self.accepted = sorted((i for i in infos if i.error is None), key=lambda i: -(i.duration or 0.0))
+        self.rejected = [i for i in infos if i.error is not None]
+        self.jobs = max(1, min(jobs, len(self.accepted) or 1))
+        known = [i.duration for i in self.accepted if i.duration]
+        # Unknown durations (no ffprobe) count as a typical file
+        self.unknown_s = statistics.median(known) if known else 0.0
+        self.bins = pack_bins(self.accepted, self.jobs, self.unknown_s)
+
+    @property
+    def order(self) -> List[str]:
+        return [i.path for i in self.accepted]
+
+    @property
+    def durations(self) -> Dict[str, Optional[float]]:
+        return {i.path: i.duration for i in self.accepted}
+
+    @property
+    def total_s(self) -> float:
+        return sum(i.duration or self.unknown_s for i in self.accepted)
+
+    def load_s(self, worker: int) -> float:
+        return sum(i.duration or self.unknown_s for i in self.bins[worker])
+
+    def makespan_s(self) -> float:
+        """Audio seconds on the most loaded worker"""
+        return max((self.load_s(n) for n in range(len(self.bins))), default=0.0)
+
+    def describe(self, rtf: float, rtf_source: str) -> List[str]:
+        lines = [f"Plan: {len(self.accepted)} files, {format_hms(self.total_s)} audio, "
+                 f"{self.jobs} worker(s), longest first"]
+        for n, b in enumerate(self.bins):
+            lines.append(f"  worker {n + 1}: {len(b)} files, {format_hms(self.load_s(n))} audio")
+        for info in self.accepted[:5]:
+            length = format_hms(info.duration) if info.duration else "?:??:??"
+            lines.append(f"  {length}  {info.codec or '?'} "
+                         f"{info.layout or (str(info.channels) + 'ch' if info.channels else '?')}  "
+                         f"{Path(info.path).name}")
+        if len(self.accepted) > 5:
+            lines.append(f"  ... {len(self.accepted) - 5} more")
+        for info in self.rejected:
+            lines.append(f"  rejected: {Path(info.path).name} ({info.error})")
+        eta = self.makespan_s() * rtf
+        finish = time.strftime("%H:%M", time.localtime(time.time() + eta))
+        lines.append(f"Predicted: {format_hms(eta)} (RTF {rtf:.2f}, {rtf_source}), done around {finish}")
+        return lines
+
+
+def make_plan(files: List[str], jobs: int = 1, workers: int = PROBE_WORKERS) -> Plan:
+    return Plan(probe_all(files, workers), jobs)
+
+
+def estimate_rtf(model: str, report_dir: Union[str, Path, None] = None) -> Tuple[float, str]:
+    """Median per-file RTF of the newest run report for this model, else DEFAULT_RTF"""
+    if report_dir and Path(report_dir).is_dir():
+        for p in sorted(Path(report_dir).glob("run-*.json"), reverse=True):
+            try:
+                report = json.loads(p.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue
+            if report.get("run", {}).get("settings", {}).get("model") != model:
+                continue
+            rtfs = [f["rtf"] for f in report.get("files", [])
+                    if f.get("rtf") and f.get("status") == "completed"]
+            if rtfs:
+                return statistics.median(rtfs), p.name
+    return DEFAULT_RTF.get(model, 1.0), DEFAULT_RTF_SOURCE
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Probe inputs and print the batch plan")
+    parser.add_argument("paths", nargs="+", type=Path, help="Media files or directories")
+    parser.add_argument("--jobs", type=int, default=1, help="Parallel workers (default: 1)")
+    parser.add_argument("--model", default="small", help="Model the RTF estimate is for (default: small)")
+    parser.add_argument("--report-dir", default="reports", help="Run reports to take the RTF from")
+    parser.add_argument("--ext", nargs="+", default=[".mp3"], help="Extensions picked from directories")
+    args = parser.parse_args()
+
+    files: List[str] = []
+    for p in args.paths:
+        if p.is_dir():
+            files += sorted(str(f) for f in p.iterdir() if f.suffix.lower() in args.ext)
+        else:
+            files.append(str(p))
+    plan = make_plan(files, args.jobs)
+    for line in plan.describe(*estimate_rtf(args.model, args.report_dir)):
+        print(line)
+    sys.exit(1 if plan.rejected else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Inference backend benchmark: real-time factor per backend and model
+Transcribes a reference clip with every (model, backend) pair and reports the
+load time, resident model size, median transcription time and real-time
+factor (processing time / audio duration; below 1.0 is faster than real
+time). The text of each backend is compared word by word with the fp32
+"torch" result of the same model, so quantization losses show up next to the
+speedup.
+
+Usage: python3 benchmarks/backends.py CLIP [--models tiny base] [--backends torch torch-int8]
+                                           [--language ro] [--runs N] [--threads N]
+"""
+
+import argparse
+import difflib
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from audio_io import SAMPLE_RATE, load_audio  # noqa: E402
+from model_registry import (  # noqa: E402
+    BACKENDS, DEFAULT_BACKEND, backend_dtype, estimate_model_mb, registry, set_torch_threads
+)
+
+
+def word_agreement(reference: str, text: str) -> float:
+    """Share of matching words between two transcripts (1.0 = identical)"""
+    return difflib.SequenceMatcher(None, reference.lower().split(), text.lower().split()).ratio()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Real-time factor per inference backend")
+    parser.add_argument("clip", type=Path, help="Reference audio/video clip")
+    parser.add_argument("--models", nargs="+", default=["tiny", "base"],
+                        help="Whisper models (default: tiny base)")
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=list(BACKENDS),
+                        help=f"Backends (default: {' '.join(BACKENDS)})")
+    parser.add_argument("--language", default="ro", help="Language (default: ro)")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per case (default: 3)")
+    parser.add_argument("--threads", type=int, default=0,
+                        help="Torch intra-op threads (default: torch's own choice)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    if args.threads:
+        set_torch_threads(args.threads)
+    audio = load_audio(args.clip)
+    duration = len(audio) / SAMPLE_RATE
+    print(f"Clip: {args.clip.name}, {duration:.1f}s audio")
+    print(f"{'model':10} {'backend':12} {'load':>7} {'size MB':>8} {'median':>8} {'RTF':>6} "
+          f"{'speedup':>8} {'words':>6}")
+
+    for model_name in args.models:
+        reference = None
+        base_secs = None
+        # fp32 first: it is the reference for the speedup and word agreement
+        for backend in sorted(args.backends, key=lambda b: b != DEFAULT_BACKEND):
+            start = time.perf_counter()
+            model = registry.get(model_name, dtype=backend_dtype(backend))
+            load_s = time.perf_counter() - start
+            options = {"language": args.language, "task": "transcribe", "temperature": 0.0, "verbose": None}
+            model.transcribe(audio[:SAMPLE_RATE * 5], **options)  # warm-up
+            times = []
+            for _ in range(args.runs):
+                start = time.perf_counter()
+                result = model.transcribe(audio, **options)
+                times.append(time.perf_counter() - start)
+            secs = statistics.median(times)
+            if backend == DEFAULT_BACKEND:
+                reference, base_secs = result["text"], secs
+            agreement = f"{word_agreement(reference, result['text']) * 100:5.1f}%" if reference is not None else "-"
+            speedup = f"{base_secs / secs:7.2f}x" if base_secs else "-"
+            print(f"{model_name:10} {backend:12} {load_s:6.1f}s {estimate_model_mb(model):8.1f} "
+                  f"{secs:7.2f}s {secs / duration:6.3f} {speedup:>8} {agreement:>6}")
+            registry.unload(model_name, dtype=backend_dtype(backend))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Reproducible benchmark suite with synthetic inputs
+Generates deterministic inputs offline (nothing is downloaded apart from the
+Whisper model the pipeline cases need):
+  - WAVs from ffmpeg's lavfi sources: a tone, pink noise and a speech-like
+    signal (band-limited noise in syllable-sized bursts), at several lengths
+  - large SRTs made of short fragments, over-long lines and unpunctuated text
+
+and times each stage on its own:
+  audio      audio_io.load_audio (ffmpeg decode)
+  postproc   merge_short_subs.process_subtitles, mp3 advanced_srt_postprocess,
+             subtitle_engine.split_custom
+  pipeline   video-to-text process_file, mp3 run_transcription (need Whisper)
+
+Medians are compared with a saved baseline and the run fails when a case is
+slower than allowed. Cases whose dependencies are missing are reported as
+skipped, not failed.
+
+Usage: python3 benchmarks/bench.py [--only audio postproc pipeline] [--quick] [--runs N]
+                                   [--model tiny] [--baseline FILE] [--save-baseline]
+                                   [--max-regression 0.25]
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import logging
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from queue import Queue
+from typing import Callable, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from subtitle_engine import Cue, compose_srt  # noqa: E402
+
+DEFAULT_BASELINE = ROOT / "benchmarks" / "bench_baseline.json"
+
+# lavfi source per signal kind; {d} is the duration in seconds
+SIGNALS = {
+    "tone": "sine=frequency=440:sample_rate=16000:duration={d}",
+    "noise": "anoisesrc=color=pink:seed=1:sample_rate=16000:duration={d}",
+    # Speech band noise, ~4 bursts per second with pauses every few seconds
+    "speechlike": ("anoisesrc=color=white:seed=7:sample_rate=16000:duration={d},"
+                   "bandpass=frequency=1200:width_type=h:width=2000,"
+                   "volume='0.05+0.95*gt(sin(2*PI*4*t),0)*gt(mod(t,3.3),0.6)':eval=frame"),
+}
+
+_WORDS = ("acesta este un test de subtitrare cu mai multe cuvinte care "
+          "trebuie unite sau împărțite după lungime și punctuație").split()
+
+Case = Callable[[], None]
+
+
+def make_wav(path: Path, kind: str, seconds: float):
+    if path.exists():
+        return
+    subprocess.run(
+        ["ffmpeg", "-nostdin", "-loglevel", "error", "-y", "-f", "lavfi",
+         "-i", SIGNALS[kind].format(d=seconds), "-ac", "1", "-c:a", "pcm_s16le", str(path)],
+        check=True
+    )
+
+
+def make_srt(path: Path, cues: int, kind: str, seed: int = 1):
+    """kind: short (Whisper-like fragments), long (over-long lines) or unpunctuated"""
+    if path.exists():
+        return
+    rnd = random.Random(seed)
+    out: List[Cue] = []
+    t = 0
+    for _ in range(cues):
+        words = {"short": rnd.randint(2, 9), "long": rnd.randint(30, 60),
+                 "unpunctuated": rnd.randint(10, 40)}[kind]
+        text = " ".join(rnd.choice(_WORDS) for _ in range(words))
+        if kind != "unpunctuated" and rnd.random() < 0.3:
+            text += rnd.choice([".", ",", "?", "!"])
+        dur = 400 + 180 * words
+        out.append(Cue(t, t + dur, text))
+        t += dur + rnd.randint(0, 400)
+    path.write_text(compose_srt(out), encoding="utf-8")
+
+
+def load_script(name: str, filename: str):
+    """Import a hyphenated entry-point script as a module
+
+    Only usable in this process: spawned workers re-import by module name and
+    cannot find it, so cases built on these modules run single-process.
+    """
+    spec = importlib.util.spec_from_file_location(name, ROOT / filename)
+    module = importlib.util.module_from_spec(spec)
+    # Registered first: code run while executing it (dataclasses, typing) looks it up by name
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def quiet(func: Callable, *args, **kwargs):
+    """Call func with its console output (progress bars) discarded"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(*args, **kwargs)
+
+
+def build_inputs(work: Path, quick: bool) -> Dict[str, Path]:
+    lengths = [5, 30] if quick else [5, 30, 300]
+    cues = 20_000 if quick else 100_000
+    inputs = {}
+    for kind in SIGNALS:
+        for seconds in lengths:
+            inputs[f"{kind}_{seconds}s"] = work / f"{kind}_{seconds}s.wav"
+            make_wav(inputs[f"{kind}_{seconds}s"], kind, seconds)
+    for kind in ("short", "long", "unpunctuated"):
+        inputs[f"srt_{kind}"] = work / f"{kind}_{cues}.srt"
+        make_srt(inputs[f"srt_{kind}"], cues, kind)
+    return inputs
+
+
+def audio_cases(inputs: Dict[str, Path]) -> Dict[str, Case]:
+    from audio_io import load_audio
+    return {f"load_audio {name}": (lambda p=p: load_audio(p))
+            for name, p in inputs.items() if p.suffix == ".wav"}
+
+
+def postproc_cases(inputs: Dict[str, Path], work: Path) -> Dict[str, Optional[Case]]:
+    import merge_short_subs
+    from subtitle_engine import split_custom
+    cases: Dict[str, Optional[Case]] = {}
+    for kind in ("short", "long", "unpunctuated"):
+        src = inputs[f"srt_{kind}"]
+        cases[f"process_subtitles {kind}"] = (lambda s=src: quiet(
+            merge_short_subs.process_subtitles, str(s), str(work / "out.srt")))
+    try:
+        mp3 = quiet(load_script, "mp3_to_text", "mp3-to-text-v57.py")
+        pp = mp3.get_default_config()["postprocess"]
+        for kind in ("short", "long"):
+            src = inputs[f"srt_{kind}"]
+            cases[f"advanced_srt_postprocess {kind}"] = (
+                lambda s=src: mp3.advanced_srt_postprocess(s, work / "out_mp3.srt", pp))
+    except (SystemExit, ImportError) as e:
+        cases["advanced_srt_postprocess"] = None
+        logging.getLogger(__name__).debug(f"mp3 script unavailable: {e}")
+    text = " ".join(random.Random(3).choice(_WORDS) for _ in range(200_000))
+    cases["split_custom 1.3M chars unpunctuated"] = lambda: split_custom(text, 120)
+    return cases
+
+
+def pipeline_cases(inputs: Dict[str, Path], work: Path, model: str) -> Dict[str, Optional[Case]]:
+    if importlib.util.find_spec("whisper") is None:
+        return {"process_file": None, "run_transcription": None}
+    vtt = load_script("video_to_text", "video-to-text.py")
+    mp3 = load_script("mp3_to_text", "mp3-to-text-v57.py")
+    clip = inputs["speechlike_30s"]
+
+    def run_transcription():
+        cfg = mp3.validate_config(dict(mp3.get_default_config(), model_type=model))
+        cfg["cache"]["enabled"] = False
+        cfg["report"]["enabled"] = False
+        # In-process pipeline: spawned pool workers could not import mp3_to_text
+        cfg["max_parallel_jobs"] = 1
+        files = [str(p) for name, p in inputs.items() if name.startswith("speechlike_")]
+        cwd = os.getcwd()
+        os.chdir(work)  # outputs and the job journal land in the working directory
+        try:
+            # A leftover journal would mark every file as already done
+            for suffix in ("", "-wal", "-shm"):
+                Path(mp3.JOURNAL_FILE + suffix).unlink(missing_ok=True)
+            mp3.run_transcription(files, cfg, lambda *_: None, lambda _: None, Queue(), threading.Event())
+        finally:
+            os.chdir(cwd)
+
+    return {
+        f"process_file {clip.name}": lambda: vtt.process_file(clip, model, "ro", "srt", use_cache=False),
+        "run_transcription speechlike": run_transcription,
+    }
+
+
+def time_case(case: Case, runs: int) -> float:
+    case()  # warm-up: model load, OS file cache
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        case()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark suite with synthetic inputs")
+    parser.add_argument("--only", nargs="+", choices=["audio", "postproc", "pipeline"],
+                        default=["audio", "postproc", "pipeline"], help="Case groups to run")
+    parser.add_argument("--quick", action="store_true", help="Smaller inputs")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per case (default: 3)")
+    parser.add_argument("--model", default="tiny", help="Whisper model for pipeline cases (default: tiny)")
+    parser.add_argument("--work-dir", type=Path, default=Path(tempfile.gettempdir()) / "vtt-bench",
+                        help="Where generated inputs are kept between runs")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE,
+                        help="Baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Store this run as the new baseline")
+    parser.add_argument("--max-regression", type=float, default=0.25,
+                        help="Allowed slowdown vs. baseline, as a fraction (default: 0.25)")
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    args.work_dir.mkdir(parents=True, exist_ok=True)
+    inputs = build_inputs(args.work_dir, args.quick)
+    cases: Dict[str, Optional[Case]] = {}
+    if "audio" in args.only:
+        cases.update(audio_cases(inputs))
+    if "postproc" in args.only:
+        cases.update(postproc_cases(inputs, args.work_dir))
+    if "pipeline" in args.only:
+        cases.update(pipeline_cases(inputs, args.work_dir, args.model))
+
+    baseline = {}
+    if args.baseline.exists() and not args.save_baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+
+    results = {}
+    failed = False
+    print(f"{'case':44} {'median':>9} {'baseline':>9}")
+    for name, case in cases.items():
+        if case is None:
+            print(f"{name:44} {'skipped':>9}  (dependency missing)")
+            continue
+        secs = time_case(case, args.runs)
+        results[name] = {"median_s": round(secs, 4)}
+        base = baseline.get(name, {}).get("median_s")
+        flag = ""
+        # Small absolute slack so timer jitter on tiny cases doesn't fail the run
+        if base and secs > base * (1 + args.max_regression) + 0.01:
+            flag = f"  REGRESSION (+{(secs / base - 1) * 100:.0f}%)"
+            failed = True
+        base_txt = f"{base:.3f}s" if base else "-"
+        print(f"{name:44} {secs:8.3f}s {base_txt:>9}{flag}")
+
+    if args.save_baseline:
+        # Keep cases that were not run this time (e.g. --only, skipped pipeline)
+        saved = json.loads(args.baseline.read_text(encoding="utf-8")) if args.baseline.exists() else {}
+        saved.update(results)
+        args.baseline.write_text(json.dumps(saved, indent=2) + "\n", encoding="utf-8")
+        print(f"Baseline saved to {args.baseline}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+Frozen copies of the subtitle post-processing code before subtitle_engine.py
+Only used as the reference side of benchmarks/subtitle_postprocess.py; do not
+import from the application.
+
+  process_subtitles            merge_short_subs.py (pysrt + datetime round-trip)
+  mp3_advanced_srt_postprocess mp3-to-text-v57.py (srt + timedelta)
+"""
+
+import datetime
+import logging
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pysrt
+import srt
+
+logger = logging.getLogger(__name__)
+
+MIN_CHARS = 80
+MAX_CHARS = 120
+SUBTITLE_GAP_MS = 100
+
+
+def show_progress(current, total, prefix="Processing"):
+    """The original prints a progress bar; kept silent for timing"""
+
+
+# ----- merge_short_subs.py -----
+
+def split_custom(text):
+    """
+    Împarte textul lung în segmente mai mici, prioritizând punctuația
+    """
+    length = len(text)
+    if length <= MAX_CHARS:
+        return [text]
+    
+    # Stabilește punctul de tăiere bazat pe lungime
+    if 121 <= length < 150:
+        preferred_cut = 70
+    elif 150 <= length < 180:
+        preferred_cut = 90
+    else:
+        preferred_cut = 100
+    
+    # Caută cel mai bun punct de tăiere în ordine de prioritate
+    cut_positions = []
+    
+    # 1. Prioritate: punctuație de sfârșit de propoziție
+    for punct in ['. ', '! ', '? ']:
+        pos = text.rfind(punct, 0, preferred_cut + 10)
+        if pos > preferred_cut - 20:  # Nu prea departe de punctul ideal
+            cut_positions.append((pos + len(punct), 'sentence'))
+    
+    # 2. Prioritate: alte semne de punctuație
+    for punct in [', ', '; ', ': ', ' - ', ' — ']:
+        pos = text.rfind(punct, 0, preferred_cut + 10)
+        if pos > preferred_cut - 15:
+            cut_positions.append((pos + len(punct), 'punctuation'))
+    
+    # 3. Prioritate: spații simple
+    pos = text.rfind(' ', 0, preferred_cut + 5)
+    if pos > preferred_cut - 10:
+        cut_positions.append((pos + 1, 'space'))
+    
+    # Alege cel mai bun punct de tăiere
+    if cut_positions:
+        # Sortează după prioritate și proximitate la punctul ideal
+        cut_positions.sort(key=lambda x: (
+            0 if x[1] == 'sentence' else 1 if x[1] == 'punctuation' else 2,
+            abs(x[0] - preferred_cut)
+        ))
+        split_idx = cut_positions[0][0]
+    else:
+        # Fallback: tăiere forțată
+        split_idx = preferred_cut
+        logger.warning(f"Forced split at position {split_idx} - no good break point found")
+    
+    left = text[:split_idx].strip()
+    right = text[split_idx:].strip()
+    
+    # Recursiv pentru partea dreaptă dacă încă e prea lungă
+    right_parts = split_custom(right)
+    
+    return [left] + right_parts
+
+def subrip_add_milliseconds(subrip_time, milliseconds):
+    """Adaugă milisecunde la un timp SubRip"""
+    try:
+        base_dt = datetime.datetime(
+            1900, 1, 1,
+            subrip_time.hours,
+            subrip_time.minutes,
+            subrip_time.seconds,
+            subrip_time.milliseconds * 1000
+        )
+        
+        new_dt = base_dt + timedelta(milliseconds=milliseconds)
+        
+        return pysrt.SubRipTime(
+            hours=new_dt.hour,
+            minutes=new_dt.minute,
+            seconds=new_dt.second,
+            milliseconds=new_dt.microsecond // 1000
+        )
+    except Exception as e:
+        logger.error(f"Error in time calculation: {e}")
+        return subrip_time
+
+def split_text_with_timing(text, start, end):
+    """
+    Împarte textul și redistribuie timpul proporțional, cu gap-uri între subtitrări
+    """
+    chunks = split_custom(text)
+    if len(chunks) == 1:
+        return [(chunks[0], start, end)]
+    
+    # Calculează durata totală disponibilă
+    total_duration_ms = end.ordinal - start.ordinal
+    
+    # Rezervă timp pentru gap-urile dintre subtitrări
+    gaps_needed = len(chunks) - 1
+    total_gap_time = gaps_needed * SUBTITLE_GAP_MS
+    
+    if total_duration_ms <= total_gap_time:
+        logger.warning("Duration too short for proper gaps, using minimal gaps")
+        available_duration = total_duration_ms
+        gap_time = max(50, total_duration_ms // (gaps_needed + 1)) if gaps_needed > 0 else 0
+    else:
+        available_duration = total_duration_ms - total_gap_time
+        gap_time = SUBTITLE_GAP_MS
+    
+    # Calculează proporțiile bazate pe lungimea textului
+    total_chars = sum(len(chunk) for chunk in chunks)
+    
+    result = []
+    current_start = start
+    
+    for i, chunk in enumerate(chunks):
+        proportion = len(chunk) / total_chars
+        chunk_duration = int(proportion * available_duration)
+        
+        # Asigură-te că ultima porțiune folosește tot timpul rămas
+        if i == len(chunks) - 1:
+            chunk_end = end
+        else:
+            chunk_end = subrip_add_milliseconds(current_start, chunk_duration)
+        
+        result.append((chunk, current_start, chunk_end))
+        
+        # Adaugă gap pentru următoarea subtitrare (dacă nu e ultima)
+        if i < len(chunks) - 1:
+            current_start = subrip_add_milliseconds(chunk_end, gap_time)
+    
+    return result
+
+def process_subtitles(input_file, output_file):
+    """Procesează fișierul de subtitrări principal"""
+    
+    logger.info(f"Starting subtitle processing: {input_file} -> {output_file}")
+    
+    try:
+        # Încarcă subtitrările cu encoding explicit
+        subs = pysrt.open(input_file, encoding='utf-8')
+        logger.info(f"Loaded {len(subs)} subtitles from input file")
+        
+    except UnicodeDecodeError:
+        logger.warning("UTF-8 decoding failed, trying with latin-1")
+        try:
+            subs = pysrt.open(input_file, encoding='latin-1')
+        except Exception as e:
+            logger.error(f"Failed to read subtitle file with multiple encodings: {e}")
+            return False
+            
+    except Exception as e:
+        logger.error(f"Failed to load subtitle file: {e}")
+        return False
+    
+    if not subs:
+        logger.error("No subtitles found in input file")
+        return False
+    
+    # Procesarea principală
+    merged_subs = []
+    temp_text = ""
+    start_time = None
+    processed_count = 0
+    
+    logger.info("Processing subtitles...")
+    
+    for i, sub in enumerate(subs):
+        # Progress tracking
+        if i % 10 == 0 or i == len(subs) - 1:
+            show_progress(i + 1, len(subs), "Processing")
+        
+        # Verifică dacă subtitrarea are text valid
+        if not sub.text or not sub.text.strip():
+            logger.debug(f"Skipping empty subtitle at index {i}")
+            continue
+        
+        # Inițializează dacă e primul text
+        if not temp_text:
+            start_time = sub.start
+        
+        # Adaugă textul curent (curăță newline-urile)
+        clean_text = sub.text.strip().replace('\n', ' ').replace('\r', '')
+        temp_text += " " + clean_text if temp_text else clean_text
+        
+        # Decide dacă să proceseze acum
+        should_process = (
+            len(temp_text.strip()) >= MIN_CHARS or 
+            i == len(subs) - 1 or
+            len(temp_text.strip()) > MAX_CHARS * 2  # Evită acumularea excesivă
+        )
+        
+        if should_process:
+            end_time = sub.end
+            full_text = temp_text.strip()
+            
+            if len(full_text) > MAX_CHARS:
+                # Împarte textul lung
+                split_segments = split_text_with_timing(full_text, start_time, end_time)
+                for text_part, chunk_start, chunk_end in split_segments:
+                    merged_subs.append(pysrt.SubRipItem(
+                        index=len(merged_subs) + 1,
+                        start=chunk_start,
+                        end=chunk_end,
+                        text=text_part.strip()
+                    ))
+                    processed_count += 1
+            else:
+                # Păstrează textul ca o singură subtitrare
+                merged_subs.append(pysrt.SubRipItem(
+                    index=len(merged_subs) + 1,
+                    start=start_time,
+                    end=end_time,
+                    text=full_text
+                ))
+                processed_count += 1
+            
+            # Reset pentru următoarea secvență
+            temp_text = ""
+            start_time = None
+    
+    # Salvează rezultatul
+    try:
+        result_file = pysrt.SubRipFile(merged_subs)
+        result_file.save(output_file, encoding='utf-8')
+        
+        logger.info(f"Successfully saved {len(merged_subs)} processed subtitles to '{output_file}'")
+        logger.info(f"Compression ratio: {len(subs)} -> {len(merged_subs)} subtitles")
+        
+        return True
+        
+    except Exception as e:
+        logger.error(f"Failed to save output file: {e}")
+        return False
+
+
+# ----- mp3-to-text-v57.py -----
+
+def mp3_split_custom(text: str, max_chars: int) -> List[str]:
+    if len(text) <= max_chars:
+        return [text]
+    pref = 70 if len(text) < 150 else 90 if len(text) < 180 else 100
+    cuts = []
+    for punct in ['. ', '! ', '? ']:
+        pos = text.rfind(punct, 0, pref+10)
+        if pos > pref-20:
+            cuts.append((pos+len(punct), 'sentence'))
+    for punct in [', ', '; ', ': ', ' - ', ' – ']:
+        pos = text.rfind(punct, 0, pref+10)
+        if pos > pref-15:
+            cuts.append((pos+len(punct), 'punctuation'))
+    pos = text.rfind(' ', 0, pref+5)
+    if pos > pref-10:
+        cuts.append((pos+1, 'space'))
+    if cuts:
+        cuts.sort(key=lambda x: (0 if x[1]=='sentence' else 1 if x[1]=='punctuation' else 2, abs(x[0]-pref)))
+        idx = cuts[0][0]
+    else:
+        idx = pref
+        logger.warning(f"Forced split at {idx}")
+    left, right = text[:idx].strip(), text[idx:].strip()
+    return [left] + mp3_split_custom(right, max_chars)
+
+def mp3_subrip_add_milliseconds(sr: datetime.timedelta, ms: int) -> datetime.timedelta:
+    return sr + datetime.timedelta(milliseconds=ms)
+
+def mp3_split_text_with_timing(
+    text: str, start: datetime.timedelta, end: datetime.timedelta,
+    max_chars: int, gap_ms: int
+) -> List[Any]:
+    chunks = mp3_split_custom(text, max_chars)
+    if len(chunks) == 1:
+        return [(text, start, end)]
+    total_ms = int((end - start).total_seconds() * 1000)
+    gaps = len(chunks)-1
+    total_gap = gap_ms * gaps
+    avail = max(total_ms - total_gap, 0)
+    gap = gap_ms if total_ms > total_gap else max(50, total_ms//max(1, gaps+1))
+    total_chars = sum(len(c) for c in chunks)
+    cur_start = start
+    out = []
+    for i, chunk in enumerate(chunks):
+        if i < len(chunks)-1:
+            dur = int((avail * len(chunk)) // total_chars)
+            chunk_end = mp3_subrip_add_milliseconds(cur_start, dur)
+        else:
+            chunk_end = end
+        out.append((chunk, cur_start, chunk_end))
+        if i < len(chunks)-1:
+            cur_start = mp3_subrip_add_milliseconds(chunk_end, gap)
+    return out
+
+def mp3_advanced_srt_postprocess(raw_srt: Path, final_srt: Path, cfg_pp: Dict[str, int]):
+    logger.info(f"Post-procesare SRT: {raw_srt.name}")
+    text = raw_srt.read_text(encoding="utf-8")
+    subs = list(srt.parse(text))
+    merged, buf_txt, buf_start = [], "", None
+    for i, sub in enumerate(subs):
+        clean = sub.content.replace("\n"," ").strip()
+        if not clean: continue
+        if buf_txt == "":
+            buf_start = sub.start
+        buf_txt = (buf_txt + " " + clean).strip()
+        flush = (
+            len(buf_txt) >= cfg_pp["min_chars"] or
+            i == len(subs)-1 or
+            len(buf_txt) > cfg_pp["max_chars"]*2
+        )
+        if flush:
+            end_time = sub.end
+            if len(buf_txt) > cfg_pp["max_chars"]:
+                parts = mp3_split_text_with_timing(
+                    buf_txt, buf_start, end_time,
+                    cfg_pp["max_chars"], cfg_pp["subtitle_gap_ms"]
+                )
+                for txt, st, en in parts:
+                    merged.append(srt.Subtitle(
+                        index=len(merged)+1, start=st, end=en, content=txt.strip()
+                    ))
+            else:
+                merged.append(srt.Subtitle(
+                    index=len(merged)+1, start=buf_start,
+                    end=end_time, content=buf_txt
+                ))
+            buf_txt, buf_start = "", None
+    for idx, sub in enumerate(merged, start=1):
+        sub.index = idx
+    final_srt.write_text(srt.compose(merged), encoding="utf-8")
+    logger.info(f"Saved {len(merged)} subtitles to {final_srt.name}")
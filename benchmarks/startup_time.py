@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Cold-start latency benchmark for the command line entry points
+Every case runs in a fresh interpreter, the way the shell wrappers start it.
+Reports the median wall time and whether torch/whisper got imported, and can
+compare against a saved baseline to catch regressions.
+
+Usage: python3 benchmarks/startup_time.py [--runs N] [--baseline FILE] [--save-baseline]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_BASELINE = ROOT / "benchmarks" / "startup_baseline.json"
+
+# Modules that must never be imported on these paths
+HEAVY_MODULES = ["torch", "whisper", "numpy"]
+
+# name -> (script, argv)
+CASES = {
+    "video-to-text --help": ("video-to-text.py", ["--help"]),
+    "video-to-text usage": ("video-to-text.py", []),
+    "video-to-text bad model": ("video-to-text.py", ["missing.mp4", "no-such-model"]),
+    "merge_short_subs usage": ("merge_short_subs.py", []),
+    "transcript_cache --help": ("transcript_cache.py", ["--help"]),
+}
+
+# Runs the script as __main__ and reports which heavy modules it imported
+_PROBE = """
+import json, runpy, sys
+sys.argv = [sys.argv[1]] + sys.argv[2:]
+try:
+    runpy.run_path(sys.argv[0], run_name="__main__")
+except SystemExit:
+    pass
+finally:
+    sys.stdout = sys.__stdout__
+    print("\\n@@" + json.dumps(sorted(m for m in {heavy!r} if m in sys.modules)))
+"""
+
+
+def run_case(script: str, argv: List[str]) -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, str(ROOT / script)] + argv, cwd=ROOT,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def heavy_imports(script: str, argv: List[str]) -> List[str]:
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(heavy=HEAVY_MODULES), str(ROOT / script)] + argv,
+        cwd=ROOT, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+    )
+    marker = [line for line in result.stdout.splitlines() if line.startswith("@@")]
+    return json.loads(marker[-1][2:]) if marker else []
+
+
+def measure(runs: int) -> Dict[str, Dict[str, object]]:
+    results = {}
+    for name, (script, argv) in CASES.items():
+        run_case(script, argv)  # warm the OS file cache
+        times = [run_case(script, argv) for _ in range(runs)]
+        results[name] = {
+            "median_s": round(statistics.median(times), 4),
+            "min_s": round(min(times), 4),
+            "heavy_imports": heavy_imports(script, argv),
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start latency of the CLI paths")
+    parser.add_argument("--runs", type=int, default=5, help="Runs per case (default: 5)")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE,
+                        help="Baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Store this run as the new baseline")
+    parser.add_argument("--max-regression", type=float, default=0.25,
+                        help="Allowed slowdown vs. baseline, as a fraction (default: 0.25)")
+    args = parser.parse_args()
+
+    results = measure(args.runs)
+    baseline = {}
+    if args.baseline.exists() and not args.save_baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+
+    failed = False
+    print(f"{'case':28} {'median':>9} {'baseline':>9}  heavy imports")
+    for name, r in results.items():
+        base = baseline.get(name, {}).get("median_s")
+        flag = ""
+        # Small absolute slack so process-spawn jitter doesn't fail the run
+        if base and r["median_s"] > base * (1 + args.max_regression) + 0.02:
+            flag = "  REGRESSION"
+            failed = True
+        if r["heavy_imports"]:
+            flag += "  HEAVY IMPORT"
+            failed = True
+        base_txt = f"{base:.3f}s" if base else "-"
+        print(f"{name:28} {r['median_s']:8.3f}s {base_txt:>9}  "
+              f"{', '.join(r['heavy_imports']) or 'none'}{flag}")
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+        print(f"Baseline saved to {args.baseline}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Subtitle post-processing throughput: subtitle_engine vs. the old code paths
+Builds a synthetic SRT (100k cues by default, a mix of short fragments and
+over-long lines), runs it through the legacy pysrt and srt/timedelta copies in
+benchmarks/legacy_subtitles.py and through subtitle_engine (whole document in
+memory and streaming file to file) and reports the speedup. With --memory the
+peak Python heap of each path is measured in a separate tracemalloc run.
+
+The engine picks its own break points, so outputs are checked for the same
+words in the same order and for cues that fit max_chars, not byte equality.
+
+Usage: python3 benchmarks/subtitle_postprocess.py [--cues N] [--runs N] [--memory]
+"""
+
+import argparse
+import logging
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import legacy_subtitles  # noqa: E402
+from subtitle_engine import Cue, compose_srt, parse_srt, process_srt_file, process_srt_text  # noqa: E402
+
+PP = {"min_chars": 80, "max_chars": 120, "subtitle_gap_ms": 100}
+
+_WORDS = ("acesta este un test de subtitrare cu mai multe cuvinte care "
+          "trebuie unite sau împărțite după lungime și punctuație").split()
+
+
+def synthetic_srt(n: int, seed: int = 1) -> str:
+    """n cues: mostly short Whisper-like fragments, every 15th one very long"""
+    rnd = random.Random(seed)
+    cues: List[Cue] = []
+    t = 0
+    for i in range(n):
+        words = rnd.randint(25, 45) if i % 15 == 0 else rnd.randint(2, 9)
+        text = " ".join(rnd.choice(_WORDS) for _ in range(words))
+        if rnd.random() < 0.3:
+            text += rnd.choice([".", ",", "?", "!"])
+        dur = 400 + 180 * words
+        cues.append(Cue(t, t + dur, text))
+        t += dur + rnd.randint(0, 400)
+    return compose_srt(cues)
+
+
+def engine_postprocess(inp: Path, out: Path):
+    text = process_srt_text(inp.read_text(encoding="utf-8"),
+                            PP["min_chars"], PP["max_chars"], PP["subtitle_gap_ms"])
+    out.write_text(text, encoding="utf-8")
+
+
+def engine_streaming(inp: Path, out: Path):
+    process_srt_file(inp, out, PP["min_chars"], PP["max_chars"], PP["subtitle_gap_ms"])
+
+
+def legacy_merge_short_subs(inp: Path, out: Path):
+    if not legacy_subtitles.process_subtitles(str(inp), str(out)):
+        raise RuntimeError("legacy merge_short_subs failed")
+
+
+def legacy_mp3_postprocess(inp: Path, out: Path):
+    legacy_subtitles.mp3_advanced_srt_postprocess(inp, out, PP)
+
+
+CASES = {
+    "legacy merge_short_subs (pysrt)": legacy_merge_short_subs,
+    "legacy mp3 postprocess (srt)": legacy_mp3_postprocess,
+    "subtitle_engine": engine_postprocess,
+    "subtitle_engine (streaming)": engine_streaming,
+}
+
+
+def words(srt_text: str) -> List[str]:
+    return [w for cue in parse_srt(srt_text) for w in cue.text.split()]
+
+
+def overlong(srt_text: str) -> int:
+    """Cues longer than max_chars that could have been split at a space"""
+    return sum(1 for cue in parse_srt(srt_text)
+               if len(cue.text) > PP["max_chars"] and " " in cue.text)
+
+
+def time_case(func: Callable[[Path, Path], None], inp: Path, out: Path, runs: int) -> float:
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func(inp, out)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def peak_mb(func: Callable[[Path, Path], None], inp: Path, out: Path) -> float:
+    tracemalloc.start()
+    try:
+        func(inp, out)
+        return tracemalloc.get_traced_memory()[1] / 1024 / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Subtitle post-processing benchmark")
+    parser.add_argument("--cues", type=int, default=100_000, help="Cues in the synthetic file (default: 100000)")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per case (default: 3)")
+    parser.add_argument("--memory", action="store_true", help="Also measure peak memory (slow)")
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        inp = tmp / "synthetic_raw.srt"
+        inp.write_text(synthetic_srt(args.cues), encoding="utf-8")
+        print(f"Input: {args.cues} cues, {inp.stat().st_size / 1024 / 1024:.1f} MB")
+
+        results = {}
+        outputs = {}
+        peaks = {}
+        for name, func in CASES.items():
+            out = tmp / f"{len(outputs)}.srt"
+            results[name] = time_case(func, inp, out, args.runs)
+            outputs[name] = out.read_text(encoding="utf-8")
+            if args.memory:
+                peaks[name] = peak_mb(func, inp, out)
+
+        engine = results["subtitle_engine"]
+        print(f"{'path':34} {'median':>9} {'cues/s':>10} {'speedup':>8} {'out cues':>9} "
+              f"{'too long':>9} {'peak MB':>8}")
+        for name, secs in results.items():
+            out_cues = sum(1 for _ in parse_srt(outputs[name]))
+            peak = f"{peaks[name]:8.2f}" if name in peaks else f"{'-':>8}"
+            print(f"{name:34} {secs:8.3f}s {args.cues / secs:10.0f} {secs / engine:7.1f}x "
+                  f"{out_cues:9d} {overlong(outputs[name]):9d} {peak}")
+
+        reference = words(outputs["legacy mp3 postprocess (srt)"])
+        for name in ("subtitle_engine", "subtitle_engine (streaming)"):
+            if words(outputs[name]) != reference or overlong(outputs[name]):
+                print(f"{name} output lost words or left over-long cues")
+                sys.exit(1)
+        if outputs["subtitle_engine (streaming)"] != outputs["subtitle_engine"]:
+            print("Streaming output differs from the in-memory output")
+            sys.exit(1)
+        print("Output checked: same words, every cue fits max_chars")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Word timestamps: inference cost vs. subtitle sync
+For each media file Whisper runs twice, with and without word_timestamps, and
+the extra inference time is reported. The word-timed segments are then
+post-processed twice by subtitle_engine: once cutting on the real word
+timings and once with the old length-proportional timing. The gap between
+the two sets of cut times is how far proportional splitting drifts from the
+audio (mean / p95 / max, in ms).
+
+Without media files (or without Whisper installed) only the sync part runs,
+on synthetic segments with uneven speaking rate and pauses.
+
+Usage: python3 benchmarks/word_timestamps.py [--model tiny] [--language ro] [FILE ...]
+"""
+
+import argparse
+import logging
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from subtitle_engine import Cue, pack_words, process_cues, segment_cue  # noqa: E402
+
+PP = {"min_chars": 80, "max_chars": 120, "subtitle_gap_ms": 100}
+
+_WORDS = ("acesta este un test de subtitrare cu mai multe cuvinte care "
+          "trebuie unite sau împărțite după lungime și punctuație").split()
+
+
+def synthetic_segments(n: int, seed: int = 1) -> List[Dict[str, Any]]:
+    """n Whisper-like segments with word timings; speech rate varies per word"""
+    rnd = random.Random(seed)
+    segments = []
+    t = 0.0
+    for _ in range(n):
+        words = []
+        start = t
+        for i in range(rnd.randint(3, 40)):
+            word = rnd.choice(_WORDS)
+            if rnd.random() < 0.08:
+                word += rnd.choice([".", ","])
+            dur = rnd.uniform(0.05, 0.12) * len(word)
+            words.append({"word": " " + word, "start": t, "end": t + dur})
+            # Pauze de gândire după punctuație, grabă în rest
+            t += dur + (rnd.uniform(0.4, 1.5) if word[-1] in ".," else rnd.uniform(0.0, 0.15))
+        segments.append({"start": start, "end": words[-1]["end"],
+                         "text": "".join(w["word"] for w in words), "words": words})
+        t += rnd.uniform(0.2, 2.0)
+    return segments
+
+
+def cut_drift(segments: List[Dict[str, Any]]) -> Tuple[List[int], int]:
+    """Drift (ms) of every cue boundary when word timings are ignored"""
+    with_words = list(process_cues(map(segment_cue, segments), **_pp()))
+    plain = list(process_cues((Cue(c.start, c.end, c.text) for c in map(segment_cue, segments)), **_pp()))
+    if [c.text for c in with_words] != [c.text for c in plain]:
+        raise RuntimeError("Word timings changed the cue texts")
+    drift = []
+    for a, b in zip(with_words, plain):
+        drift.append(abs(a.start - b.start))
+        drift.append(abs(a.end - b.end))
+    return drift, len(with_words)
+
+
+def _pp() -> Dict[str, int]:
+    return {"min_chars": PP["min_chars"], "max_chars": PP["max_chars"], "gap_ms": PP["subtitle_gap_ms"]}
+
+
+def report_drift(label: str, drift: List[int], cues: int):
+    moved = [d for d in drift if d]
+    if not moved:
+        print(f"{label}: {cues} cues, no boundary moved")
+        return
+    moved.sort()
+    p95 = moved[min(len(moved) - 1, int(len(moved) * 0.95))]
+    print(f"{label}: {cues} cues, {len(moved)} boundaries moved; drift "
+          f"mean {statistics.mean(moved):.0f} ms, p95 {p95} ms, max {moved[-1]} ms")
+
+
+def inference_cost(files: List[Path], model_name: str, language: str) -> List[Dict[str, Any]]:
+    """Transcribe each file with and without word timestamps; word-timed segments"""
+    from audio_io import SAMPLE_RATE, load_audio
+    from model_registry import get_model
+
+    model = get_model(model_name)
+    segments = []
+    print(f"{'file':30} {'audio':>8} {'plain':>9} {'words':>9} {'overhead':>9}")
+    for path in files:
+        audio = load_audio(path)
+        secs = {}
+        for words in (False, True):
+            start = time.perf_counter()
+            result = model.transcribe(audio, language=language, verbose=None,
+                                      temperature=0.0, word_timestamps=words)
+            secs[words] = time.perf_counter() - start
+        segments.extend(pack_words(result["segments"]))
+        print(f"{path.name[:30]:30} {len(audio) / SAMPLE_RATE:7.0f}s {secs[False]:8.1f}s "
+              f"{secs[True]:8.1f}s {(secs[True] / secs[False] - 1) * 100:8.0f}%")
+    return segments
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Word timestamp cost and sync benchmark")
+    parser.add_argument("files", nargs="*", type=Path, help="Media files to transcribe")
+    parser.add_argument("--model", default="tiny", help="Whisper model (default: tiny)")
+    parser.add_argument("--language", default="ro", help="Language (default: ro)")
+    parser.add_argument("--segments", type=int, default=20_000,
+                        help="Synthetic segments when no files are given (default: 20000)")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    if args.files:
+        segments = inference_cost(args.files, args.model, args.language)
+        report_drift("Proportional vs. word cuts", *cut_drift(segments))
+        return
+
+    print("No media files: sync check on synthetic segments only")
+    report_drift("Proportional vs. word cuts", *cut_drift(synthetic_segments(args.segments)))
+    start = time.perf_counter()
+    cues = sum(1 for _ in process_cues(map(segment_cue, synthetic_segments(args.segments)), **_pp()))
+    print(f"Engine with word timings: {cues} cues in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
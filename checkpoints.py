@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Per-file stage checkpoints
+Each finished pipeline stage leaves its output next to a small manifest, so a
+run that was killed or failed later on resumes from the last completed stage
+instead of decoding and transcribing again:
+
+  decoded        audio.npy      16 kHz float32 PCM
+  transcribed    segments.json  raw Whisper segments (+ language)
+  postprocessed  final.srt      the finished subtitles, not yet published
+
+Every file is written to a temporary name and renamed into place, and the
+manifest is updated last, so a crash mid-write leaves the previous stage
+intact. A checkpoint is tied to the source file (path, size, mtime) and to
+the options that shape the result; any change starts the file over.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, IO, List, Optional, Union
+
+from transcript_cache import compact_segments
+
+if TYPE_CHECKING:
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DECODED = "decoded"
+TRANSCRIBED = "transcribed"
+POSTPROCESSED = "postprocessed"
+STAGES = (DECODED, TRANSCRIBED, POSTPROCESSED)
+
+_MANIFEST = "manifest.json"
+_AUDIO = "audio.npy"
+_SEGMENTS = "segments.json"
+_FINAL = "final.srt"
+
+
+def _atomic_write(path: Path, write: Callable[[IO], None], mode: str = "wb"):
+    tmp = path.with_name(f"{path.name}.tmp{os.getpid()}")
+    try:
+        with open(tmp, mode, **({} if "b" in mode else {"encoding": "utf-8"})) as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def source_fingerprint(source: Union[str, Path]) -> Dict[str, Any]:
+    st = Path(source).stat()
+    return {"path": str(Path(source).resolve()), "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+class StageCheckpoint:
+    """Checkpoint directory of one source file"""
+
+    def __init__(self, root: Union[str, Path], source: Union[str, Path], options: Dict[str, Any]):
+        self.identity = {"source": source_fingerprint(source), "options": options}
+        digest = hashlib.sha256(json.dumps(self.identity, sort_keys=True, default=str).encode()).hexdigest()
+        self.dir = Path(root) / f"{Path(source).stem}-{digest[:16]}"
+        self.final_path = self.dir / _FINAL
+
+    def manifest(self) -> Optional[Dict[str, Any]]:
+        """Manifest of the last completed stage, or None when there is nothing to resume"""
+        p = self.dir / _MANIFEST
+        try:
+            manifest = json.loads(p.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable checkpoint {self.dir.name}: {e}")
+            return None
+        if manifest.get("identity") != json.loads(json.dumps(self.identity, default=str)):
+            return None  # other source contents or options
+        return manifest if manifest.get("stage") in STAGES else None
+
+    def _mark(self, stage: str, **extra: Any):
+        manifest = {"identity": self.identity, "stage": stage, "at": time.time()}
+        manifest.update(extra)
+        _atomic_write(self.dir / _MANIFEST, lambda f: json.dump(manifest, f, default=str), "w")
+
+    def save_audio(self, audio: "np.ndarray"):
+        import numpy as np
+        self.dir.mkdir(parents=True, exist_ok=True)
+        _atomic_write(self.dir / _AUDIO, lambda f: np.save(f, audio, allow_pickle=False))
+        self._mark(DECODED)
+
+    def load_audio(self) -> "np.ndarray":
+        import numpy as np
+        return np.load(self.dir / _AUDIO, allow_pickle=False)
+
+    def save_segments(self, segments: List[Dict[str, Any]], language: Optional[str] = None):
+        self.dir.mkdir(parents=True, exist_ok=True)
+        data = {"language": language, "segments": compact_segments(segments)}
+        _atomic_write(self.dir / _SEGMENTS, lambda f: json.dump(data, f, ensure_ascii=False), "w")
+        self._mark(TRANSCRIBED)
+        # The audio is no longer needed once the segments are safe
+        (self.dir / _AUDIO).unlink(missing_ok=True)
+
+    def load_segments(self) -> List[Dict[str, Any]]:
+        return json.loads((self.dir / _SEGMENTS).read_text(encoding="utf-8"))["segments"]
+
+    def mark_postprocessed(self, **extra: Any):
+        """final_path has been written completely; extra is kept in the manifest"""
+        self._mark(POSTPROCESSED, **extra)
+
+    def publish(self, dest: Union[str, Path]):
+        """Copy the finished SRT to its destination atomically"""
+        dest = Path(dest)
+        with open(self.final_path, "rb") as src:
+            _atomic_write(dest, lambda f: shutil.copyfileobj(src, f))
+
+    def clear(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
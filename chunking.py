@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Chunked transcription for long media
+Audio is streamed from ffmpeg in fixed overlapping windows, each window is
+transcribed on its own (optionally in worker processes) and the segments are
+stitched back onto one timeline with the overlap de-duplicated.
+"""
+
+import logging
+import multiprocessing
+import re
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from audio_io import SAMPLE_RATE, iter_audio_windows
+from model_registry import get_model, set_torch_threads, worker_thread_budget
+from subtitle_engine import pack_words
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WINDOW_S = 300.0
+DEFAULT_OVERLAP_S = 5.0
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _words(text: str) -> List[str]:
+    return [w.lower() for w in _WORD_RE.findall(text)]
+
+
+def _strip_repeated_prefix(prev_text: str, text: str, min_words: int = 2) -> str:
+    """Drop the start of text when it repeats the end of prev_text"""
+    prev, cur = _words(prev_text), _words(text)
+    for n in range(min(len(prev), len(cur)), min_words - 1, -1):
+        if prev[-n:] == cur[:n]:
+            # Cut after the n-th word of the original text
+            matches = list(_WORD_RE.finditer(text))
+            rest = text[matches[n - 1].end():].lstrip(" ,.;:!?-")
+            return " " + rest if rest else ""
+    return text
+
+
+def stitch_segments(
+    windows: Iterable[Tuple[float, float, List[Dict[str, Any]]]],
+    overlap_s: float
+) -> List[Dict[str, Any]]:
+    """Merge per-window segments, ordered by window offset
+
+    Each item is (offset, window length, segments with window-relative times).
+    Inside an overlap, segments are kept from the window whose centre they fall
+    on; text repeated across the cut is removed.
+    """
+    out: List[Dict[str, Any]] = []
+    ordered = sorted(windows, key=lambda w: w[0])
+    for i, (offset, length, segments) in enumerate(ordered):
+        lower = offset + overlap_s / 2 if i > 0 else float("-inf")
+        upper = offset + length - overlap_s / 2 if i < len(ordered) - 1 else float("inf")
+        for seg in segments:
+            start, end = seg["start"] + offset, seg["end"] + offset
+            mid = (start + end) / 2
+            if not (lower <= mid < upper):
+                continue
+            text = seg["text"]
+            if out and i > 0 and start < out[-1]["end"] + overlap_s:
+                text = _strip_repeated_prefix(out[-1]["text"], text)
+                if not text.strip():
+                    continue
+            start = max(start, out[-1]["end"]) if out else start
+            stitched = dict(seg, start=start, end=max(end, start), text=text)
+            if "word_ms" in seg:
+                if text != seg["text"]:
+                    # Words no longer match the trimmed text
+                    del stitched["word_text"], stitched["word_ms"]
+                else:
+                    shift = int(round(offset * 1000))
+                    stitched["word_ms"] = [t + shift for t in seg["word_ms"]]
+            stitched["id"] = len(out)
+            out.append(stitched)
+    return out
+
+
+def _transcribe_window(
+    offset: float,
+    audio: Any,
+    model_name: str,
+    options: Dict[str, Any],
+    vad_params: Optional[Dict[str, Any]] = None,
+    dtype: str = "float32"
+) -> Tuple[float, float, List[Dict[str, Any]], Optional[str], Optional[Dict[str, float]]]:
+    model = get_model(model_name, dtype=dtype)
+    stats = None
+    if vad_params is not None:
+        from vad import transcribe_speech_only
+        result, stats = transcribe_speech_only(model, audio, vad_params, verbose=None, **options)
+    else:
+        result = model.transcribe(audio, verbose=None, **options)
+    # Compact word timings: far less to pickle back from worker processes
+    segments = pack_words(result.get("segments", []))
+    return offset, len(audio) / SAMPLE_RATE, segments, result.get("language"), stats
+
+
+def _init_chunk_worker(threads: int, model_name: str, dtype: str = "float32"):
+    set_torch_threads(threads)
+    get_model(model_name, dtype=dtype)
+
+
+def transcribe_chunked(
+    audio_path: Union[str, Path],
+    model_name: str,
+    language: Optional[str] = None,
+    window_s: float = DEFAULT_WINDOW_S,
+    overlap_s: float = DEFAULT_OVERLAP_S,
+    workers: int = 1,
+    vad_params: Optional[Dict[str, Any]] = None,
+    dtype: str = "float32",
+    **options: Any
+) -> Dict[str, Any]:
+    """Transcribe a file window by window with flat peak memory
+
+    With vad_params set, silence inside each window is skipped; dtype selects
+    the model variant from the registry (e.g. "int8").
+    Returns a dict shaped like Whisper's transcribe() result.
+    """
+    options = dict(options, language=language, task="transcribe")
+    windows = iter_audio_windows(audio_path, window_s, overlap_s)
+    done: List[Tuple[float, float, List[Dict[str, Any]]]] = []
+    detected = language
+    vad_totals = {"total_s": 0.0, "speech_s": 0.0, "regions": 0}
+
+    def collect(res):
+        nonlocal detected
+        offset, length, segments, lang, stats = res
+        done.append((offset, length, segments))
+        detected = detected or lang
+        if stats:
+            for key in vad_totals:
+                vad_totals[key] += stats[key]
+        logger.info(f"Chunk at {offset / 60:.1f} min done ({len(segments)} segments)")
+
+    if workers <= 1:
+        for offset, audio in windows:
+            collect(_transcribe_window(offset, audio, model_name, options, vad_params, dtype))
+    else:
+        threads = worker_thread_budget(workers)
+        logger.info(f"Chunked mode: {workers} workers x {threads} torch threads")
+        # spawn, not fork: the caller may hold loaded models and running threads
+        # (server, language detection), and a forked torch/OpenMP runtime can deadlock
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                                 initializer=_init_chunk_worker,
+                                 initargs=(threads, model_name, dtype)) as pool:
+            pending = set()
+            for offset, audio in windows:
+                # Bound the number of decoded windows held in memory
+                while len(pending) >= workers * 2:
+                    finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for fut in finished:
+                        collect(fut.result())
+                pending.add(pool.submit(_transcribe_window, offset, audio, model_name, options,
+                                        vad_params, dtype))
+                del audio
+            for fut in wait(pending).done:
+                collect(fut.result())
+
+    if vad_params is not None and vad_totals["total_s"]:
+        from vad import describe_stats
+        vad_totals["speech_ratio"] = vad_totals["speech_s"] / vad_totals["total_s"]
+        logger.info(describe_stats(vad_totals))
+
+    segments = stitch_segments(done, overlap_s)
+    return {
+        "text": "".join(seg["text"] for seg in segments),
+        "segments": segments,
+        "language": detected,
+    }
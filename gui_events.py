@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Event pipe between worker threads and the Tk GUI
+Tk widgets may only be touched from the thread running mainloop. Workers
+therefore never call into the GUI: they post small events (log line,
+progress, per-file status) to an EventPipe, and the GUI drains everything
+pending once per frame. All new log lines are rendered with a single insert,
+and the log widget keeps at most max_lines lines (a ring buffer), so memory
+stays flat on day-long runs.
+"""
+
+from collections import deque
+from typing import Any, Deque, List, Optional, Tuple
+
+LOG = "log"
+PROGRESS = "progress"
+FILE_STATUS = "file"
+
+FRAME_MS = 50
+DEFAULT_LOG_LINES = 5000
+# Events handled per frame; the rest wait for the next frame
+MAX_EVENTS_PER_FRAME = 20000
+
+Event = Tuple[str, Any]
+
+
+class EventPipe:
+    """Thread-safe FIFO of GUI events (deque append/popleft are atomic)"""
+
+    def __init__(self):
+        self._events: Deque[Event] = deque()
+
+    def post(self, kind: str, payload: Any):
+        self._events.append((kind, payload))
+
+    def log(self, msg: str):
+        self.post(LOG, msg)
+
+    def progress(self, value: int, detail: str = ""):
+        self.post(PROGRESS, (value, detail))
+
+    def file_status(self, file: str, status: str, reason: str = ""):
+        self.post(FILE_STATUS, (file, status, reason))
+
+    def pending(self) -> int:
+        return len(self._events)
+
+    def drain(self, limit: int = MAX_EVENTS_PER_FRAME) -> List[Event]:
+        out: List[Event] = []
+        pop = self._events.popleft
+        for _ in range(limit):
+            try:
+                out.append(pop())
+            except IndexError:
+                break
+        return out
+
+
+def coalesce(
+    events: List[Event]
+) -> Tuple[List[str], Optional[Tuple[int, str]], List[Tuple[str, str, str]]]:
+    """(log lines, last (progress, detail), file statuses) of one frame"""
+    lines: List[str] = []
+    progress: Optional[Tuple[int, str]] = None
+    statuses: List[Tuple[str, str, str]] = []
+    for kind, payload in events:
+        if kind == LOG:
+            lines.append(payload)
+        elif kind == PROGRESS:
+            progress = payload  # only the latest value is drawn
+        elif kind == FILE_STATUS:
+            statuses.append(payload)
+    return lines, progress, statuses
+
+
+class LogView:
+    """Append-only view over a Tk Text widget, trimmed to max_lines"""
+
+    def __init__(self, widget: Any, max_lines: int = DEFAULT_LOG_LINES):
+        self.widget = widget
+        self.max_lines = max_lines
+        self.lines = 0
+
+    def append(self, lines: List[str]):
+        if not lines:
+            return
+        if len(lines) > self.max_lines:
+            # Older lines would be trimmed right away; don't render them at all
+            dropped = len(lines) - self.max_lines + 1
+            lines = [f"… {dropped} linii omise"] + lines[-(self.max_lines - 1):]
+        w = self.widget
+        w.config(state="normal")
+        w.insert("end", "\n".join(lines) + "\n")
+        self.lines += sum(1 + line.count("\n") for line in lines)
+        excess = self.lines - self.max_lines
+        if excess > 0:
+            w.delete("1.0", f"{excess + 1}.0")
+            self.lines -= excess
+        w.see("end")
+        w.config(state="disabled")
+
+    def clear(self):
+        self.widget.config(state="normal")
+        self.widget.delete("1.0", "end")
+        self.widget.config(state="disabled")
+        self.lines = 0
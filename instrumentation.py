@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Per-stage timing and resource instrumentation with a run report
+Every measured stage records wall time, CPU time (this process plus finished
+child processes such as ffmpeg) and the peak RSS seen so far. Measurements
+travel with the job dict (job["metrics"]), so they survive worker processes
+and staged pipelines, and are collected into a RunReport that is written as
+JSON (full detail) and/or CSV (one row per file and stage) for dashboards.
+
+CPU time and RSS are process-wide: when pipeline stages overlap, each stage's
+CPU figure includes the work of the stages running beside it.
+"""
+
+import csv
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+METRICS_KEY = "metrics"
+
+CSV_FIELDS = ["file", "status", "stage", "wall_s", "cpu_s", "peak_rss_mb", "audio_s", "rtf"]
+
+
+def cpu_seconds() -> float:
+    """User + system CPU of this process and its finished children"""
+    t = os.times()
+    return t.user + t.system + t.children_user + t.children_system
+
+
+def peak_rss_mb() -> Optional[float]:
+    """High-water mark of this process's resident memory, if the OS reports it"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class Measurement:
+    """Wall/CPU time of one block, plus peak RSS when it ended"""
+
+    def __init__(self):
+        self.wall_s = 0.0
+        self.cpu_s = 0.0
+        self.peak_rss_mb: Optional[float] = None
+        self._wall0 = time.perf_counter()
+        self._cpu0 = cpu_seconds()
+
+    def stop(self) -> "Measurement":
+        self.wall_s = time.perf_counter() - self._wall0
+        self.cpu_s = cpu_seconds() - self._cpu0
+        self.peak_rss_mb = peak_rss_mb()
+        return self
+
+    def as_dict(self, share: float = 1.0) -> Dict[str, Any]:
+        return {
+            "wall_s": round(self.wall_s * share, 4),
+            "cpu_s": round(self.cpu_s * share, 4),
+            "peak_rss_mb": round(self.peak_rss_mb, 1) if self.peak_rss_mb is not None else None,
+        }
+
+
+@contextmanager
+def measure() -> Iterator[Measurement]:
+    """with measure() as m: ...  -> m.wall_s, m.cpu_s, m.peak_rss_mb"""
+    m = Measurement()
+    try:
+        yield m
+    finally:
+        m.stop()
+
+
+def record(job: Dict[str, Any], stage: str, m: Measurement, share: float = 1.0):
+    """Attach a stage measurement to a job dict (added up if the stage repeats)"""
+    metrics = job.setdefault(METRICS_KEY, {})
+    entry = m.as_dict(share)
+    prev = metrics.get(stage)
+    if prev:
+        entry["wall_s"] = round(prev["wall_s"] + entry["wall_s"], 4)
+        entry["cpu_s"] = round(prev["cpu_s"] + entry["cpu_s"], 4)
+    metrics[stage] = entry
+
+
+def timed_stage(stage: str, func: Callable[[Dict[str, Any]], Dict[str, Any]]) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+    """Wrap a pipeline stage so its measurement follows the job (or its final result)"""
+    def run(job: Dict[str, Any]) -> Dict[str, Any]:
+        with measure() as m:
+            out = func(job)
+        record(job, stage, m)
+        if out is not job and isinstance(out, dict):
+            out.setdefault(METRICS_KEY, job[METRICS_KEY])
+            if "audio_s" in job:
+                out.setdefault("audio_s", job["audio_s"])
+        return out
+    return run
+
+
+def timed_batch_stage(
+    stage: str,
+    func: Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]]
+) -> Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]]:
+    """Like timed_stage for a list of jobs; each job is charged an equal share"""
+    def run(jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        with measure() as m:
+            outs = func(jobs)
+        share = 1.0 / max(1, len(jobs))
+        for job, out in zip(jobs, outs):
+            if "status" in job:
+                continue  # already final before this stage
+            record(job, stage, m, share)
+            if out is not job:
+                out.setdefault(METRICS_KEY, job[METRICS_KEY])
+                if "audio_s" in job:
+                    out.setdefault("audio_s", job["audio_s"])
+        return outs
+    return run
+
+
+class RunReport:
+    """Collects per-file results and stage metrics for one run"""
+
+    def __init__(self, entry: str, settings: Optional[Dict[str, Any]] = None):
+        self.entry = entry
+        self.settings = settings or {}
+        self.files: List[Dict[str, Any]] = []
+        self.model_loads: List[Dict[str, Any]] = []
+        self.started = time.time()
+        self._run = Measurement()
+        self._lock = threading.Lock()
+
+    def add_file(
+        self,
+        file: str,
+        status: str,
+        stages: Optional[Dict[str, Dict[str, Any]]] = None,
+        audio_s: Optional[float] = None,
+        reason: str = ""
+    ):
+        stages = stages or {}
+        wall = sum(s["wall_s"] for s in stages.values())
+        peaks = [s["peak_rss_mb"] for s in stages.values() if s.get("peak_rss_mb") is not None]
+        row = {
+            "file": file,
+            "status": status,
+            "reason": reason,
+            "audio_s": round(audio_s, 3) if audio_s else None,
+            "wall_s": round(wall, 4),
+            "cpu_s": round(sum(s["cpu_s"] for s in stages.values()), 4),
+            "peak_rss_mb": max(peaks) if peaks else None,
+            # Real-time factor: processing time / audio duration (< 1 is faster than real time)
+            "rtf": round(wall / audio_s, 4) if audio_s else None,
+            "stages": stages,
+        }
+        with self._lock:
+            self.files.append(row)
+
+    def add_model_loads(self, load_log: List[Dict[str, Any]]):
+        """Model loads (ModelRegistry.load_log entries) that happened during this run"""
+        with self._lock:
+            self.model_loads.extend(e for e in load_log if e["at"] >= self.started)
+
+    def add_result(self, result: Dict[str, Any]):
+        """Add a final job result dict ({"status", "file", "reason", "metrics", ...})"""
+        self.add_file(result["file"], result["status"], result.get(METRICS_KEY),
+                      result.get("audio_s"), result.get("reason", ""))
+
+    def to_dict(self) -> Dict[str, Any]:
+        self._run.stop()
+        audio = sum(f["audio_s"] or 0.0 for f in self.files)
+        return {
+            "run": {
+                "entry": self.entry,
+                "started": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started)),
+                "wall_s": round(self._run.wall_s, 3),
+                "cpu_s": round(self._run.cpu_s, 3),
+                "peak_rss_mb": round(self._run.peak_rss_mb, 1) if self._run.peak_rss_mb is not None else None,
+                "files": len(self.files),
+                "failed": sum(1 for f in self.files if f["status"] != "completed"),
+                "audio_s": round(audio, 3),
+                "rtf": round(self._run.wall_s / audio, 4) if audio else None,
+                "settings": self.settings,
+            },
+            "model_loads": self.model_loads,
+            "files": self.files,
+        }
+
+    def csv_rows(self) -> List[Dict[str, Any]]:
+        rows = []
+        for f in self.files:
+            for stage, s in f["stages"].items():
+                rows.append({"file": f["file"], "status": f["status"], "stage": stage,
+                             "wall_s": s["wall_s"], "cpu_s": s["cpu_s"],
+                             "peak_rss_mb": s.get("peak_rss_mb"), "audio_s": f["audio_s"], "rtf": None})
+            rows.append({"file": f["file"], "status": f["status"], "stage": "total",
+                         "wall_s": f["wall_s"], "cpu_s": f["cpu_s"], "peak_rss_mb": f["peak_rss_mb"],
+                         "audio_s": f["audio_s"], "rtf": f["rtf"]})
+        return rows
+
+    def write(self, path: Union[str, Path]) -> Path:
+        """Write the report; .csv gives the flat per-stage table, anything else JSON"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.suffix.lower() == ".csv":
+            with open(path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+                writer.writeheader()
+                writer.writerows(self.csv_rows())
+        else:
+            path.write_text(json.dumps(self.to_dict(), indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+        return path
+
+    def write_all(self, directory: Union[str, Path], stem: Optional[str] = None) -> List[Path]:
+        """JSON + CSV side by side, named after the run start time"""
+        stem = stem or "run-" + time.strftime("%Y%m%d-%H%M%S", time.localtime(self.started))
+        return [self.write(Path(directory) / f"{stem}.json"), self.write(Path(directory) / f"{stem}.csv")]
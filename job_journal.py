@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Append-only job journal (SQLite, WAL mode)
+Every state change of a file (queued, decoding, transcribing, postprocessing,
+done, failed, aborted) is one appended row, so recording a transition costs
+the same on file 50 000 as on file 1 and a crash can at worst lose the last
+row. Several processes may write at once (parallel workers open their own
+connection). On startup the journal is compacted to one row per file, and
+states() gives an in-memory map for O(1) resume lookups.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+DECODING = "decoding"
+TRANSCRIBING = "transcribing"
+POSTPROCESSING = "postprocessing"
+DONE = "done"
+FAILED = "failed"
+ABORTED = "aborted"
+
+# Result status of a job dict -> journal state
+RESULT_STATES = {"completed": DONE, "failed": FAILED, "aborted": ABORTED}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    seq     INTEGER PRIMARY KEY AUTOINCREMENT,
+    file    TEXT NOT NULL,
+    state   TEXT NOT NULL,
+    at      REAL NOT NULL,
+    wall_s  REAL,
+    reason  TEXT,
+    data    TEXT
+);
+CREATE INDEX IF NOT EXISTS events_file ON events (file, seq);
+"""
+
+
+class JobJournal:
+    """Per-file state transitions, shared by threads and processes"""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False,
+                                     isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # WAL + NORMAL: durable across application crashes, one fsync per checkpoint
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def record(
+        self,
+        file: str,
+        state: str,
+        wall_s: Optional[float] = None,
+        reason: Optional[str] = None,
+        **data: Any
+    ):
+        """Append one state transition"""
+        self.record_many([(file, state)], wall_s, reason, **data)
+
+    def record_many(
+        self,
+        items: Iterable[Tuple[str, str]],
+        wall_s: Optional[float] = None,
+        reason: Optional[str] = None,
+        **data: Any
+    ):
+        """Append (file, state) transitions in a single transaction"""
+        payload = json.dumps(data, ensure_ascii=False) if data else None
+        now = time.time()
+        rows = [(file, state, now, wall_s, reason, payload) for file, state in items]
+        with self._lock:
+            with self._conn:
+                self._conn.execute("BEGIN")
+                self._conn.executemany(
+                    "INSERT INTO events (file, state, at, wall_s, reason, data) VALUES (?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+
+    def _folded(self) -> Dict[str, Dict[str, Any]]:
+        """Latest state per file; data of all its events merged (later wins)"""
+        out: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT file, state, at, wall_s, reason, data FROM events ORDER BY seq"
+            ).fetchall()
+        for file, state, at, wall_s, reason, data in rows:
+            entry = out.setdefault(file, {"data": {}})
+            entry.update(state=state, at=at, wall_s=wall_s, reason=reason)
+            if data:
+                entry["data"].update(json.loads(data))
+        return out
+
+    def states(self) -> Dict[str, Dict[str, Any]]:
+        """file -> {"state", "at", "wall_s", "reason", "data"}"""
+        return self._folded()
+
+    def compact(self) -> int:
+        """Rewrite the journal as one row per file; return rows dropped"""
+        folded = self._folded()
+        with self._lock:
+            before = self._conn.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+            with self._conn:
+                self._conn.execute("BEGIN IMMEDIATE")
+                self._conn.execute("DELETE FROM events")
+                self._conn.executemany(
+                    "INSERT INTO events (file, state, at, wall_s, reason, data) VALUES (?, ?, ?, ?, ?, ?)",
+                    [(file, e["state"], e["at"], e["wall_s"], e["reason"],
+                      json.dumps(e["data"], ensure_ascii=False) if e["data"] else None)
+                     for file, e in folded.items()]
+                )
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return before - len(folded)
+
+    def clear(self):
+        """Forget every file"""
+        with self._lock:
+            self._conn.execute("DELETE FROM events")
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def migrate_json(self, recovery_file: Union[str, Path], languages_key: Optional[str] = None) -> int:
+        """Import an old {file: status} recovery.json once, then rename it"""
+        src = Path(recovery_file)
+        if not src.exists():
+            return 0
+        try:
+            state = json.loads(src.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable {src}: {e}")
+            state = {}
+        languages = state.pop(languages_key, {}) if languages_key else {}
+        count = 0
+        for file, status in state.items():
+            data = {}
+            if file in languages:
+                data = {"language": languages[file][0], "language_prob": languages[file][1]}
+            self.record(file, RESULT_STATES.get(status, status), **data)
+            count += 1
+        for file, (language, prob) in languages.items():
+            if file not in state:
+                self.record(file, QUEUED, language=language, language_prob=prob)
+                count += 1
+        os.replace(src, src.with_name(src.name + ".migrated"))
+        return count
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Spoken language detection for language "auto"
+Whisper's language head runs once per file on a short sample (the first
+speech found in the opening minutes), instead of once per 30 s window inside
+transcribe(). Detections are kept in the transcript cache, keyed by the media
+content, so a file is never probed twice.
+"""
+
+import logging
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Optional, Tuple, Union
+
+from audio_io import SAMPLE_RATE, load_audio
+from transcript_cache import TranscriptCache, cache_key, content_hash
+
+if TYPE_CHECKING:
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+AUTO = "auto"
+DEFAULT_SAMPLE_S = 30.0
+
+# Audio decoded from the start of the file to look for speech in
+SCAN_S = 120.0
+
+Detection = Tuple[str, float]  # (language code, probability)
+
+
+def pick_sample(audio: "np.ndarray", sample_s: float = DEFAULT_SAMPLE_S) -> "np.ndarray":
+    """Up to sample_s seconds of speech, skipping leading silence and music"""
+    from vad import compact_speech, detect_speech
+    n = int(sample_s * SAMPLE_RATE)
+    regions = detect_speech(audio)
+    if not regions:
+        return audio[:n]
+    compact, _ = compact_speech(audio, regions)
+    return compact[:n]
+
+
+def detect_language(model: Any, audio: "np.ndarray", sample_s: float = DEFAULT_SAMPLE_S) -> Detection:
+    """Most likely language of the audio and its probability"""
+    if not model.is_multilingual:
+        return "en", 1.0
+    import whisper
+    sample = pick_sample(audio, sample_s)
+    mel = whisper.log_mel_spectrogram(whisper.pad_or_trim(sample), model.dims.n_mels)
+    mel = mel.to(model.device, dtype=model.encoder.conv1.weight.dtype)
+    _, probs = model.detect_language(mel)
+    language = max(probs, key=probs.get)
+    return language, float(probs[language])
+
+
+def detection_key(media_hash: str, model_name: str, sample_s: float = DEFAULT_SAMPLE_S) -> str:
+    return cache_key(media_hash, model_name, AUTO, {"detect_sample_s": sample_s})
+
+
+def detect_file_language(
+    path: Union[str, Path],
+    load_model: Callable[[], Any],
+    model_name: str,
+    cache: Optional[TranscriptCache] = None,
+    sample_s: float = DEFAULT_SAMPLE_S
+) -> Detection:
+    """Detect the language of a media file, reusing a cached detection
+
+    load_model is only called on a cache miss.
+    """
+    key = None
+    if cache is not None:
+        try:
+            key = detection_key(content_hash(path), model_name, sample_s)
+            entry = cache.get(key)
+        except OSError as e:
+            logger.warning(f"Transcript cache unavailable: {e}")
+            entry = None
+        if entry and entry.get("language"):
+            return entry["language"], float(entry.get("language_prob") or 0.0)
+
+    audio = load_audio(path, timeout=120, duration=SCAN_S)
+    language, prob = detect_language(load_model(), audio, sample_s)
+    if key is not None:
+        try:
+            cache.put(key, {"language": language, "segments": []},
+                      {"source": str(path), "model": model_name, "language_prob": prob})
+        except OSError as e:
+            logger.warning(f"Could not store language detection in cache: {e}")
+    return language, prob
@@ -3,21 +3,29 @@
 Enhanced subtitle merger script
 Versiune îmbunătățită - Sep 2025
 Combină subtitrările scurte și împarte cele lungi pentru lizibilitate optimă
+
+Merge/split-ul propriu-zis e în subtitle_engine.py (comun cu video-to-text.py
+și mp3-to-text-v57.py); scriptul de față doar citește și scrie fișiere SRT.
+
+Mod batch: re-optimizează arbori întregi de directoare pe mai multe procese
+    python3 merge_short_subs.py --batch DIR|GLOB [...] [--jobs N] [--force]
 """
 
-import pysrt
 import sys
 import os
-from datetime import datetime, timedelta
+import glob
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
 import logging
 
-# Verificarea dependințelor critice
-try:
-    import pysrt
-except ImportError:
-    print("ERROR: pysrt library not found!")
-    print("Install with: pip install pysrt")
-    sys.exit(1)
+# split_custom/merge_segments rămân importabile și de aici
+from subtitle_engine import (
+    Cue, MIN_CHARS, MAX_CHARS, SUBTITLE_GAP_MS,
+    merge_segments, process_srt_file, split_custom, split_timed
+)
 
 # Configurare logging
 logging.basicConfig(
@@ -29,11 +37,6 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Setări configurabile
-MIN_CHARS = 80
-MAX_CHARS = 120
-SUBTITLE_GAP_MS = 100  # Gap minim între subtitrări în milisecunde
-
 def check_file_permissions(input_file, output_file):
     """Verifică existența și permisiunile fișierelor"""
     
@@ -59,133 +62,6 @@ def check_file_permissions(input_file, output_file):
     
     return True
 
-def split_custom(text):
-    """
-    Împarte textul lung în segmente mai mici, prioritizând punctuația
-    """
-    length = len(text)
-    if length <= MAX_CHARS:
-        return [text]
-    
-    # Stabilește punctul de tăiere bazat pe lungime
-    if 121 <= length < 150:
-        preferred_cut = 70
-    elif 150 <= length < 180:
-        preferred_cut = 90
-    else:
-        preferred_cut = 100
-    
-    # Caută cel mai bun punct de tăiere în ordine de prioritate
-    cut_positions = []
-    
-    # 1. Prioritate: punctuație de sfârșit de propoziție
-    for punct in ['. ', '! ', '? ']:
-        pos = text.rfind(punct, 0, preferred_cut + 10)
-        if pos > preferred_cut - 20:  # Nu prea departe de punctul ideal
-            cut_positions.append((pos + len(punct), 'sentence'))
-    
-    # 2. Prioritate: alte semne de punctuație
-    for punct in [', ', '; ', ': ', ' - ', ' — ']:
-        pos = text.rfind(punct, 0, preferred_cut + 10)
-        if pos > preferred_cut - 15:
-            cut_positions.append((pos + len(punct), 'punctuation'))
-    
-    # 3. Prioritate: spații simple
-    pos = text.rfind(' ', 0, preferred_cut + 5)
-    if pos > preferred_cut - 10:
-        cut_positions.append((pos + 1, 'space'))
-    
-    # Alege cel mai bun punct de tăiere
-    if cut_positions:
-        # Sortează după prioritate și proximitate la punctul ideal
-        cut_positions.sort(key=lambda x: (
-            0 if x[1] == 'sentence' else 1 if x[1] == 'punctuation' else 2,
-            abs(x[0] - preferred_cut)
-        ))
-        split_idx = cut_positions[0][0]
-    else:
-        # Fallback: tăiere forțată
-        split_idx = preferred_cut
-        logger.warning(f"Forced split at position {split_idx} - no good break point found")
-    
-    left = text[:split_idx].strip()
-    right = text[split_idx:].strip()
-    
-    # Recursiv pentru partea dreaptă dacă încă e prea lungă
-    right_parts = split_custom(right)
-    
-    return [left] + right_parts
-
-def subrip_add_milliseconds(subrip_time, milliseconds):
-    """Adaugă milisecunde la un timp SubRip"""
-    try:
-        base_dt = datetime(
-            1900, 1, 1,
-            subrip_time.hours,
-            subrip_time.minutes,
-            subrip_time.seconds,
-            subrip_time.milliseconds * 1000
-        )
-        
-        new_dt = base_dt + timedelta(milliseconds=milliseconds)
-        
-        return pysrt.SubRipTime(
-            hours=new_dt.hour,
-            minutes=new_dt.minute,
-            seconds=new_dt.second,
-            milliseconds=new_dt.microsecond // 1000
-        )
-    except Exception as e:
-        logger.error(f"Error in time calculation: {e}")
-        return subrip_time
-
-def split_text_with_timing(text, start, end):
-    """
-    Împarte textul și redistribuie timpul proporțional, cu gap-uri între subtitrări
-    """
-    chunks = split_custom(text)
-    if len(chunks) == 1:
-        return [(chunks[0], start, end)]
-    
-    # Calculează durata totală disponibilă
-    total_duration_ms = end.ordinal - start.ordinal
-    
-    # Rezervă timp pentru gap-urile dintre subtitrări
-    gaps_needed = len(chunks) - 1
-    total_gap_time = gaps_needed * SUBTITLE_GAP_MS
-    
-    if total_duration_ms <= total_gap_time:
-        logger.warning("Duration too short for proper gaps, using minimal gaps")
-        available_duration = total_duration_ms
-        gap_time = max(50, total_duration_ms // (gaps_needed + 1)) if gaps_needed > 0 else 0
-    else:
-        available_duration = total_duration_ms - total_gap_time
-        gap_time = SUBTITLE_GAP_MS
-    
-    # Calculează proporțiile bazate pe lungimea textului
-    total_chars = sum(len(chunk) for chunk in chunks)
-    
-    result = []
-    current_start = start
-    
-    for i, chunk in enumerate(chunks):
-        proportion = len(chunk) / total_chars
-        chunk_duration = int(proportion * available_duration)
-        
-        # Asigură-te că ultima porțiune folosește tot timpul rămas
-        if i == len(chunks) - 1:
-            chunk_end = end
-        else:
-            chunk_end = subrip_add_milliseconds(current_start, chunk_duration)
-        
-        result.append((chunk, current_start, chunk_end))
-        
-        # Adaugă gap pentru următoarea subtitrare (dacă nu e ultima)
-        if i < len(chunks) - 1:
-            current_start = subrip_add_milliseconds(chunk_end, gap_time)
-    
-    return result
-
 def show_progress(current, total, prefix="Processing"):
     """Afișează bara de progres"""
     if total == 0:
@@ -203,114 +79,189 @@ def show_progress(current, total, prefix="Processing"):
     if current == total:
         print()  # New line when complete
 
-def process_subtitles(input_file, output_file):
-    """Procesează fișierul de subtitrări principal"""
+def _process_file(input_file, output_file, min_chars, max_chars, gap_ms, weights=None,
+                  progress=None):
+    """Procesare în flux cu fallback UTF-8 -> latin-1; întoarce (încărcate, salvate)"""
+    try:
+        return process_srt_file(input_file, output_file, min_chars, max_chars, gap_ms,
+                                weights, encoding='utf-8', progress=progress)
+    except UnicodeDecodeError:
+        logger.warning(f"UTF-8 decoding failed for '{input_file}', trying with latin-1")
+        return process_srt_file(input_file, output_file, min_chars, max_chars, gap_ms,
+                                weights, encoding='latin-1', progress=progress)
+
+def process_subtitles(input_file, output_file, min_chars=MIN_CHARS, max_chars=MAX_CHARS,
+                      gap_ms=SUBTITLE_GAP_MS, weights=None):
+    """Procesează fișierul de subtitrări principal
+    
+    Fișierul e citit, procesat și scris în flux (memorie constantă)
+    """
     
     logger.info(f"Starting subtitle processing: {input_file} -> {output_file}")
     
+    def progress(done, total):
+        show_progress(done, total, "Processing")
+    
     try:
-        # Încarcă subtitrările cu encoding explicit
-        subs = pysrt.open(input_file, encoding='utf-8')
-        logger.info(f"Loaded {len(subs)} subtitles from input file")
-        
-    except UnicodeDecodeError:
-        logger.warning("UTF-8 decoding failed, trying with latin-1")
-        try:
-            subs = pysrt.open(input_file, encoding='latin-1')
-        except Exception as e:
-            logger.error(f"Failed to read subtitle file with multiple encodings: {e}")
-            return False
-            
+        loaded, saved = _process_file(input_file, output_file, min_chars, max_chars, gap_ms,
+                                      weights, progress)
     except Exception as e:
-        logger.error(f"Failed to load subtitle file: {e}")
+        logger.error(f"Failed to process subtitle file: {e}")
         return False
     
-    if not subs:
+    if not loaded:
         logger.error("No subtitles found in input file")
+        os.remove(output_file)
         return False
     
-    # Procesarea principală
-    merged_subs = []
-    temp_text = ""
-    start_time = None
-    processed_count = 0
-    
-    logger.info("Processing subtitles...")
-    
-    for i, sub in enumerate(subs):
-        # Progress tracking
-        if i % 10 == 0 or i == len(subs) - 1:
-            show_progress(i + 1, len(subs), "Processing")
-        
-        # Verifică dacă subtitrarea are text valid
-        if not sub.text or not sub.text.strip():
-            logger.debug(f"Skipping empty subtitle at index {i}")
-            continue
-        
-        # Inițializează dacă e primul text
-        if not temp_text:
-            start_time = sub.start
-        
-        # Adaugă textul curent (curăță newline-urile)
-        clean_text = sub.text.strip().replace('\n', ' ').replace('\r', '')
-        temp_text += " " + clean_text if temp_text else clean_text
-        
-        # Decide dacă să proceseze acum
-        should_process = (
-            len(temp_text.strip()) >= MIN_CHARS or 
-            i == len(subs) - 1 or
-            len(temp_text.strip()) > MAX_CHARS * 2  # Evită acumularea excesivă
-        )
-        
-        if should_process:
-            end_time = sub.end
-            full_text = temp_text.strip()
-            
-            if len(full_text) > MAX_CHARS:
-                # Împarte textul lung
-                split_segments = split_text_with_timing(full_text, start_time, end_time)
-                for text_part, chunk_start, chunk_end in split_segments:
-                    merged_subs.append(pysrt.SubRipItem(
-                        index=len(merged_subs) + 1,
-                        start=chunk_start,
-                        end=chunk_end,
-                        text=text_part.strip()
-                    ))
-                    processed_count += 1
-            else:
-                # Păstrează textul ca o singură subtitrare
-                merged_subs.append(pysrt.SubRipItem(
-                    index=len(merged_subs) + 1,
-                    start=start_time,
-                    end=end_time,
-                    text=full_text
-                ))
-                processed_count += 1
-            
-            # Reset pentru următoarea secvență
-            temp_text = ""
-            start_time = None
+    logger.info(f"Successfully saved {saved} processed subtitles to '{output_file}'")
+    logger.info(f"Compression ratio: {loaded} -> {saved} subtitles")
     
-    # Salvează rezultatul
-    try:
-        result_file = pysrt.SubRipFile(merged_subs)
-        result_file.save(output_file, encoding='utf-8')
-        
-        logger.info(f"Successfully saved {len(merged_subs)} processed subtitles to '{output_file}'")
-        logger.info(f"Compression ratio: {len(subs)} -> {len(merged_subs)} subtitles")
-        
+    return True
+
+# ----- Mod batch -----
+
+RAW_SUFFIX = "_raw.srt"
+MERGED_SUFFIX = "_merged.srt"
+
+def batch_output_path(input_file):
+    """video_raw.srt -> video.srt, orice alt .srt -> nume_merged.srt"""
+    name = input_file.name
+    if name.endswith(RAW_SUFFIX):
+        return input_file.with_name(name[:-len(RAW_SUFFIX)] + ".srt")
+    return input_file.with_name(input_file.stem + MERGED_SUFFIX)
+
+def collect_batch_inputs(targets, pattern="*" + RAW_SUFFIX):
+    """Fișierele de intrare din directoare (recursiv, după pattern) și glob-uri"""
+    found = []
+    for target in targets:
+        path = Path(target)
+        if path.is_dir():
+            found.extend(p for p in path.rglob(pattern) if p.is_file())
+        elif path.is_file():
+            found.append(path)
+        else:
+            matches = [Path(p) for p in glob.glob(target, recursive=True)]
+            if not matches:
+                logger.warning(f"No files match '{target}'")
+            found.extend(p for p in matches if p.is_file() and p.suffix.lower() == ".srt")
+    # Ieșirile unei rulări anterioare nu sunt intrări: nume_merged.srt, precum și
+    # video.srt lângă video_raw.srt (sau ieșirea oricărui alt fișier găsit)
+    outputs = {batch_output_path(p).resolve() for p in found}
+    unique = {p.resolve(): p for p in found if not is_batch_output(p) and p.resolve() not in outputs}
+    return sorted(unique.values())
+
+def is_batch_output(path):
+    if path.name.endswith(MERGED_SUFFIX):
         return True
-        
-    except Exception as e:
-        logger.error(f"Failed to save output file: {e}")
+    return not path.name.endswith(RAW_SUFFIX) and path.with_name(path.stem + RAW_SUFFIX).exists()
+
+def is_up_to_date(input_file, output_file):
+    try:
+        return output_file.stat().st_mtime >= input_file.stat().st_mtime
+    except FileNotFoundError:
         return False
 
+def _init_batch_worker():
+    # Fără loguri INFO per fișier din workeri; erorile rămân vizibile
+    logger.setLevel(logging.WARNING)
+
+def _batch_worker(task):
+    input_file, output_file, min_chars, max_chars, gap_ms = task
+    if not check_file_permissions(str(input_file), str(output_file)):
+        return input_file, False, 0, 0, "permission check failed"
+    try:
+        loaded, saved = _process_file(str(input_file), str(output_file), min_chars, max_chars, gap_ms)
+    except Exception as e:
+        return input_file, False, 0, 0, str(e)
+    if not loaded:
+        os.remove(output_file)
+        return input_file, False, 0, 0, "no subtitles found"
+    return input_file, True, loaded, saved, ""
+
+def run_batch(inputs, min_chars=MIN_CHARS, max_chars=MAX_CHARS, gap_ms=SUBTITLE_GAP_MS,
+              jobs=None, force=False):
+    """Procesează toate fișierele pe un pool de procese; întoarce numărul de eșecuri"""
+    jobs = max(1, jobs or os.cpu_count() or 1)
+    tasks = []
+    skipped = 0
+    for input_file in inputs:
+        output_file = batch_output_path(input_file)
+        if not force and is_up_to_date(input_file, output_file):
+            skipped += 1
+            continue
+        tasks.append((input_file, output_file, min_chars, max_chars, gap_ms))
+    
+    logger.info(f"Batch: {len(inputs)} files found, {skipped} up to date, "
+                f"{len(tasks)} to process on {min(jobs, max(1, len(tasks)))} processes")
+    if not tasks:
+        return 0
+    
+    start = time.perf_counter()
+    done = failed = cues_in = cues_out = 0
+    if jobs == 1 or len(tasks) == 1:
+        _init_batch_worker()
+        results = map(_batch_worker, tasks)
+        pool = None
+    else:
+        pool = ProcessPoolExecutor(max_workers=jobs, initializer=_init_batch_worker)
+        # Multe fișiere mici: trimite-le pe loturi
+        results = pool.map(_batch_worker, tasks, chunksize=max(1, len(tasks) // (jobs * 8)))
+    try:
+        for input_file, ok, loaded, saved, error in results:
+            done += 1
+            if ok:
+                cues_in += loaded
+                cues_out += saved
+            else:
+                failed += 1
+                sys.stdout.write("\n")
+                logger.error(f"Failed: {input_file} ({error})")
+            if done % max(1, len(tasks) // 100) == 0 or done == len(tasks):
+                show_progress(done, len(tasks), "Batch")
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        logger.setLevel(logging.NOTSET)
+    
+    elapsed = max(time.perf_counter() - start, 1e-9)
+    logger.info(f"Batch done in {elapsed:.1f}s: {done - failed} ok, {failed} failed, {skipped} skipped")
+    logger.info(f"Throughput: {cues_in / elapsed:.0f} cues/s, {(done - failed) / elapsed:.1f} files/s "
+                f"({cues_in} -> {cues_out} subtitles)")
+    return failed
+
+def batch_main(argv):
+    parser = argparse.ArgumentParser(
+        prog="merge_short_subs.py --batch",
+        description="Re-optimize every subtitle file in directories or globs"
+    )
+    parser.add_argument("targets", nargs="+", help="Directories (searched recursively) or glob patterns")
+    parser.add_argument("--pattern", default="*" + RAW_SUFFIX,
+                        help=f"File pattern inside directories (default: *{RAW_SUFFIX})")
+    parser.add_argument("--jobs", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--min-chars", type=int, default=MIN_CHARS)
+    parser.add_argument("--max-chars", type=int, default=MAX_CHARS)
+    parser.add_argument("--gap-ms", type=int, default=SUBTITLE_GAP_MS)
+    parser.add_argument("--force", action="store_true", help="Also redo outputs newer than their input")
+    args = parser.parse_args(argv)
+    
+    inputs = collect_batch_inputs(args.targets, args.pattern)
+    if not inputs:
+        logger.error("No subtitle files found")
+        sys.exit(1)
+    failed = run_batch(inputs, args.min_chars, args.max_chars, args.gap_ms, args.jobs, args.force)
+    sys.exit(1 if failed else 0)
+
 def main():
     """Funcția principală"""
     
+    if len(sys.argv) > 1 and sys.argv[1] == "--batch":
+        batch_main(sys.argv[2:])
+    
     # Verifică argumentele
     if len(sys.argv) != 3:
         print("Usage: python3 merge_short_subs.py input.srt output.srt")
+        print("       python3 merge_short_subs.py --batch DIR|GLOB [...] [--jobs N] [--force]")
         print("Example: python3 merge_short_subs.py video_raw.srt video_merged.srt")
         sys.exit(1)
     
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Process-wide Whisper model registry
+Keeps loaded models warm between files, keyed by (model name, device, dtype),
+and evicts the least recently used ones when the memory budget is exceeded.
+
+Inference backends map onto dtypes of the same openai-whisper model:
+"torch" runs it as loaded (fp32 on CPU), "torch-int8" swaps its Linear layers
+for dynamically quantized int8 ones (CPU only).
+"""
+
+import gc
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Memory budget for resident models (MB). Large enough for one large model
+# plus a small one; switching small -> large-v3 evicts the small model.
+DEFAULT_MEMORY_BUDGET_MB = 4096
+
+ModelKey = Tuple[str, str, str]
+
+# backend name -> registry dtype
+BACKENDS = {
+    "torch": "float32",
+    "torch-int8": "int8",
+}
+DEFAULT_BACKEND = "torch"
+
+
+def backend_dtype(backend: Optional[str]) -> str:
+    """Registry dtype for an inference backend name"""
+    try:
+        return BACKENDS[backend or DEFAULT_BACKEND]
+    except KeyError:
+        raise ValueError(f"Unknown inference backend '{backend}' "
+                         f"(available: {', '.join(BACKENDS)})") from None
+
+
+def resolve_device(device: Optional[str] = None) -> str:
+    """Return the device Whisper would pick when none is requested"""
+    if device:
+        return device
+    import torch
+    return "cuda" if torch.cuda.is_available() else "cpu"
+
+
+def worker_thread_budget(jobs: int) -> int:
+    """Torch threads per worker so that N workers don't oversubscribe the cores"""
+    return max(1, (os.cpu_count() or 1) // max(1, jobs))
+
+
+def set_torch_threads(threads: int, interop_threads: int = 0):
+    """Limit intra-op (and optionally inter-op) parallelism of torch in this process"""
+    import torch
+    torch.set_num_threads(max(1, threads))
+    if interop_threads > 0:
+        try:
+            torch.set_num_interop_threads(interop_threads)
+        except RuntimeError as e:
+            # Torch only accepts this before its first parallel operation
+            logger.warning(f"Cannot change torch inter-op threads: {e}")
+
+
+def quantize_int8(model: Any) -> Any:
+    """Dynamic int8 quantization of every Linear layer (weights int8, activations fp32)"""
+    import torch
+    for module in model.modules():
+        # whisper.model.Linear only adds a dtype cast; quantize_dynamic wants the exact class
+        if isinstance(module, torch.nn.Linear):
+            module.__class__ = torch.nn.Linear
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def estimate_model_mb(model: Any) -> float:
+    """Approximate resident size of a model from its parameters and buffers"""
+    try:
+        total = sum(p.numel() * p.element_size() for p in model.parameters())
+        total += sum(b.numel() * b.element_size() for b in model.buffers())
+        # Quantized Linear weights live in packed params, not in parameters()
+        for module in model.modules():
+            packed = getattr(module, "_packed_params", None)
+            if hasattr(packed, "_weight_bias"):
+                weight, bias = packed._weight_bias()
+                total += weight.numel() * weight.element_size()
+                total += bias.numel() * bias.element_size() if bias is not None else 0
+        return total / (1024 * 1024)
+    except Exception:
+        return 0.0
+
+
+class ModelRegistry:
+    """Thread-safe LRU cache of loaded Whisper models"""
+
+    def __init__(self, memory_budget_mb: Optional[float] = DEFAULT_MEMORY_BUDGET_MB):
+        self._models: "OrderedDict[ModelKey, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self.memory_budget_mb = memory_budget_mb
+        # One entry per model load in this process (run reports)
+        self.load_log: List[Dict[str, Any]] = []
+
+    def set_memory_budget(self, memory_budget_mb: Optional[float]):
+        """Change the budget (None or 0 disables eviction) and enforce it"""
+        with self._lock:
+            self.memory_budget_mb = memory_budget_mb
+            self._enforce_budget()
+
+    def get(
+        self,
+        name: str,
+        device: Optional[str] = None,
+        dtype: str = "float32",
+        download_root: Optional[str] = None
+    ) -> Any:
+        """Return a warm model, loading it on first use"""
+        if dtype == "int8" and device is None:
+            device = "cpu"
+        key = (name, resolve_device(device), dtype)
+        with self._lock:
+            if key in self._models:
+                self._models.move_to_end(key)
+                return self._models[key][0]
+
+            logger.info(f"Loading Whisper model: {name} ({key[1]}, {dtype})")
+            start = time.perf_counter()
+            model = self._load(name, key[1], dtype, download_root)
+            size_mb = estimate_model_mb(model)
+            self._models[key] = (model, size_mb)
+            self.load_log.append({
+                "model": name, "device": key[1], "dtype": dtype, "at": time.time(),
+                "wall_s": round(time.perf_counter() - start, 3), "size_mb": round(size_mb, 1),
+            })
+            self._enforce_budget(keep=key)
+            return model
+
+    def _load(self, name: str, device: str, dtype: str, download_root: Optional[str]) -> Any:
+        import whisper
+        model = whisper.load_model(name, device=device, download_root=download_root)
+        if model is None:
+            raise RuntimeError(f"Whisper returned no model for '{name}'")
+        if dtype == "float16":
+            model = model.half()
+        elif dtype == "int8":
+            if device != "cpu":
+                raise ValueError("The int8 backend only runs on CPU")
+            model = quantize_int8(model)
+        return model
+
+    def unload(
+        self,
+        name: Optional[str] = None,
+        device: Optional[str] = None,
+        dtype: Optional[str] = None
+    ) -> int:
+        """Drop every resident model matching the given fields, return count"""
+        with self._lock:
+            victims = [
+                k for k in self._models
+                if (name is None or k[0] == name)
+                and (device is None or k[1] == device)
+                and (dtype is None or k[2] == dtype)
+            ]
+            for key in victims:
+                del self._models[key]
+                logger.info(f"Unloaded Whisper model: {key[0]} ({key[1]}, {key[2]})")
+        if victims:
+            self._release_memory()
+        return len(victims)
+
+    def clear(self) -> int:
+        """Drop all resident models"""
+        return self.unload()
+
+    def loaded(self) -> List[ModelKey]:
+        """Resident model keys, least recently used first"""
+        with self._lock:
+            return list(self._models.keys())
+
+    def resident_mb(self) -> float:
+        with self._lock:
+            return sum(size for _, size in self._models.values())
+
+    def _enforce_budget(self, keep: Optional[ModelKey] = None):
+        if not self.memory_budget_mb:
+            return
+        evicted = False
+        while self.resident_mb() > self.memory_budget_mb:
+            victim = next((k for k in self._models if k != keep), None)
+            if victim is None:
+                break
+            del self._models[victim]
+            evicted = True
+            logger.info(f"Evicted Whisper model {victim[0]} ({victim[1]}, {victim[2]}) "
+                        f"to stay within {self.memory_budget_mb} MB")
+        if evicted:
+            self._release_memory()
+
+    @staticmethod
+    def _release_memory():
+        gc.collect()
+        try:
+            import torch
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+        except ImportError:
+            pass
+
+
+# Shared instance used by every entry point in this process
+registry = ModelRegistry()
+
+
+def get_model(
+    name: str,
+    device: Optional[str] = None,
+    dtype: str = "float32",
+    download_root: Optional[str] = None
+) -> Any:
+    """Fetch a model from the shared registry"""
+    return registry.get(name, device=device, dtype=dtype, download_root=download_root)
+
+
+def unload_model(
+    name: Optional[str] = None,
+    device: Optional[str] = None,
+    dtype: Optional[str] = None
+) -> int:
+    """Unload matching models from the shared registry"""
+    return registry.unload(name, device=device, dtype=dtype)
@@ -2,34 +2,55 @@
 
 import os
 import sys
-import json
 import yaml
-import subprocess
 import shutil
-import datetime
 import threading
 import warnings
 import logging
 import time
+import importlib.util
+import multiprocessing
+import sqlite3
 
 from pathlib import Path
 from multiprocessing import Queue
-from typing import Callable, Dict, Optional, Any, List
+from concurrent.futures import BrokenExecutor, ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Dict, Optional, Any, List, Tuple
 
 # GUI imports
 import tkinter as tk
 from tkinter import filedialog, ttk
 from tkinter.scrolledtext import ScrolledText
 
-# Core dependencies
+# Core dependencies (whisper/torch se importă abia la încărcarea modelului)
 try:
-    import whisper
-    import srt
     from rich import print as rprint
+    if importlib.util.find_spec("whisper") is None:
+        raise ImportError("No module named 'whisper'")
 except ImportError as e:
     print(f"Eroare: lipsește o bibliotecă esențială: {e}")
     sys.exit(1)
 
+from model_registry import (
+    get_model, registry, BACKENDS, DEFAULT_BACKEND, DEFAULT_MEMORY_BUDGET_MB,
+    backend_dtype, set_torch_threads, worker_thread_budget
+)
+from pipeline import StagePipeline, is_final
+from audio_io import AudioDecodeInterrupted, load_audio, probe_duration, SAMPLE_RATE
+from batch_decode import transcribe_batch, DEFAULT_BATCH_SIZE, MAX_CLIP_S
+from vad import VAD_DEFAULTS, transcribe_speech_only, describe_stats
+from transcript_cache import TranscriptCache, cache_key, content_hash, DEFAULT_MAX_MB
+from language_detect import AUTO, detect_file_language
+from instrumentation import RunReport, timed_batch_stage, timed_stage
+from progress import BatchProgress, format_hms, whisper_progress
+from batch_planner import DEFAULT_RTF_SOURCE, Plan, make_plan, estimate_rtf
+from gui_events import EventPipe, LogView, FRAME_MS, MAX_EVENTS_PER_FRAME, coalesce
+from checkpoints import StageCheckpoint, DECODED, TRANSCRIBED, POSTPROCESSED
+from job_journal import (
+    JobJournal, QUEUED, DECODING, TRANSCRIBING, POSTPROCESSING, DONE, FAILED, RESULT_STATES
+)
+from subtitle_engine import SPLIT_WEIGHTS, Cue, pack_words, process_cues, process_srt_file, segment_cue, write_srt
+
 # Suppress whisper warnings
 warnings.filterwarnings(
     "ignore",
@@ -40,9 +61,20 @@ warnings.filterwarnings(
 
 VERSION = "v57"
 CONFIG_FILE = "config.yaml"
+JOURNAL_FILE = "recovery.db"
+# Subdirector în temp_dir cu checkpoint-urile pe etape ale fiecărui fișier
+CHECKPOINT_DIR = "checkpoints"
+# Formatul vechi, importat o dată în jurnal la pornire
 RECOVERY_FILE = "recovery.json"
+# Cheie în recovery.json cu limbile detectate: {fișier: [limbă, probabilitate]}
+LANGUAGES_KEY = "_languages"
 
 log_queue: Optional[Queue] = None
+journal: Optional[JobJournal] = None
+# progress_hook(fișier, fracțiune): progresul live din interiorul unui fișier
+progress_hook: Optional[Callable[[str, float], None]] = None
+# Marcaj pentru mesajele de progres trimise prin log_queue din workeri
+PROGRESS_MSG = "__progress__"
 
 # ----- Model Mapping (central) -----
 MODEL_MAPPING = {
@@ -72,6 +104,10 @@ def log_msg(msg: str):
     else:
         logger.info(msg)
 
+def report_progress(file: str, fraction: float):
+    if progress_hook is not None:
+        progress_hook(file, fraction)
+
 # ----- Config & Recovery -----
 def get_default_config() -> Dict[str, Any]:
     return {
@@ -79,10 +115,53 @@ def get_default_config() -> Dict[str, Any]:
         "model_type": "small",
         "max_parallel_jobs": 1,
         "temp_dir": "temp_transcription",
+        "model_memory_budget_mb": DEFAULT_MEMORY_BUDGET_MB,
+        "pipeline_queue_size": 2,
+        "word_timestamps": False,
+        # threads / interop_threads: 0 = implicit torch (sau împărțit între workeri)
+        "inference": {
+            "backend": DEFAULT_BACKEND,
+            "threads": 0,
+            "interop_threads": 0
+        },
+        "vad": dict(VAD_DEFAULTS, enabled=False),
+        # Clipurile scurte (sub max_clip_s) trec prin model în loturi de batch_size
+        "batch": {
+            "enabled": True,
+            "max_clip_s": MAX_CLIP_S,
+            "batch_size": DEFAULT_BATCH_SIZE
+        },
+        # Fișierele se rulează de la cel mai lung la cel mai scurt (timp total minim)
+        "plan": {
+            "longest_first": True
+        },
+        # Raport JSON + CSV cu timpii pe etape, la finalul fiecărei rulări
+        "report": {
+            "enabled": True,
+            "dir": "reports"
+        },
+        # Fiecare etapă terminată e salvată; o rulare reluată continuă de la ultima.
+        # audio: și PCM-ul decodat (float32, ~230 MB/oră), doar dacă decodarea e scumpă
+        "checkpoint": {
+            "enabled": True,
+            "audio": False
+        },
+        # Fișierele eșuate din cauze trecătoare (timeout FFmpeg, I/O) se reiau de max. attempts ori,
+        # la backoff_s × 2^(n-1) secunde
+        "retry": {
+            "attempts": 2,
+            "backoff_s": 5.0
+        },
+        "cache": {
+            "enabled": True,
+            "dir": "",
+            "max_mb": DEFAULT_MAX_MB
+        },
         "postprocess": {
             "min_chars":       80,
             "max_chars":      120,
-            "subtitle_gap_ms": 100
+            "subtitle_gap_ms": 100,
+            "split_weights": dict(SPLIT_WEIGHTS)
         }
     }
 
@@ -95,12 +174,15 @@ def validate_config(cfg: Dict[str, Any]) -> Dict[str, Any]:
             for sk, sv in v.items():
                 cfg[k].setdefault(sk, sv)
     # Validate language and model_type
-    if cfg["language"] not in VALID_LANGUAGES:
+    if cfg["language"] != AUTO and cfg["language"] not in VALID_LANGUAGES:
         log_msg(f"[yellow]Atenție: Limba invalidă '{cfg['language']}', resetat la 'ro'")
         cfg["language"] = "ro"
     if cfg["model_type"] not in MODEL_MAPPING:
         log_msg(f"[yellow]Atenție: Model invalid '{cfg['model_type']}', resetat la 'small'")
         cfg["model_type"] = "small"
+    if cfg["inference"]["backend"] not in BACKENDS:
+        log_msg(f"[yellow]Atenție: Backend invalid '{cfg['inference']['backend']}', resetat la '{DEFAULT_BACKEND}'")
+        cfg["inference"]["backend"] = DEFAULT_BACKEND
     return cfg
 
 def load_config() -> Dict[str, Any]:
@@ -115,23 +197,29 @@ def load_config() -> Dict[str, Any]:
         sys.exit(1)
     return validate_config(cfg)
 
-def load_recovery() -> Dict[str, str]:
-    p = Path(RECOVERY_FILE)
-    if p.exists():
-        try:
-            return json.loads(p.read_text(encoding="utf-8"))
-        except:
-            return {}
-    return {}
+def open_journal() -> JobJournal:
+    """Jurnalul de joburi, cu recovery.json vechi importat și compactat la pornire"""
+    jrn = JobJournal(JOURNAL_FILE)
+    migrated = jrn.migrate_json(RECOVERY_FILE, LANGUAGES_KEY)
+    if migrated:
+        log_msg(f"[blue]INFO:[/] {migrated} intrări importate din {RECOVERY_FILE}")
+    jrn.compact()
+    return jrn
 
-def save_recovery(state: Dict[str, str]):
+def journal_state(file: str, state: str, wall_s: Optional[float] = None, reason: Optional[str] = None, **data: Any):
+    """Înregistrează o tranziție de stare; jurnalul nu oprește niciodată procesarea"""
+    if journal is None:
+        return
     try:
-        Path(RECOVERY_FILE).write_text(
-            json.dumps(state, indent=2, ensure_ascii=False),
-            encoding="utf-8"
-        )
-    except Exception as e:
-        log_msg(f"[red]ERROR:[/] Nu pot salva recovery: {e}")
+        journal.record(file, state, wall_s, reason, **data)
+    except sqlite3.Error as e:
+        log_msg(f"[red]ERROR:[/] Nu pot scrie în jurnal: {e}")
+
+def close_journal():
+    global journal
+    if journal is not None:
+        journal.close()
+        journal = None
 
 # ----- Whisper Model Cache -----
 def get_whisper_cache_dir() -> Path:
@@ -149,7 +237,9 @@ def clean_corrupted_models(log_cb: Callable[[str], None]):
             except Exception as e:
                 log_cb(f"[red]ERROR:[/] Nu pot șterge {model_file.name}: {e}")
 
-def download_model_robust(model_type: str, log_cb: Callable[[str], None], max_retries: int = 3) -> Optional[str]:
+def download_model_robust(
+    model_type: str, log_cb: Callable[[str], None], max_retries: int = 3, dtype: str = "float32"
+) -> Optional[str]:
     if model_type not in MODEL_MAPPING:
         valid_models = list(MODEL_MAPPING.keys())
         log_cb(f"[red]Eroare:[/] Model invalid '{model_type}'. Disponibile: {valid_models}")
@@ -173,7 +263,7 @@ def download_model_robust(model_type: str, log_cb: Callable[[str], None], max_re
                         log_cb(f"[yellow]WARNING:[/] Model corupt găsit, se șterge: {pf}")
                         pf.unlink()
                 log_cb(f"[blue]INFO:[/] Descărcare model {model_type}... (încercarea {attempt + 1}/{max_retries})")
-            model = whisper.load_model(whisper_model_name, download_root=str(cache_dir))
+            model = get_model(whisper_model_name, dtype=dtype, download_root=str(cache_dir))
             if model is None:
                 raise Exception("Modelul returnat de whisper este None")
             model_file = next((pf for pf in possible_files if pf.exists() and pf.stat().st_size > 1000), None)
@@ -185,6 +275,7 @@ def download_model_robust(model_type: str, log_cb: Callable[[str], None], max_re
                 raise Exception("Modelul nu s-a descărcat corect în cache")
         except Exception as e:
             log_cb(f"[red]Eroare încercarea {attempt + 1}:[/] {str(e)}")
+            registry.unload(whisper_model_name)
             for name in [model_type, whisper_model_name]:
                 model_file = cache_dir / f"{name}.pt"
                 if model_file.exists():
@@ -217,258 +308,781 @@ def check_file_permissions(inp: str, outp: str) -> bool:
         logger.error(f"No write-permission for '{outp}'"); return False
     return True
 
-def split_custom(text: str, max_chars: int) -> List[str]:
-    if len(text) <= max_chars:
-        return [text]
-    pref = 70 if len(text) < 150 else 90 if len(text) < 180 else 100
-    cuts = []
-    for punct in ['. ', '! ', '? ']:
-        pos = text.rfind(punct, 0, pref+10)
-        if pos > pref-20:
-            cuts.append((pos+len(punct), 'sentence'))
-    for punct in [', ', '; ', ': ', ' - ', ' – ']:
-        pos = text.rfind(punct, 0, pref+10)
-        if pos > pref-15:
-            cuts.append((pos+len(punct), 'punctuation'))
-    pos = text.rfind(' ', 0, pref+5)
-    if pos > pref-10:
-        cuts.append((pos+1, 'space'))
-    if cuts:
-        cuts.sort(key=lambda x: (0 if x[1]=='sentence' else 1 if x[1]=='punctuation' else 2, abs(x[0]-pref)))
-        idx = cuts[0][0]
-    else:
-        idx = pref
-        logger.warning(f"Forced split at {idx}")
-    left, right = text[:idx].strip(), text[idx:].strip()
-    return [left] + split_custom(right, max_chars)
-
-def subrip_add_milliseconds(sr: datetime.timedelta, ms: int) -> datetime.timedelta:
-    return sr + datetime.timedelta(milliseconds=ms)
-
-def split_text_with_timing(
-    text: str, start: datetime.timedelta, end: datetime.timedelta,
-    max_chars: int, gap_ms: int
-) -> List[Any]:
-    chunks = split_custom(text, max_chars)
-    if len(chunks) == 1:
-        return [(text, start, end)]
-    total_ms = int((end - start).total_seconds() * 1000)
-    gaps = len(chunks)-1
-    total_gap = gap_ms * gaps
-    avail = max(total_ms - total_gap, 0)
-    gap = gap_ms if total_ms > total_gap else max(50, total_ms//max(1, gaps+1))
-    total_chars = sum(len(c) for c in chunks)
-    cur_start = start
-    out = []
-    for i, chunk in enumerate(chunks):
-        if i < len(chunks)-1:
-            dur = int((avail * len(chunk)) // total_chars)
-            chunk_end = subrip_add_milliseconds(cur_start, dur)
-        else:
-            chunk_end = end
-        out.append((chunk, cur_start, chunk_end))
-        if i < len(chunks)-1:
-            cur_start = subrip_add_milliseconds(chunk_end, gap)
-    return out
-
-def advanced_srt_postprocess(raw_srt: Path, final_srt: Path, cfg_pp: Dict[str, int]):
+def advanced_srt_postprocess(
+    raw_srt: Path, final_srt: Path, cfg_pp: Dict[str, Any],
+    segments: Optional[List[Dict[str, Any]]] = None
+):
     if not check_file_permissions(str(raw_srt), str(final_srt)):
         raise PermissionError("Cannot access SRT files")
     logger.info(f"Post-procesare SRT: {raw_srt.name}")
-    text = raw_srt.read_text(encoding="utf-8")
-    subs = list(srt.parse(text))
-    merged, buf_txt, buf_start = [], "", None
-    for i, sub in enumerate(subs):
-        clean = sub.content.replace("\n"," ").strip()
-        if not clean: continue
-        if buf_txt == "":
-            buf_start = sub.start
-        buf_txt = (buf_txt + " " + clean).strip()
-        flush = (
-            len(buf_txt) >= cfg_pp["min_chars"] or
-            i == len(subs)-1 or
-            len(buf_txt) > cfg_pp["max_chars"]*2
-        )
-        if flush:
-            end_time = sub.end
-            if len(buf_txt) > cfg_pp["max_chars"]:
-                parts = split_text_with_timing(
-                    buf_txt, buf_start, end_time,
-                    cfg_pp["max_chars"], cfg_pp["subtitle_gap_ms"]
-                )
-                for txt, st, en in parts:
-                    merged.append(srt.Subtitle(
-                        index=len(merged)+1, start=st, end=en, content=txt.strip()
-                    ))
-            else:
-                merged.append(srt.Subtitle(
-                    index=len(merged)+1, start=buf_start,
-                    end=end_time, content=buf_txt
-                ))
-            buf_txt, buf_start = "", None
-    for idx, sub in enumerate(merged, start=1):
-        sub.index = idx
-    final_srt.write_text(srt.compose(merged), encoding="utf-8")
-    logger.info(f"Saved {len(merged)} subtitles to {final_srt.name}")
-
-# ----- Procesare fișier MP3 -----
-def process_single_file(
-    mp3_file: str, tmp_dir: Path, cfg: Dict[str, Any], verbose: bool, stop_event: threading.Event
-) -> Dict[str, Any]:
-    if stop_event.is_set():
-        return {"status":"aborted","file":mp3_file,"reason":"Interrupted"}
+    if segments is not None:
+        # Segmente cu timpi pe cuvinte: tăieturile cad pe granițele reale ale cuvintelor
+        saved = write_srt(final_srt, process_cues(
+            (segment_cue(seg) for seg in segments if seg["text"].strip()),
+            cfg_pp["min_chars"], cfg_pp["max_chars"], cfg_pp["subtitle_gap_ms"],
+            cfg_pp.get("split_weights")
+        ))
+        logger.info(f"Saved {saved} subtitles to {final_srt.name}")
+        return
+    # În flux: subtitrările sunt citite, procesate și scrise pe rând
+    _, saved = process_srt_file(
+        raw_srt, final_srt,
+        cfg_pp["min_chars"], cfg_pp["max_chars"], cfg_pp["subtitle_gap_ms"],
+        cfg_pp.get("split_weights")
+    )
+    logger.info(f"Saved {saved} subtitles to {final_srt.name}")
 
+# ----- Procesare fișier MP3 (etape) -----
+def new_job(
+    mp3_file: str, tmp_dir: Path, language: Optional[str] = None, duration: Optional[float] = None
+) -> Dict[str, Any]:
     base_name = Path(mp3_file).stem
-    wav_file = tmp_dir / f"{base_name}.wav"
-    raw_srt = tmp_dir / f"{base_name}.srt"
-    final_srt = Path(f"{base_name}.srt")
+    return {
+        "file": mp3_file,
+        "base_name": base_name,
+        "raw_srt": tmp_dir / f"{base_name}.srt",
+        "final_srt": Path(f"{base_name}.srt"),
+        "language": language,
+        # Durata din planificare (ffprobe rulat o singură dată); None = necunoscută
+        "audio_s": duration,
+    }
+
+def job_language(job: Dict[str, Any], cfg: Dict[str, Any]) -> Optional[str]:
+    """Limba detectată a fișierului sau cea din config; None lasă Whisper să o detecteze"""
+    language = job.get("language") or cfg["language"]
+    return None if language == AUTO else language
 
-    # 1) MP3→WAV cu verificări
-    output_redirect = None if verbose else subprocess.DEVNULL
+def decode_options(cfg: Dict[str, Any]) -> Dict[str, Any]:
+    """Opțiunile care influențează rezultatul Whisper (fac parte din cheia de cache)"""
+    opts = {"temperature": 0.0, "word_timestamps": bool(cfg["word_timestamps"])}
+    if cfg["vad"]["enabled"]:
+        opts["vad"] = {k: cfg["vad"][k] for k in VAD_DEFAULTS}
+    if cfg["inference"]["backend"] != DEFAULT_BACKEND:
+        # Modelul cuantizat poate da alt text; cheile vechi rămân valide pentru torch
+        opts["backend"] = cfg["inference"]["backend"]
+    return opts
+
+def open_cache(cfg: Dict[str, Any]) -> Optional[TranscriptCache]:
+    if not cfg["cache"]["enabled"]:
+        return None
+    return TranscriptCache(cfg["cache"]["dir"] or None, cfg["cache"]["max_mb"])
+
+def open_checkpoint(job: Dict[str, Any], cfg: Dict[str, Any]) -> Optional[StageCheckpoint]:
+    if not cfg["checkpoint"]["enabled"]:
+        return None
     try:
-        log_msg(f"[blue]INFO:[/] Conversie MP3→WAV: {base_name}")
-        result = subprocess.run(
-            ["ffmpeg", "-y", "-i", mp3_file, "-ar", "16000", "-ac", "1", str(wav_file)],
-            stdout=output_redirect,
-            stderr=output_redirect,
-            check=True,
-            timeout=300
+        return StageCheckpoint(
+            Path(cfg["temp_dir"]).resolve() / CHECKPOINT_DIR, job["file"],
+            {"model": MODEL_MAPPING[cfg["model_type"]], "language": job_language(job, cfg),
+             "decode": decode_options(cfg)}
         )
-        if not wav_file.exists() or wav_file.stat().st_size == 0:
-            return {"status":"failed","file":mp3_file,"reason":"Fișier WAV invalid după conversie"}
-    except subprocess.TimeoutExpired:
-        return {"status":"failed","file":mp3_file,"reason":"Timeout la conversie FFmpeg"}
+    except OSError as e:
+        log_msg(f"[yellow]WARNING:[/] Checkpoint indisponibil pentru {job['base_name']}: {e}")
+        return None
+
+def drop_checkpoint(job: Dict[str, Any], cfg: Dict[str, Any]):
+    if cfg["checkpoint"]["enabled"] and Path(job["file"]).exists():
+        ckpt = open_checkpoint(job, cfg)
+        if ckpt is not None:
+            ckpt.clear()
+
+def resume_from_checkpoint(job: Dict[str, Any], cfg: Dict[str, Any]):
+    """Încarcă în job rezultatul ultimei etape salvate (job["resume"] = etapa)"""
+    ckpt = job["checkpoint"]
+    manifest = ckpt.manifest()
+    stage = manifest["stage"] if manifest else None
+    if stage == POSTPROCESSED and manifest.get("postprocess") != cfg["postprocess"]:
+        # Setările de post-procesare s-au schimbat: se refolosesc doar segmentele
+        stage = TRANSCRIBED
+    try:
+        if stage == DECODED:
+            job["audio"] = ckpt.load_audio()
+            job["audio_s"] = len(job["audio"]) / SAMPLE_RATE
+            log_msg(f"[green]INFO:[/] Reluare din checkpoint: {job['base_name']} (fără decodare)")
+        elif stage == TRANSCRIBED:
+            job["segments"] = ckpt.load_segments()
+            log_msg(f"[green]INFO:[/] Reluare din checkpoint: {job['base_name']} (fără decodare și transcriere)")
+        elif stage == POSTPROCESSED:
+            log_msg(f"[green]INFO:[/] Reluare din checkpoint: {job['base_name']} (doar scrierea SRT final)")
+    except (OSError, ValueError, KeyError) as e:
+        log_msg(f"[yellow]WARNING:[/] Checkpoint invalid pentru {job['base_name']} ({e}), se reia de la început")
+        job.pop("audio", None)
+        job.pop("segments", None)
+        stage = None
+    job["resume"] = stage
+
+def checkpoint_segments(job: Dict[str, Any], result: Dict[str, Any]):
+    ckpt = job.get("checkpoint")
+    if ckpt is None:
+        return
+    try:
+        ckpt.save_segments(result["segments"], result.get("language"))
+    except OSError as e:
+        log_msg(f"[yellow]WARNING:[/] Nu pot salva checkpoint-ul pentru {job['base_name']}: {e}")
+
+def decode_stage(
+    job: Dict[str, Any], cfg: Dict[str, Any], verbose: bool, stop_event: threading.Event
+) -> Dict[str, Any]:
+    """1) Checkpoint / cache lookup, apoi MP3→PCM în memorie (fără WAV temporar)"""
+    mp3_file = job["file"]
+    if stop_event.is_set():
+        return {"status":"aborted","file":mp3_file,"reason":"Interrupted"}
+    journal_state(mp3_file, DECODING)
+    ckpt = open_checkpoint(job, cfg)
+    if ckpt is not None:
+        job["checkpoint"] = ckpt
+        resume_from_checkpoint(job, cfg)
+        if job["resume"] in (TRANSCRIBED, POSTPROCESSED):
+            job["audio_s"] = job["audio_s"] or probe_duration(mp3_file)
+            return job
+    cache = open_cache(cfg)
+    if cache is not None:
+        try:
+            job["cache_key"] = cache_key(
+                content_hash(mp3_file), MODEL_MAPPING[cfg["model_type"]],
+                job_language(job, cfg), decode_options(cfg)
+            )
+            hit = cache.get(job["cache_key"])
+        except OSError as e:
+            log_msg(f"[yellow]WARNING:[/] Cache indisponibil pentru {job['base_name']}: {e}")
+            hit = None
+        if hit is not None:
+            log_msg(f"[green]INFO:[/] Cache hit: {job['base_name']} (fără decodare și transcriere)")
+            job["segments"] = hit["segments"]
+            job["audio_s"] = job["audio_s"] or probe_duration(mp3_file)
+            return job
+    if "audio" in job:
+        return job  # decodat deja (checkpoint)
+    try:
+        log_msg(f"[blue]INFO:[/] Decodare audio: {job['base_name']}")
+        job["audio"] = load_audio(mp3_file, timeout=300, expected_s=job["audio_s"])
+        job["audio_s"] = len(job["audio"]) / SAMPLE_RATE
+        if verbose:
+            log_msg(f"[blue]INFO:[/] {len(job['audio']) / SAMPLE_RATE:.1f}s audio decodat")
+    except (AudioDecodeInterrupted, OSError) as e:
+        # Timeout, ffmpeg oprit de un semnal, pipe întrerupt: merită reîncercat
+        return {"status":"failed","file":mp3_file,"reason":f"FFmpeg error: {e}","retryable":True}
     except Exception as e:
+        # Eroare de demux/codec: fișierul e stricat sau nesuportat, reîncercarea nu ajută
         return {"status":"failed","file":mp3_file,"reason":f"FFmpeg error: {e}"}
+    if ckpt is not None and cfg["checkpoint"]["audio"]:
+        try:
+            ckpt.save_audio(job["audio"])
+        except OSError as e:
+            log_msg(f"[yellow]WARNING:[/] Nu pot salva checkpoint-ul pentru {job['base_name']}: {e}")
+    return job
+
+def whisper_transcribe(job: Dict[str, Any], audio: Any, cfg: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    whisper_model_name = MODEL_MAPPING[cfg["model_type"]]
+    # Modelul rămâne încărcat între fișiere (registry partajat)
+    model = get_model(whisper_model_name, dtype=backend_dtype(cfg["inference"]["backend"]),
+                      download_root=str(get_whisper_cache_dir()))
+    if model is None:
+        return None
+    opts = decode_options(cfg)
+    opts.pop("vad", None)
+    opts.pop("backend", None)
+    options = dict(opts, language=job_language(job, cfg), verbose=False)
+    vad_stats = None
+    # Redirect stdout/stderr
+    original_stdout, original_stderr = sys.stdout, sys.stderr
+    with open(os.devnull, 'w') as devnull:
+        sys.stdout = devnull
+        sys.stderr = devnull
+        try:
+            # Poziția lui Whisper în fișier (fereastră cu fereastră) → progres live
+            with whisper_progress(lambda fraction: report_progress(job["file"], fraction)):
+                if cfg["vad"]["enabled"]:
+                    # Doar regiunile cu vorbire ajung la Whisper
+                    result, vad_stats = transcribe_speech_only(model, audio, cfg["vad"], **options)
+                else:
+                    result = model.transcribe(audio, **options)
+        finally:
+            sys.stdout = original_stdout
+            sys.stderr = original_stderr
+    if vad_stats:
+        log_msg(f"[blue]INFO:[/] {job['base_name']}: {describe_stats(vad_stats)}")
+    # Timpii cuvintelor în formă compactă (cache și post-procesare)
+    pack_words(result.get("segments", []))
+    return result
+
+def store_in_cache(job: Dict[str, Any], result: Dict[str, Any], cfg: Dict[str, Any]):
+    cache = open_cache(cfg)
+    if cache is not None and "cache_key" in job:
+        try:
+            cache.put(job["cache_key"], result, {
+                "source": job["file"], "model": cfg["model_type"], "language": job_language(job, cfg)
+            })
+        except OSError as e:
+            log_msg(f"[yellow]WARNING:[/] Nu pot salva în cache {job['base_name']}: {e}")
 
-    # 2) Transcription cu numele corect de model
+def transcribe_stage(job: Dict[str, Any], cfg: Dict[str, Any], stop_event: threading.Event) -> Dict[str, Any]:
+    """2) Transcription cu numele corect de model (sau segmentele din cache)"""
+    mp3_file, raw_srt = job["file"], job["raw_srt"]
+    segments = job.pop("segments", None)
+    audio = job.pop("audio", None)
+    if stop_event.is_set():
+        return {"status":"aborted","file":mp3_file,"reason":"Interrupted"}
+    if job.get("resume") == POSTPROCESSED:
+        return job
+    journal_state(mp3_file, TRANSCRIBING)
     try:
-        log_msg(f"[blue]INFO:[/] Transcription: {base_name}")
-        whisper_model_name = MODEL_MAPPING[cfg["model_type"]]
-        model = whisper.load_model(whisper_model_name)
-        if model is None:
-            wav_file.unlink(missing_ok=True)
-            return {"status":"failed","file":mp3_file,"reason":"Model whisper invalid"}
-        # Redirect stdout/stderr
-        original_stdout, original_stderr = sys.stdout, sys.stderr
-        with open(os.devnull, 'w') as devnull:
-            sys.stdout = devnull
-            sys.stderr = devnull
-            try:
-                result = model.transcribe(
-                    str(wav_file),
-                    language=cfg["language"],
-                    verbose=False,
-                    temperature=0.0,
-                    word_timestamps=False
-                )
-            finally:
-                sys.stdout = original_stdout
-                sys.stderr = original_stderr
-
-        if not result or 'segments' not in result:
-            wav_file.unlink(missing_ok=True)
-            return {"status":"failed","file":mp3_file,"reason":"Whisper nu a returnat rezultate"}
+        if segments is None:
+            log_msg(f"[blue]INFO:[/] Transcription: {job['base_name']}")
+            result = whisper_transcribe(job, audio, cfg)
+            del audio
+            if result is None:
+                return {"status":"failed","file":mp3_file,"reason":"Model whisper invalid"}
+            if 'segments' not in result:
+                return {"status":"failed","file":mp3_file,"reason":"Whisper nu a returnat rezultate"}
+            segments = result["segments"]
+            store_in_cache(job, result, cfg)
+            checkpoint_segments(job, result)
         # Creăm SRT-ul
-        subtitles = []
-        for idx, segment in enumerate(result["segments"], start=1):
-            start_time = datetime.timedelta(seconds=segment["start"])
-            end_time = datetime.timedelta(seconds=segment["end"])
-            text = segment["text"].strip()
-            if text:
-                subtitles.append(srt.Subtitle(idx, start_time, end_time, text))
-        if not subtitles:
-            wav_file.unlink(missing_ok=True)
+        subtitles = (
+            Cue(int(round(seg["start"] * 1000)), int(round(seg["end"] * 1000)), seg["text"].strip())
+            for seg in segments if seg["text"].strip()
+        )
+        if not write_srt(raw_srt, subtitles):
+            raw_srt.unlink(missing_ok=True)
             return {"status":"failed","file":mp3_file,"reason":"Nu s-a detectat text în audio"}
-        raw_srt.write_text(srt.compose(subtitles), encoding="utf-8")
+        if cfg["word_timestamps"]:
+            # Post-procesarea are nevoie de timpii cuvintelor, pe care SRT-ul nu îi păstrează
+            job["segments"] = segments
+    except OSError as e:
+        return {"status":"failed","file":mp3_file,"reason":f"Whisper API error: {str(e)}","retryable":True}
     except Exception as e:
-        wav_file.unlink(missing_ok=True)
         return {"status":"failed","file":mp3_file,"reason":f"Whisper API error: {str(e)}"}
 
     if not raw_srt.exists() or raw_srt.stat().st_size == 0:
-        wav_file.unlink(missing_ok=True)
         return {"status":"failed","file":mp3_file,"reason":"SRT raw nu s-a creat"}
+    return job
+
+def postprocess_stage(job: Dict[str, Any], cfg: Dict[str, Any]) -> Dict[str, Any]:
+    """3) Post-procesare (în checkpoint, apoi SRT-ul final e mutat la destinație)"""
+    raw_srt, final_srt = job["raw_srt"], job["final_srt"]
+    ckpt = job.get("checkpoint")
+    journal_state(job["file"], POSTPROCESSING)
+    if job.get("resume") != POSTPROCESSED:
+        target = final_srt
+        if ckpt is not None:
+            ckpt.dir.mkdir(parents=True, exist_ok=True)
+            target = ckpt.final_path
+        try:
+            advanced_srt_postprocess(raw_srt, target, cfg["postprocess"], job.pop("segments", None))
+            log_msg(f"[green]INFO:[/] Post-procesare completă: {job['base_name']}")
+        except Exception as e:
+            log_msg(f"[yellow]WARNING:[/] Post-procesare eșuată pentru {job['base_name']}: {e}")
+            shutil.copy2(raw_srt, target)
+
+        # Curățenie
+        raw_srt.unlink(missing_ok=True)
+        if ckpt is not None:
+            ckpt.mark_postprocessed(postprocess=cfg["postprocess"])
+    if ckpt is not None:
+        try:
+            ckpt.publish(final_srt)
+        except OSError as e:
+            return {"status":"failed","file":job["file"],"reason":f"Nu pot scrie {final_srt}: {e}","retryable":True}
+        ckpt.clear()
+    return {"status":"completed","file":job["file"],"reason":"Succes"}
+
+def process_single_file(
+    mp3_file: str, tmp_dir: Path, cfg: Dict[str, Any], verbose: bool, stop_event: threading.Event,
+    language: Optional[str] = None, duration: Optional[float] = None
+) -> Dict[str, Any]:
+    if stop_event.is_set():
+        return {"status":"aborted","file":mp3_file,"reason":"Interrupted"}
+    job = new_job(mp3_file, tmp_dir, language, duration)
+    for stage in (
+        timed_stage("decode", lambda j: decode_stage(j, cfg, verbose, stop_event)),
+        timed_stage("transcribe", lambda j: transcribe_stage(j, cfg, stop_event)),
+        timed_stage("postprocess", lambda j: postprocess_stage(j, cfg)),
+    ):
+        job = stage(job)
+        if "status" in job:
+            return job
+    return job
+
+def critical_error(mp3_file: str, e: BaseException) -> Dict[str, Any]:
+    # Erorile de I/O și un worker oprit brusc (OOM, kill) merită o nouă încercare
+    return {"status":"failed","file":mp3_file,"reason":f"Eroare critică: {e}",
+            "retryable":isinstance(e, (OSError, BrokenExecutor))}
+
+# ----- Worker pool -----
+_worker_stop = None
+
+def _init_worker(
+    queue: Queue, stop_flag, model_name: str, cache_dir: str, threads: int,
+    interop_threads: int = 0, dtype: str = "float32", journal_path: Optional[str] = None
+):
+    global log_queue, _worker_stop, journal, progress_hook
+    log_queue = queue
+    # Progresul ajunge în procesul principal pe aceeași coadă ca log-urile
+    progress_hook = lambda file, fraction: queue.put((PROGRESS_MSG, file, fraction))
+    _worker_stop = stop_flag
+    if journal_path:
+        # Conexiune proprie per proces; SQLite WAL serializează scrierile
+        journal = JobJournal(journal_path)
+    set_torch_threads(threads, interop_threads)
+    # Fiecare worker își încarcă modelul o singură dată și îl păstrează
+    get_model(model_name, dtype=dtype, download_root=cache_dir)
+
+def _worker_process_file(
+    mp3_file: str, tmp_dir: Path, cfg: Dict[str, Any], language: Optional[str] = None,
+    duration: Optional[float] = None
+) -> Dict[str, Any]:
+    return process_single_file(mp3_file, tmp_dir, cfg, False, _worker_stop, language, duration)
+
+def dispatch_queue_item(item: Any, log_cb: Callable[[str], None]):
+    if isinstance(item, tuple) and item and item[0] == PROGRESS_MSG:
+        report_progress(item[1], item[2])
+    else:
+        log_cb(item)
+
+def drain_log_queue(queue: Queue, log_cb: Callable[[str], None]):
+    while not queue.empty():
+        try:
+            dispatch_queue_item(queue.get_nowait(), log_cb)
+        except Exception:
+            break
+
+def run_parallel(
+    to_process: List[str], tmp: Path, cfg: Dict[str, Any], jobs: int,
+    on_result: Callable[[Dict[str, Any]], None], log_cb: Callable[[str], None],
+    queue: Queue, stop_event: threading.Event, languages: Optional[Dict[str, str]] = None,
+    durations: Optional[Dict[str, Optional[float]]] = None
+):
+    inference = cfg["inference"]
+    threads = int(inference["threads"] or 0) or worker_thread_budget(jobs)
+    log_cb(f"Procesare paralelă: {jobs} workeri × {threads} thread-uri torch ({inference['backend']})")
+    # spawn, nu fork: procesul principal are deja thread-uri (GUI, pipeline) și
+    # eventual torch încărcat; un fork ar copia lock-uri ținute de alte thread-uri
+    ctx = multiprocessing.get_context("spawn")
+    worker_stop = ctx.Event()
+    # Obiectele partajate trebuie create în același context ca procesele;
+    # coada apelantului poate fi din contextul implicit (fork)
+    worker_queue = ctx.Queue()
+    initargs = (worker_queue, worker_stop, MODEL_MAPPING[cfg["model_type"]],
+                str(get_whisper_cache_dir()), threads,
+                int(inference["interop_threads"] or 0), backend_dtype(inference["backend"]),
+                str(journal.path) if journal is not None else None)
+    with ProcessPoolExecutor(max_workers=jobs, mp_context=ctx,
+                             initializer=_init_worker, initargs=initargs) as pool:
+        languages, durations = languages or {}, durations or {}
+        pending = {pool.submit(_worker_process_file, f, tmp, cfg, languages.get(f), durations.get(f)): f
+                   for f in to_process}
+        while pending:
+            done, _ = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+            drain_log_queue(worker_queue, log_cb)
+            if stop_event.is_set() and not worker_stop.is_set():
+                log_cb("[red]INFO:[/] Procesare întreruptă de utilizator")
+                # Joburile în curs se opresc cooperativ, cele în așteptare se anulează
+                worker_stop.set()
+                for fut in pending:
+                    fut.cancel()
+            for fut in list(pending):
+                if fut.cancelled():
+                    pending.pop(fut)
+            for fut in done:
+                mp3_file = pending.pop(fut, None)
+                if mp3_file is None:
+                    continue
+                try:
+                    on_result(fut.result())
+                except Exception as e:
+                    on_result(critical_error(mp3_file, e))
+        drain_log_queue(worker_queue, log_cb)
+
+# ----- Pipeline cu etape suprapuse -----
+def stage_lines(pipe: StagePipeline) -> List[str]:
+    """Statisticile fiecărei etape (debit, timp activ, așteptări)"""
+    lines = []
+    for st in pipe.stats:
+        rate = st.items / pipe.wall_s * 60 if pipe.wall_s > 0 else 0.0
+        lines.append(f"{st.name}: {st.items} elemente, {rate:.1f}/min, activ {st.busy_s:.1f}s, "
+                     f"așteptare intrare {st.starved_s:.1f}s / ieșire {st.blocked_s:.1f}s, "
+                     f"coadă max. {st.max_depth}")
+    return lines
+
+def run_pipelined(
+    to_process: List[str], tmp: Path, cfg: Dict[str, Any],
+    on_result: Callable[[Dict[str, Any]], None], log_cb: Callable[[str], None],
+    queue: Queue, stop_event: threading.Event, languages: Optional[Dict[str, str]] = None,
+    durations: Optional[Dict[str, Optional[float]]] = None
+):
+    """Decodare, transcriere și post-procesare rulează în paralel pe fișiere diferite"""
+    pipe = StagePipeline(
+        [
+            ("decode", timed_stage("decode", lambda job: decode_stage(job, cfg, False, stop_event))),
+            ("transcribe", timed_stage("transcribe", lambda job: transcribe_stage(job, cfg, stop_event))),
+            ("postprocess", timed_stage("postprocess", lambda job: postprocess_stage(job, cfg))),
+        ],
+        queue_size=cfg["pipeline_queue_size"],
+        on_error=lambda job, e: critical_error(job["file"], e)
+    )
+
+    def on_pipe_result(result: Dict[str, Any]):
+        drain_log_queue(queue, log_cb)
+        on_result(result)
+        log_cb(f"[blue]INFO:[/] Cozi: {pipe.depth_line()}")
+
+    pipe.run(
+        (new_job(f, tmp, (languages or {}).get(f), (durations or {}).get(f)) for f in to_process),
+        on_pipe_result,
+        stop=stop_event,
+        on_idle=lambda: drain_log_queue(queue, log_cb)
+    )
+    if stop_event.is_set():
+        log_cb("[red]INFO:[/] Procesare întreruptă de utilizator")
+    log_cb(f"[blue]INFO:[/] Statistici pipeline ({pipe.wall_s:.1f}s):")
+    for line in stage_lines(pipe):
+        log_cb(f"  {line}")
+
+# ----- Planificare -----
+def plan_lines(plan: Plan, rtf: float, rtf_source: str) -> List[str]:
+    """Planul lotului: încărcarea workerilor, cele mai lungi fișiere, respinse, ETA"""
+    lines = [f"Plan: {len(plan.accepted)} fișiere, {format_hms(plan.total_s)} audio, "
+             f"{plan.jobs} worker(i), cele mai lungi întâi"]
+    for n, b in enumerate(plan.bins):
+        lines.append(f"  worker {n + 1}: {len(b)} fișiere, {format_hms(plan.load_s(n))} audio")
+    for info in plan.accepted[:5]:
+        length = format_hms(info.duration) if info.duration else "?:??:??"
+        channels = info.layout or (f"{info.channels}ch" if info.channels else "?")
+        lines.append(f"  {length}  {info.codec or '?'} {channels}  {Path(info.path).name}")
+    if len(plan.accepted) > 5:
+        lines.append(f"  ... încă {len(plan.accepted) - 5}")
+    for info in plan.rejected:
+        lines.append(f"  respins: {Path(info.path).name} ({info.error})")
+    eta = plan.makespan_s() * rtf
+    finish = time.strftime("%H:%M", time.localtime(time.time() + eta))
+    source = "estimare implicită" if rtf_source == DEFAULT_RTF_SOURCE else rtf_source
+    lines.append(f"Estimare: {format_hms(eta)} (RTF {rtf:.2f}, {source}), gata în jur de {finish}")
+    return lines
+
+# ----- Clipuri scurte în loturi -----
+def batching_enabled(cfg: Dict[str, Any]) -> bool:
+    # Decodarea în lot nu produce timpi pe cuvinte
+    return bool(cfg["batch"]["enabled"]) and int(cfg["batch"]["batch_size"] or 0) > 1 \
+        and not cfg["word_timestamps"]
+
+def split_short_clips(
+    files: List[str], cfg: Dict[str, Any], durations: Dict[str, Optional[float]]
+) -> Tuple[List[str], List[str]]:
+    """(clipuri sub pragul de durată, restul fișierelor)"""
+    limit = min(float(cfg["batch"]["max_clip_s"]), MAX_CLIP_S)
+    short = [f for f in files if durations.get(f) is not None and durations[f] <= limit]
+    rest = [f for f in files if durations.get(f) is None or durations[f] > limit]
+    return short, rest
+
+def transcribe_batch_stage(
+    jobs: List[Dict[str, Any]], cfg: Dict[str, Any], stop_event: threading.Event
+) -> List[Dict[str, Any]]:
+    """2) Transcriere în lot: clipurile decodate trec împreună prin encoder/decoder"""
+    todo = [j for j in jobs if not is_final(j) and "audio" in j]
+    if todo and not stop_event.is_set():
+        model = get_model(MODEL_MAPPING[cfg["model_type"]], dtype=backend_dtype(cfg["inference"]["backend"]),
+                          download_root=str(get_whisper_cache_dir()))
+        vad_params = cfg["vad"] if cfg["vad"]["enabled"] else None
+        try:
+            # Loturile sunt formate pe limbă: toate clipurile au aceeași limbă
+            results = transcribe_batch(model, [j["audio"] for j in todo], job_language(todo[0], cfg), vad_params)
+        except Exception as e:
+            # Lotul eșuat: fiecare clip se transcrie separat în transcribe_stage
+            log_msg(f"[yellow]WARNING:[/] Transcriere în lot eșuată ({e}), se continuă fișier cu fișier")
+            results = [None] * len(todo)
+        for job, result in zip(todo, results):
+            if result is None:
+                continue
+            job.pop("audio")
+            job["segments"] = result["segments"]
+            store_in_cache(job, result, cfg)
+            checkpoint_segments(job, result)
+    return [j if is_final(j) else transcribe_stage(j, cfg, stop_event) for j in jobs]
+
+def run_batched(
+    to_process: List[str], tmp: Path, cfg: Dict[str, Any],
+    on_result: Callable[[Dict[str, Any]], None], log_cb: Callable[[str], None],
+    queue: Queue, stop_event: threading.Event, languages: Optional[Dict[str, str]] = None,
+    durations: Optional[Dict[str, Optional[float]]] = None
+):
+    """Ca run_pipelined, dar fiecare element din pipeline este un lot de clipuri scurte"""
+    size = int(cfg["batch"]["batch_size"])
+    languages, durations = languages or {}, durations or {}
+    batches: List[List[Dict[str, Any]]] = []
+    # Grupare stabilă pe limbă: în cadrul unei limbi rămâne ordinea din plan
+    for f in sorted(to_process, key=lambda f: languages.get(f) or ""):
+        # Un lot nu amestecă limbile (decodarea folosește o singură limbă pe lot)
+        if not batches or len(batches[-1]) >= size or batches[-1][0]["language"] != languages.get(f):
+            batches.append([])
+        batches[-1].append(new_job(f, tmp, languages.get(f), durations.get(f)))
+    log_cb(f"[blue]INFO:[/] Clipuri scurte: {len(to_process)} în {len(batches)} loturi de max. {size}")
+    # ffmpeg pornește câte un proces pe clip; pornirile se suprapun
+    decoders = ThreadPoolExecutor(max_workers=min(size, os.cpu_count() or 1))
+    pipe = StagePipeline(
+        [
+            ("decode", timed_batch_stage("decode", lambda jobs: list(decoders.map(
+                lambda j: decode_stage(j, cfg, False, stop_event), jobs)))),
+            ("transcribe", timed_batch_stage("transcribe", lambda jobs: transcribe_batch_stage(jobs, cfg, stop_event))),
+            ("postprocess", timed_batch_stage("postprocess", lambda jobs: [
+                j if is_final(j) else postprocess_stage(j, cfg) for j in jobs])),
+        ],
+        queue_size=cfg["pipeline_queue_size"],
+        on_error=lambda jobs, e: [
+            j if is_final(j) else critical_error(j["file"], e)
+            for j in jobs
+        ]
+    )
+
+    def on_batch_result(results: List[Dict[str, Any]]):
+        drain_log_queue(queue, log_cb)
+        for result in results:
+            on_result(result)
 
-    # 3) Post-procesare
     try:
-        advanced_srt_postprocess(raw_srt, final_srt, cfg["postprocess"])
-        log_msg(f"[green]INFO:[/] Post-procesare completă: {base_name}")
-    except Exception as e:
-        log_msg(f"[yellow]WARNING:[/] Post-procesare eșuată pentru {base_name}: {e}")
-        shutil.copy2(raw_srt, final_srt)
+        pipe.run(batches, on_batch_result, stop=stop_event,
+                 on_idle=lambda: drain_log_queue(queue, log_cb))
+    finally:
+        decoders.shutdown()
+    log_cb(f"[blue]INFO:[/] Statistici loturi ({pipe.wall_s:.1f}s):")
+    for line in stage_lines(pipe):
+        log_cb(f"  {line}")
 
-    # Curățenie
-    wav_file.unlink(missing_ok=True)
-    raw_srt.unlink(missing_ok=True)
-    return {"status":"completed","file":mp3_file,"reason":"Succes"}
+# ----- Detectare limbă -----
+def detect_languages(
+    files: List[str], cfg: Dict[str, Any], states: Dict[str, Dict[str, Any]],
+    log_cb: Callable[[str], None], stop_event: threading.Event
+) -> Dict[str, str]:
+    """Limba fiecărui fișier, detectată o singură dată (păstrată în cache și în jurnal)"""
+    cache = open_cache(cfg)
+    model_name = MODEL_MAPPING[cfg["model_type"]]
+    load = lambda: get_model(model_name, dtype=backend_dtype(cfg["inference"]["backend"]),
+                             download_root=str(get_whisper_cache_dir()))
+    languages: Dict[str, str] = {}
+    for f in files:
+        if stop_event.is_set():
+            break
+        known = states.get(f, {}).get("data", {})
+        if known.get("language"):
+            languages[f] = known["language"]
+            continue
+        try:
+            language, prob = detect_file_language(f, load, model_name, cache)
+        except Exception as e:
+            log_cb(f"[yellow]WARNING:[/] Detectare limbă eșuată pentru {Path(f).name}: {e}")
+            continue
+        journal_state(f, QUEUED, language=language, language_prob=round(prob, 4))
+        languages[f] = language
+        log_cb(f"[blue]INFO:[/] Limbă detectată: {Path(f).name} → {language} ({prob * 100:.0f}%)")
+    groups: Dict[str, int] = {}
+    for language in languages.values():
+        groups[language] = groups.get(language, 0) + 1
+    log_cb("Limbi: " + ", ".join(f"{k} {v}" for k, v in sorted(groups.items(), key=lambda kv: -kv[1])))
+    return languages
 
 # ----- Run transcription -----
 def run_transcription(
     files: List[str], cfg: Dict[str, Any],
-    progress_cb: Callable[[int], None], log_cb: Callable[[str], None],
-    queue: Queue, stop_event: threading.Event
+    progress_cb: Callable[[int, str], None], log_cb: Callable[[str], None],
+    queue: Queue, stop_event: threading.Event,
+    status_cb: Optional[Callable[[str, str, str], None]] = None
 ):
+    """progress_cb(procent, detalii) urmărește durata audio procesată (cu ETA);
+    status_cb(fișier, status, motiv) primește rezultatul final al fiecărui fișier"""
     tmp = Path(cfg["temp_dir"]).resolve()
     tmp.mkdir(exist_ok=True)
-    recovery = load_recovery()
-    to_process = [f for f in files if recovery.get(f) != "completed"]
+    global journal
+    try:
+        journal = open_journal()
+        states = journal.states()
+    except (sqlite3.Error, OSError) as e:
+        log_cb(f"[red]ERROR:[/] Jurnal indisponibil ({e}), reluarea nu va fi posibilă")
+        journal, states = None, {}
+    to_process = [f for f in files if states.get(f, {}).get("state") != DONE]
 
     if not to_process:
         log_cb("Toate fișierele sunt deja procesate.")
+        close_journal()
         return
 
     log_cb(f"{len(files)} găsite, {len(to_process)} de procesat. Model: {cfg['model_type'].upper()}")
+    planned = len(to_process)
+    report = RunReport("mp3-to-text-v57", {
+        "model": cfg["model_type"], "language": cfg["language"], "backend": cfg["inference"]["backend"],
+        "max_parallel_jobs": cfg["max_parallel_jobs"], "vad": cfg["vad"]["enabled"],
+        "batch": cfg["batch"]["enabled"], "word_timestamps": cfg["word_timestamps"],
+    })
+
+    registry.set_memory_budget(cfg["model_memory_budget_mb"])
+    inference = cfg["inference"]
+    jobs = min(max(1, int(cfg.get("max_parallel_jobs") or 1)), len(to_process))
+    if jobs == 1 and (inference["threads"] or inference["interop_threads"]):
+        set_torch_threads(int(inference["threads"] or 0) or (os.cpu_count() or 1),
+                          int(inference["interop_threads"] or 0))
+    log_cb(f"Backend inferență: {inference['backend']}")
+
+    # Planificare înainte de model: ffprobe în paralel, fișierele nedecodabile sunt respinse
+    plan = make_plan(to_process, jobs)
+    for line in plan_lines(plan, *estimate_rtf(cfg["model_type"], cfg["report"]["dir"] or ".")):
+        log_cb(line)
+    if cfg["plan"]["longest_first"]:
+        to_process = plan.order
+    else:
+        accepted = set(plan.order)
+        to_process = [f for f in to_process if f in accepted]
+    jobs = max(1, min(jobs, len(to_process)))
+
+    languages: Dict[str, str] = {}
+    counts = {"completed": 0, "failed": 0}
+    # Progresul e ponderat cu durata audio, nu cu numărul de fișiere
+    durations = plan.durations
+    progress = BatchProgress(durations)
+    log_cb(f"Audio de transcris: {format_hms(progress.total_s)} în {len(to_process)} fișiere")
+
+    def emit_progress():
+        progress_cb(progress.percent(), progress.describe())
+
+    def on_progress(file: str, fraction: float):
+        progress.update(file, fraction)
+        emit_progress()
+
+    global progress_hook
+    progress_hook = on_progress
+    if journal is not None:
+        try:
+            journal.record_many((f, QUEUED) for f in to_process)
+        except sqlite3.Error as e:
+            log_cb(f"[red]ERROR:[/] Nu pot scrie în jurnal: {e}")
+
+    retry = cfg["retry"]
+    attempts: Dict[str, int] = {}
+    retry_later: List[str] = []
+
+    def on_result(result: Dict[str, Any]):
+        f = result["file"]
+        # Doar erorile trecătoare; un fișier fără text ar eșua la fel și a doua oară
+        if result["status"] == "failed" and result.get("retryable") \
+                and attempts.get(f, 0) < int(retry["attempts"] or 0) and not stop_event.is_set():
+            # Reîncercare ulterioară; checkpoint-ul păstrează etapele deja terminate
+            attempts[f] = attempts.get(f, 0) + 1
+            log_cb(f"[yellow]WARNING:[/] {Path(f).name} eșuat ({result['reason']}), "
+                   f"reîncercare {attempts[f]}/{retry['attempts']}")
+            journal_state(f, FAILED, reason=result["reason"], attempts=attempts[f])
+            retry_later.append(f)
+            return
+        finish(result)
+
+    def finish(result: Dict[str, Any]):
+        if result["status"] == "completed":
+            counts["completed"] += 1
+            log_cb(f"✓ Finalizat: {result['file']} ({result['reason']})")
+        else:
+            counts["failed"] += 1
+            log_cb(f"✗ Eșuat: {result['file']} ({result['reason']})")
+            if result["status"] == "failed":
+                # Eșec definitiv: etapele salvate nu mai sunt reluate
+                drop_checkpoint(new_job(result["file"], tmp, languages.get(result["file"])), cfg)
+        stages = result.get("metrics") or {}
+        journal_state(result["file"], RESULT_STATES.get(result["status"], result["status"]),
+                      round(sum(s["wall_s"] for s in stages.values()), 4) if stages else None,
+                      None if result["status"] == "completed" else result.get("reason"))
+        report.add_result(result)
+        if status_cb is not None:
+            status_cb(result["file"], result["status"], result.get("reason", ""))
+        progress.finish(result["file"])
+        emit_progress()
+
+    def wrap_up():
+        global progress_hook
+        progress_hook = None
+        comp, fail = counts["completed"], counts["failed"]
+        if cfg["report"]["enabled"]:
+            report.add_model_loads(registry.load_log)
+            try:
+                paths = report.write_all(cfg["report"]["dir"] or ".")
+                log_cb(f"Raport rulare: {', '.join(str(p) for p in paths)}")
+            except OSError as e:
+                log_cb(f"[yellow]WARNING:[/] Nu pot scrie raportul de rulare: {e}")
+        # La STOP, joburile anulate nu ajung în finish(): fail poate fi 0 cu fișiere
+        # neprocesate, iar jurnalul și checkpoint-urile sunt necesare la reluare
+        if not stop_event.is_set() and fail == 0 and comp == planned:
+            # Checkpoint-uri rămase de la fișiere modificate sau rulate cu alte setări
+            shutil.rmtree(tmp / CHECKPOINT_DIR, ignore_errors=True)
+            if journal is not None:
+                journal.clear()
+                log_cb("Jurnal de recuperare golit.")
+        elif comp + fail < planned:
+            log_cb(f"Jurnal de recuperare păstrat: {planned - comp - fail} fișiere rămase de procesat.")
+        close_journal()
+        log_cb(f"Procesare completă: {comp} succes, {fail} eșuate")
+
+    for info in plan.rejected:
+        finish({"status":"failed","file":info.path,"reason":f"Fișier nedecodabil: {info.error}"})
+    if not to_process:
+        # Toate fișierele au fost respinse: nu mai încărcăm modelul degeaba
+        wrap_up()
+        return
 
     # Verificăm și descărcăm modelul robust
-    model_name = download_model_robust(cfg["model_type"], log_cb)
+    model_name = download_model_robust(cfg["model_type"], log_cb,
+                                       dtype=backend_dtype(inference["backend"]))
     if not model_name:
         log_cb("[red]Eroare:[/] Nu se poate continua fără model valid.")
+        progress_hook = None
+        close_journal()
         return
 
-    comp = fail = 0
-    for mp3_file in to_process:
-        if stop_event.is_set():
-            log_cb("[red]INFO:[/] Procesare întreruptă de utilizator")
+    if cfg["language"] == AUTO:
+        # Ordinea din plan (cele mai lungi întâi) rămâne; loturile se grupează pe limbă în run_batched
+        languages.update(detect_languages(to_process, cfg, states, log_cb, stop_event))
+
+    short: List[str] = []
+    if batching_enabled(cfg):
+        short, rest = split_short_clips(to_process, cfg, durations)
+        if len(short) > 1:
+            to_process = rest
+        else:
+            short = []
+    jobs = min(jobs, len(to_process))
+    # Fișierele lungi pornesc primele (LPT); clipurile scurte în loturi umplu coada la final
+    if to_process and not stop_event.is_set():
+        if jobs > 1:
+            # Workerii își încarcă propriul model; eliberăm copia din procesul principal
+            registry.unload(model_name)
+            run_parallel(to_process, tmp, cfg, jobs, on_result, log_cb, queue, stop_event, languages, durations)
+        else:
+            run_pipelined(to_process, tmp, cfg, on_result, log_cb, queue, stop_event, languages, durations)
+    if short and not stop_event.is_set():
+        run_batched(short, tmp, cfg, on_result, log_cb, queue, stop_event, languages, durations)
+
+    round_no = 0
+    while retry_later and not stop_event.is_set():
+        round_no += 1
+        delay = float(retry["backoff_s"] or 0) * 2 ** (round_no - 1)
+        log_cb(f"Reîncercare pentru {len(retry_later)} fișiere în {delay:.0f}s")
+        if stop_event.wait(delay):
             break
-        while not queue.empty():
-            try:
-                log_cb(queue.get_nowait())
-            except Exception:
-                break
-        try:
-            result = process_single_file(mp3_file, tmp, cfg, False, stop_event)
-            if result["status"] == "completed":
-                comp += 1
-                log_cb(f"✓ Finalizat: {result['file']} ({result['reason']})")
-            else:
-                fail += 1
-                log_cb(f"✗ Eșuat: {result['file']} ({result['reason']})")
-            recovery[result['file']] = result["status"]
-            save_recovery(recovery)
-            progress_cb(int((comp + fail) / len(to_process) * 100))
-        except Exception as e:
-            fail += 1
-            log_cb(f"✗ Eroare critică: {mp3_file} ({str(e)})")
-            recovery[mp3_file] = "failed"
-            save_recovery(recovery)
-            progress_cb(int((comp + fail) / len(to_process) * 100))
-    if fail == 0 and Path(RECOVERY_FILE).exists():
-        Path(RECOVERY_FILE).unlink()
-        log_cb("Recovery file șters.")
-    log_cb(f"Procesare completă: {comp} succes, {fail} eșuate")
+        again, retry_later[:] = list(retry_later), []
+        run_pipelined(again, tmp, cfg, on_result, log_cb, queue, stop_event, languages, durations)
+    for f in retry_later:
+        finish({"status":"aborted","file":f,"reason":"Interrupted"})
+    wrap_up()
 
 # ----- GUI -----
 class App:
     def __init__(self, master, queue: Queue):
         self.master = master
         self.log_queue = queue
+        # Thread-ul de transcriere nu atinge widget-urile; trimite evenimente
+        self.events = EventPipe()
+        self.counts = {"completed": 0, "failed": 0}
         self.thread = None
         self.stop_event = threading.Event()
         self.config = load_config()
         master.title(f"MP3 Transcriber {VERSION}")
         master.geometry("600x450")
         self.create_widgets()
-        master.after(100, self.check_queue)
+        master.after(FRAME_MS, self.pump)
 
     def create_widgets(self):
         frm = ttk.Frame(self.master, padding="10")
@@ -488,7 +1102,7 @@ class App:
                      textvariable=self.model_var, state="readonly").pack(side=tk.LEFT, padx=5)
         ttk.Label(ofrm, text="Limbă:").pack(side=tk.LEFT, padx=(10,0))
         self.lang_var = tk.StringVar(value=self.config["language"])
-        ttk.Combobox(ofrm, values=VALID_LANGUAGES, textvariable=self.lang_var,
+        ttk.Combobox(ofrm, values=[AUTO] + VALID_LANGUAGES, textvariable=self.lang_var,
                      state="readonly").pack(side=tk.LEFT, padx=5)
         # buttons
         bfrm = ttk.Frame(frm); bfrm.pack(fill=tk.X, pady=10)
@@ -502,9 +1116,11 @@ class App:
         # progress
         self.pbar = ttk.Progressbar(frm, mode="determinate", length=400); self.pbar.pack(pady=5)
         self.plbl = ttk.Label(frm, text="Progres: 0%"); self.plbl.pack()
+        self.slbl = ttk.Label(frm, text=""); self.slbl.pack()
         # log
         lfrm = ttk.LabelFrame(frm, text="Log-uri", padding=5); lfrm.pack(fill=tk.BOTH, expand=True, pady=10)
         self.log_area = ScrolledText(lfrm, state="disabled", wrap="word"); self.log_area.pack(fill=tk.BOTH, expand=True)
+        self.log_view = LogView(self.log_area)
 
     def select_dir(self):
         d = filedialog.askdirectory()
@@ -517,6 +1133,7 @@ class App:
         self.start_btn.config(state=tk.DISABLED)
         self.exit_btn.config(text="STOP", command=self.stop)
         self.pbar["value"] = 0; self.plbl.config(text="Progres: 0%")
+        self.counts = {"completed": 0, "failed": 0}; self.slbl.config(text="")
         self.log("--- Sesiune nouă ---")
         self.config["model_type"] = self.model_var.get()
         self.config["language"]   = self.lang_var.get()
@@ -526,7 +1143,8 @@ class App:
         self.stop_event.clear()
         self.thread = threading.Thread(
             target=run_transcription,
-            args=(files, self.config, self.update_progress, self.log, self.log_queue, self.stop_event)
+            args=(files, self.config, self.events.progress, self.events.log, self.log_queue,
+                  self.stop_event, self.events.file_status)
         )
         self.thread.daemon = True
         self.thread.start()
@@ -537,24 +1155,38 @@ class App:
     def reset(self):
         self.start_btn.config(state=tk.NORMAL); self.exit_btn.config(text="Ieșire", command=self.master.quit)
 
-    def update_progress(self, v: int):
-        self.pbar["value"] = v; self.plbl.config(text=f"Progres: {v}%")
+    def update_progress(self, v: int, detail: str = ""):
+        self.pbar["value"] = v
+        self.plbl.config(text=f"Progres: {v}%" + (f"  ({detail})" if detail else ""))
 
     def log(self, msg: str):
-        self.log_area.config(state="normal")
-        self.log_area.insert(tk.END, msg + "\n")
-        self.log_area.see(tk.END)
-        self.log_area.config(state="disabled")
+        # Sigur din orice thread: linia e afișată la următorul cadru
+        self.events.log(msg)
+
+    def update_status(self, statuses: List[Tuple[str, str, str]]):
+        for file, status, _ in statuses:
+            self.counts["completed" if status == "completed" else "failed"] += 1
+        file, status, reason = statuses[-1]
+        self.slbl.config(text=f"✓ {self.counts['completed']}  ✗ {self.counts['failed']}  —  "
+                              f"{Path(file).name}: {status if status == 'completed' else reason}")
 
-    def check_queue(self):
-        while not self.log_queue.empty():
+    def pump(self):
+        """Un cadru: toate evenimentele în așteptare, randate o singură dată"""
+        lines = []
+        while not self.log_queue.empty() and len(lines) < MAX_EVENTS_PER_FRAME:
             try:
-                self.log(self.log_queue.get_nowait())
+                dispatch_queue_item(self.log_queue.get_nowait(), lines.append)
             except Exception:
                 break
-        if self.thread and not self.thread.is_alive():
+        logs, progress, statuses = coalesce(self.events.drain())
+        self.log_view.append(lines + logs)
+        if progress is not None:
+            self.update_progress(*progress)
+        if statuses:
+            self.update_status(statuses)
+        if self.thread and not self.thread.is_alive() and not self.events.pending():
             self.reset(); self.thread = None
-        self.master.after(100, self.check_queue)
+        self.master.after(FRAME_MS, self.pump)
 
 def main():
     log_q = Queue()
@@ -563,4 +1195,5 @@ def main():
     root.mainloop()
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Staged producer/consumer pipeline
+Each stage runs in its own thread and hands work to the next one through a
+bounded queue, so file N+1 can decode while file N is transcribed and file
+N-1 is post-processed.
+"""
+
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+_END = object()
+
+
+def is_final(item: Any) -> bool:
+    """A result dict (has 'status') leaves the pipeline without further stages"""
+    return isinstance(item, dict) and "status" in item
+
+
+class StageStats:
+    """Counters for one stage: throughput, busy time and stall time"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.items = 0
+        self.busy_s = 0.0
+        self.starved_s = 0.0   # waiting for input
+        self.blocked_s = 0.0   # waiting for room in the output queue
+        self.max_depth = 0
+
+    def summary(self, wall_s: float) -> str:
+        rate = self.items / wall_s * 60 if wall_s > 0 else 0.0
+        return (f"{self.name}: {self.items} items, {rate:.1f}/min, busy {self.busy_s:.1f}s, "
+                f"stall in {self.starved_s:.1f}s / out {self.blocked_s:.1f}s, "
+                f"max queue {self.max_depth}")
+
+
+class StagePipeline:
+    """Run items through named stages connected by bounded queues"""
+
+    def __init__(
+        self,
+        stages: List[Tuple[str, Callable[[Any], Any]]],
+        queue_size: int = 2,
+        on_error: Optional[Callable[[Any, Exception], Any]] = None
+    ):
+        self.stages = stages
+        self.queues = [queue.Queue(maxsize=max(1, queue_size)) for _ in stages]
+        self.results: "queue.Queue[Any]" = queue.Queue()
+        self.stats = [StageStats(name) for name, _ in stages]
+        self.on_error = on_error
+        self.wall_s = 0.0
+        self._start = 0.0
+
+    def depths(self) -> Dict[str, int]:
+        """Current depth of each stage's input queue"""
+        return {name: q.qsize() for (name, _), q in zip(self.stages, self.queues)}
+
+    def depth_line(self) -> str:
+        return ", ".join(f"{name} {depth}/{q.maxsize}"
+                         for (name, depth), q in zip(self.depths().items(), self.queues))
+
+    def _put(self, q: "queue.Queue[Any]", item: Any, stats: StageStats):
+        t0 = time.perf_counter()
+        q.put(item)
+        stats.blocked_s += time.perf_counter() - t0
+
+    def _worker(self, idx: int):
+        name, func = self.stages[idx]
+        stats = self.stats[idx]
+        inq = self.queues[idx]
+        last = idx == len(self.stages) - 1
+        while True:
+            t0 = time.perf_counter()
+            item = inq.get()
+            stats.starved_s += time.perf_counter() - t0
+            if item is _END:
+                if last:
+                    self.results.put(_END)
+                else:
+                    self._put(self.queues[idx + 1], _END, stats)
+                return
+            stats.max_depth = max(stats.max_depth, inq.qsize() + 1)
+            if is_final(item):
+                out = item
+            else:
+                t0 = time.perf_counter()
+                try:
+                    out = func(item)
+                except Exception as e:
+                    if self.on_error is None:
+                        out = {"status": "failed", "item": item, "reason": str(e)}
+                    else:
+                        out = self.on_error(item, e)
+                stats.busy_s += time.perf_counter() - t0
+                stats.items += 1
+            if last or is_final(out):
+                self.results.put(out)
+            else:
+                self._put(self.queues[idx + 1], out, stats)
+
+    def _feed(self, items: Iterable[Any], stop: Optional[threading.Event]):
+        for item in items:
+            if stop is not None and stop.is_set():
+                break
+            self.queues[0].put(item)
+        self.queues[0].put(_END)
+
+    def run(
+        self,
+        items: Iterable[Any],
+        on_result: Callable[[Any], None],
+        stop: Optional[threading.Event] = None,
+        on_idle: Optional[Callable[[], None]] = None,
+        poll_s: float = 0.2
+    ):
+        """Process all items; on_result runs in the calling thread"""
+        self._start = time.perf_counter()
+        threads = [threading.Thread(target=self._feed, args=(items, stop), daemon=True)]
+        threads += [threading.Thread(target=self._worker, args=(i,), daemon=True)
+                    for i in range(len(self.stages))]
+        for t in threads:
+            t.start()
+        while True:
+            try:
+                out = self.results.get(timeout=poll_s)
+            except queue.Empty:
+                if on_idle is not None:
+                    on_idle()
+                continue
+            if out is _END:
+                break
+            on_result(out)
+        for t in threads:
+            t.join()
+        self.wall_s = time.perf_counter() - self._start
+
+    def summary(self) -> List[str]:
+        return [s.summary(self.wall_s) for s in self.stats]
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Duration-weighted progress and ETA
+A batch's progress is the share of its total audio already transcribed, not
+the share of files, so a 3-hour recording weighs as much as a thousand short
+clips. Durations are probed once up front; files ffprobe cannot measure count
+as the median known duration.
+
+Inside a file, live progress comes from Whisper itself: transcribe() advances
+a tqdm bar over the mel frames as each 30 s window's segments are decoded.
+whisper_progress() swaps in a tqdm subclass that forwards that position to a
+callback of the calling thread. The ETA is the remaining audio times the
+real-time factor measured so far in this run.
+"""
+
+import importlib
+import statistics
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional
+
+# Report at most this often from inside a file
+MIN_INTERVAL_S = 1.0
+
+_local = threading.local()
+_install_lock = threading.Lock()
+_installed = False
+
+
+def format_hms(seconds: float) -> str:
+    seconds = int(round(max(0.0, seconds)))
+    return f"{seconds // 3600}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+class BatchProgress:
+    """Audio-weighted progress of a set of files; safe to update from any thread"""
+
+    def __init__(self, durations: Dict[str, Optional[float]]):
+        known = [d for d in durations.values() if d]
+        fallback = statistics.median(known) if known else 60.0
+        self.durations = {f: d or fallback for f, d in durations.items()}
+        self.total_s = sum(self.durations.values())
+        self.done: Dict[str, float] = {}
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def add(self, file: str, duration: Optional[float]):
+        """Count a file that was not part of the initial probe"""
+        with self._lock:
+            if file not in self.durations:
+                self.durations[file] = duration or 60.0
+                self.total_s += self.durations[file]
+
+    def update(self, file: str, fraction: float):
+        """Live position inside a file (0..1); never moves backwards"""
+        with self._lock:
+            dur = self.durations.get(file, 0.0)
+            self.done[file] = max(self.done.get(file, 0.0), min(1.0, max(0.0, fraction)) * dur)
+
+    def finish(self, file: str):
+        with self._lock:
+            self.done[file] = self.durations.get(file, 0.0)
+
+    @property
+    def done_s(self) -> float:
+        with self._lock:
+            return sum(self.done.values())
+
+    def percent(self) -> int:
+        return int(self.done_s / self.total_s * 100) if self.total_s else 0
+
+    def rtf(self) -> Optional[float]:
+        """Wall time per second of audio so far (< 1 is faster than real time)"""
+        done = self.done_s
+        return (time.perf_counter() - self.started) / done if done > 0 else None
+
+    def eta_s(self) -> Optional[float]:
+        rtf = self.rtf()
+        return rtf * max(0.0, self.total_s - self.done_s) if rtf is not None else None
+
+    def describe(self) -> str:
+        """'12:03 / 2:10:00 audio · RTF 0.31 · ETA 0:45:10'"""
+        text = f"{format_hms(self.done_s)} / {format_hms(self.total_s)} audio"
+        rtf = self.rtf()
+        if rtf is not None:
+            text += f" · RTF {rtf:.2f} · ETA {format_hms(self.eta_s())}"
+        return text
+
+
+def _install():
+    """Replace the tqdm bar whisper.transcribe uses (once per process)"""
+    global _installed
+    with _install_lock:
+        if _installed:
+            return
+        import tqdm
+        # whisper/__init__ re-exports the transcribe function; we need the module
+        module = importlib.import_module("whisper.transcribe")
+
+        class _ProgressTqdm(tqdm.tqdm):
+            def __init__(self, *args, **kwargs):
+                self._frames_total = kwargs.get("total") or 0
+                self._frames_done = 0
+                self._last_report = 0.0
+                super().__init__(*args, **kwargs)
+
+            def update(self, n=1):
+                # Counted here too: a disabled bar (verbose=None) does not track n
+                self._frames_done += n or 0
+                callback = getattr(_local, "callback", None)
+                now = time.perf_counter()
+                if callback is not None and self._frames_total and (
+                        now - self._last_report >= MIN_INTERVAL_S or self._frames_done >= self._frames_total):
+                    self._last_report = now
+                    callback(self._frames_done / self._frames_total)
+                return super().update(n)
+
+        class _Shim:
+            tqdm = _ProgressTqdm
+
+        module.tqdm = _Shim
+        _installed = True
+
+
+@contextmanager
+def whisper_progress(callback: Optional[Callable[[float], None]]) -> Iterator[None]:
+    """Call callback(fraction) while model.transcribe runs in this thread"""
+    if callback is None:
+        yield
+        return
+    try:
+        _install()
+    except ImportError:
+        yield  # no whisper/tqdm: no live progress, the file still counts when done
+        return
+    previous = getattr(_local, "callback", None)
+    _local.callback = callback
+    try:
+        yield
+    finally:
+        _local.callback = previous
@@ -0,0 +1,464 @@
+#!/usr/bin/env python3
+"""
+Subtitle post-processing engine
+Merges short cues, splits long ones and inserts gaps between split parts in a
+single linear pass. Cues are (start_ms, end_ms, text) records with integer
+millisecond times, so no datetime/timedelta objects are created per cue.
+
+Cues may carry Whisper word timestamps; long cues are then cut at real word
+boundaries with real times instead of sharing the duration by length.
+
+SRT files can be streamed (read_srt -> process_cues -> write_srt): cues are
+parsed, processed and written one at a time, so memory stays flat no matter
+how long the file is.
+
+Used by merge_short_subs.py, mp3-to-text-v57.py and video-to-text.py.
+"""
+
+import logging
+import os
+import re
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Setări implicite (secțiunea "postprocess" din config.yaml)
+MIN_CHARS = 80
+MAX_CHARS = 120
+SUBTITLE_GAP_MS = 100  # Gap minim între subtitrări în milisecunde
+
+# Scorul unui punct de tăiere (mai mic = mai bun): penalizarea tipului de
+# pauză + distance * caractere față de tăierea preferată
+# (secțiunea "postprocess.split_weights" din config.yaml)
+SPLIT_WEIGHTS = {
+    "sentence": 0.0,       # după . ! ?
+    "punctuation": 100.0,  # după , ; : și liniuță
+    "space": 200.0,        # orice alt spațiu
+    "distance": 1.0,
+}
+
+# Tăierea preferată, ca fracție din max_chars, după lungimea rămasă
+# (70/90/100 din 120 caractere)
+_PREFERRED_CUTS = ((1.25, 70 / 120), (1.5, 90 / 120), (float("inf"), 100 / 120))
+# Cât de departe de tăierea preferată e acceptat fiecare tip (înainte, după)
+_CUT_WINDOWS = {
+    "sentence": (20 / 120, 10 / 120),
+    "punctuation": (15 / 120, 10 / 120),
+    "space": (10 / 120, 5 / 120),
+}
+_MAX_BEFORE = max(before for before, _ in _CUT_WINDOWS.values())
+_MAX_AFTER = max(after for _, after in _CUT_WINDOWS.values())
+
+_SPACES_RE = re.compile(r" +")
+_SENTENCE_END = frozenset(".!?")
+_CLAUSE_END = frozenset(",;:")
+_DASHES = frozenset("-–—")
+
+
+Word = Tuple[int, int, str]  # (start ms, end ms, text) of one spoken word
+
+
+class Cue(NamedTuple):
+    start: int  # ms
+    end: int    # ms
+    text: str
+    words: Optional[Tuple[Word, ...]] = None  # real word timings, when known
+
+
+_TIME_RE = re.compile(r"(\d+):(\d{1,2}):(\d{1,2})[,.](\d{1,3})")
+_TIMING_RE = re.compile(
+    r"\s*(\d+):(\d{1,2}):(\d{1,2})[,.](\d{1,3})\s*-->\s*(\d+):(\d{1,2}):(\d{1,2})[,.](\d{1,3})"
+)
+_BLOCK_SEP_RE = re.compile(r"\n[ \t]*\n")
+
+
+def _ms(h: str, m: str, s: str, frac: str) -> int:
+    return ((int(h) * 60 + int(m)) * 60 + int(s)) * 1000 + int(frac.ljust(3, "0"))
+
+
+def parse_time(value: str) -> int:
+    """SRT timestamp (HH:MM:SS,mmm) -> milliseconds"""
+    m = _TIME_RE.search(value)
+    if not m:
+        raise ValueError(f"Invalid SRT timestamp: {value!r}")
+    return _ms(*m.groups())
+
+
+def format_time(ms: int) -> str:
+    """Milliseconds -> SRT timestamp (HH:MM:SS,mmm)"""
+    ms = max(0, int(ms))
+    h, rem = divmod(ms, 3_600_000)
+    m, rem = divmod(rem, 60_000)
+    s, ms = divmod(rem, 1000)
+    return f"{h:02d}:{m:02d}:{s:02d},{ms:03d}"
+
+
+def _parse_block(lines: List[str]) -> Optional[Cue]:
+    # The timing line follows the index, but tolerate a missing index
+    for i in (1, 0):
+        m = _TIMING_RE.match(lines[i]) if i < len(lines) else None
+        if m:
+            g = m.groups()
+            return Cue(_ms(*g[:4]), _ms(*g[4:]), "\n".join(lines[i + 1:]))
+    return None
+
+
+def parse_srt(text: str) -> Iterator[Cue]:
+    """Cues of an SRT document; blocks without a timing line are skipped"""
+    text = text.lstrip("\ufeff").replace("\r\n", "\n").replace("\r", "\n")
+    for block in _BLOCK_SEP_RE.split(text.strip()):
+        cue = _parse_block(block.split("\n"))
+        if cue:
+            yield cue
+
+
+def read_srt(
+    path: Union[str, Path],
+    encoding: str = "utf-8",
+    progress: Optional[Callable[[int, int], None]] = None,
+    progress_every: int = 100
+) -> Iterator[Cue]:
+    """Stream the cues of an SRT file, one block in memory at a time
+
+    progress(bytes_read, total_bytes) is called every progress_every cues
+    and once at the end.
+    """
+    total = os.path.getsize(path)
+    done = count = 0
+    lines: List[str] = []
+    with open(path, "rb") as f:
+        for raw in f:
+            line = raw.decode(encoding).rstrip("\r\n")
+            if not done:
+                line = line.lstrip("\ufeff")
+            done += len(raw)
+            if line.strip():
+                lines.append(line)
+                continue
+            if not lines:
+                continue
+            cue = _parse_block(lines)
+            lines = []
+            if cue:
+                count += 1
+                if progress and count % progress_every == 0:
+                    progress(done, total)
+                yield cue
+    cue = _parse_block(lines) if lines else None
+    if cue:
+        yield cue
+    if progress:
+        progress(total, total)
+
+
+def compose_srt(cues: Iterable[Cue]) -> str:
+    """SRT document for cues, renumbered from 1"""
+    return "".join(
+        f"{i}\n{format_time(cue.start)} --> {format_time(cue.end)}\n{cue.text}\n\n"
+        for i, cue in enumerate(cues, start=1)
+    )
+
+
+def write_srt(path: Union[str, Path], cues: Iterable[Cue], encoding: str = "utf-8") -> int:
+    """Write cues as they arrive; the file appears atomically when done
+
+    Returns the number of cues written.
+    """
+    path = Path(path)
+    tmp = path.with_name(f"{path.name}.tmp{os.getpid()}")
+    count = 0
+    try:
+        with open(tmp, "w", encoding=encoding, newline="\n") as f:
+            for count, cue in enumerate(cues, start=1):
+                f.write(f"{count}\n{format_time(cue.start)} --> {format_time(cue.end)}\n{cue.text}\n\n")
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return count
+
+
+def break_points(text: str) -> Tuple[List[int], List[int]]:
+    """Start and end index of every run of spaces inside text, in order"""
+    spans = [m.span() for m in _SPACES_RE.finditer(text, 1, len(text) - 1)]
+    return [s for s, _ in spans], [e for _, e in spans]
+
+
+def break_kind(text: str, start: int) -> str:
+    """sentence / punctuation / space, from what precedes the spaces at start"""
+    prev = text[start - 1]
+    if prev in _SENTENCE_END:
+        return "sentence"
+    if prev in _CLAUSE_END or (prev in _DASHES and start >= 2 and text[start - 2] == " "):
+        return "punctuation"
+    return "space"
+
+
+def _preferred_cut(remaining: int, max_chars: int) -> int:
+    for limit, ratio in _PREFERRED_CUTS:
+        if remaining < limit * max_chars:
+            return max(1, int(round(ratio * max_chars)))
+    return max_chars
+
+
+def split_custom(
+    text: str,
+    max_chars: int = MAX_CHARS,
+    weights: Optional[Dict[str, float]] = None
+) -> List[str]:
+    """
+    Împarte textul lung în segmente mai mici, prioritizând punctuația
+
+    Punctele de tăiere sunt indexate o singură dată, apoi tăieturile se aleg
+    greedy de la stânga la dreapta: liniar, fără recursivitate.
+    """
+    if len(text) <= max_chars:
+        return [text]
+    w = dict(SPLIT_WEIGHTS, **(weights or {}))
+    starts, cuts = break_points(text)
+    windows = {kind: (before * max_chars, after * max_chars)
+               for kind, (before, after) in _CUT_WINDOWS.items()}
+
+    parts = []
+    pos = 0
+    n = len(text)
+    while n - pos > max_chars:
+        pref = pos + _preferred_cut(n - pos, max_chars)
+        best, best_score = None, None
+        lo = bisect_left(cuts, pref - _MAX_BEFORE * max_chars)
+        hi = bisect_right(cuts, pref + _MAX_AFTER * max_chars)
+        for i in range(lo, hi):
+            kind = break_kind(text, starts[i])
+            before, after = windows[kind]
+            if not (pref - before <= cuts[i] <= pref + after) or cuts[i] <= pos:
+                continue
+            score = w[kind] + w["distance"] * abs(cuts[i] - pref)
+            if best_score is None or score < best_score:
+                best, best_score = cuts[i], score
+        if best is None:
+            # Niciun punct bun: cel mai apropiat spațiu care încape în max_chars
+            lo = bisect_right(cuts, pos)
+            hi = bisect_right(cuts, pos + max_chars)
+            if hi > lo:
+                best = min(cuts[lo:hi], key=lambda c: abs(c - pref))
+            else:
+                # Fallback: tăiere forțată
+                best = pref
+                logger.warning(f"Forced split at position {best - pos} - no good break point found")
+        left = text[pos:best].strip()
+        if left:
+            parts.append(left)
+        pos = best
+    parts.append(text[pos:].strip())
+    return parts
+
+
+def _nonspace_len(text: str) -> int:
+    return len(text) - sum(1 for ch in text if ch.isspace())
+
+
+def _align_words(chunks: List[str], words: Tuple[Word, ...]) -> Optional[List[Tuple[int, int]]]:
+    """(first, last) word index of each chunk, or None if the texts don't line up"""
+    ends = []
+    total = 0
+    for w in words:
+        total += _nonspace_len(w[2])
+        ends.append(total)
+    bounds = []
+    first = pos = 0
+    for chunk in chunks:
+        pos += _nonspace_len(chunk)
+        last = bisect_left(ends, pos)
+        # A cut inside a word (forced split) can't use word timings
+        if last >= len(ends) or ends[last] != pos or last < first:
+            return None
+        bounds.append((first, last))
+        first = last + 1
+    return bounds if first == len(words) else None
+
+
+def _split_on_words(
+    chunks: List[str],
+    bounds: List[Tuple[int, int]],
+    words: Tuple[Word, ...],
+    start: int,
+    end: int,
+    gap_ms: int
+) -> Iterator[Cue]:
+    starts = [start] + [max(start, words[a][0]) for a, _ in bounds[1:]]
+    for i, (chunk, (_, last)) in enumerate(zip(chunks, bounds)):
+        if i == len(chunks) - 1:
+            chunk_end = end
+        else:
+            # Capătul real al ultimului cuvânt, păstrând gap-ul până la următoarea parte
+            chunk_end = max(starts[i] + 1, min(words[last][1], starts[i + 1] - gap_ms))
+        yield Cue(starts[i], min(chunk_end, end), chunk)
+
+
+def split_timed(
+    text: str,
+    start: int,
+    end: int,
+    max_chars: int = MAX_CHARS,
+    gap_ms: int = SUBTITLE_GAP_MS,
+    weights: Optional[Dict[str, float]] = None,
+    words: Optional[Tuple[Word, ...]] = None
+) -> Iterator[Cue]:
+    """Split text into cues with gaps between parts
+
+    With word timings the parts start and end on the words they contain;
+    otherwise [start, end] is shared by text length.
+    """
+    chunks = split_custom(text, max_chars, weights)
+    if len(chunks) == 1:
+        yield Cue(start, end, chunks[0])
+        return
+
+    bounds = _align_words(chunks, words) if words else None
+    if bounds:
+        yield from _split_on_words(chunks, bounds, words, start, end, gap_ms)
+        return
+
+    total_ms = end - start
+    gaps = len(chunks) - 1
+    if total_ms <= gaps * gap_ms:
+        logger.warning("Duration too short for proper gaps, using minimal gaps")
+        available = total_ms
+        gap = max(50, total_ms // (gaps + 1))
+    else:
+        available = total_ms - gaps * gap_ms
+        gap = gap_ms
+
+    total_chars = sum(len(chunk) for chunk in chunks)
+    cur = start
+    for chunk in chunks[:-1]:
+        chunk_end = cur + int(len(chunk) / total_chars * available)
+        yield Cue(cur, chunk_end, chunk)
+        cur = chunk_end + gap
+    # Ultima porțiune folosește tot timpul rămas
+    yield Cue(cur, end, chunks[-1])
+
+
+def process_cues(
+    cues: Iterable[Cue],
+    min_chars: int = MIN_CHARS,
+    max_chars: int = MAX_CHARS,
+    gap_ms: int = SUBTITLE_GAP_MS,
+    weights: Optional[Dict[str, float]] = None
+) -> Iterator[Cue]:
+    """Merge short cues and split long ones in one pass over the input"""
+    pending = ""
+    start = last_end = 0
+    # Timpii cuvintelor se folosesc doar dacă toate subtitrările unite îi au
+    pending_words: Optional[List[Word]] = None
+    for cue in cues:
+        clean = cue.text.strip().replace("\n", " ").replace("\r", "")
+        if not clean:
+            continue
+        if pending:
+            pending += " " + clean
+            if pending_words is not None:
+                pending_words = pending_words + list(cue.words) if cue.words else None
+        else:
+            pending, start = clean, cue.start
+            pending_words = list(cue.words) if cue.words else None
+        last_end = cue.end
+        # Evită acumularea excesivă chiar dacă min_chars e mare
+        if len(pending) >= min_chars or len(pending) > max_chars * 2:
+            yield from split_timed(pending, start, last_end, max_chars, gap_ms, weights,
+                                   tuple(pending_words) if pending_words else None)
+            pending = ""
+    if pending:
+        yield from split_timed(pending, start, last_end, max_chars, gap_ms, weights,
+                               tuple(pending_words) if pending_words else None)
+
+
+def process_srt_text(
+    text: str,
+    min_chars: int = MIN_CHARS,
+    max_chars: int = MAX_CHARS,
+    gap_ms: int = SUBTITLE_GAP_MS,
+    weights: Optional[Dict[str, float]] = None
+) -> str:
+    """Post-process a whole SRT document"""
+    return compose_srt(process_cues(parse_srt(text), min_chars, max_chars, gap_ms, weights))
+
+
+def _to_ms(seconds: float) -> int:
+    return int(round(seconds * 1000))
+
+
+def compact_words(words: Iterable[Dict[str, Any]]) -> Dict[str, list]:
+    """Whisper word dicts -> {"word_text": [...], "word_ms": [start0, end0, start1, ...]}"""
+    text: List[str] = []
+    times: List[int] = []
+    for w in words:
+        text.append(w["word"])
+        times.append(_to_ms(w["start"]))
+        times.append(_to_ms(w["end"]))
+    return {"word_text": text, "word_ms": times}
+
+
+def pack_words(segments: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Replace per-word dicts in Whisper segments with the compact form, in place"""
+    for seg in segments:
+        words = seg.pop("words", None)
+        if words:
+            seg.update(compact_words(words))
+    return segments
+
+
+def segment_words(seg: Dict[str, Any]) -> Optional[Tuple[Word, ...]]:
+    """Word timings of a segment (compact or Whisper form), or None"""
+    if seg.get("word_ms"):
+        t = seg["word_ms"]
+        return tuple((t[2 * i], t[2 * i + 1], w) for i, w in enumerate(seg["word_text"]))
+    if seg.get("words"):
+        return tuple((_to_ms(w["start"]), _to_ms(w["end"]), w["word"]) for w in seg["words"])
+    return None
+
+
+def segment_cue(seg: Dict[str, Any]) -> Cue:
+    return Cue(_to_ms(seg["start"]), _to_ms(seg["end"]), seg.get("text") or "", segment_words(seg))
+
+
+def merge_segments(
+    segments: Iterable[Dict[str, Any]],
+    min_chars: int = MIN_CHARS,
+    max_chars: int = MAX_CHARS,
+    gap_ms: int = SUBTITLE_GAP_MS,
+    weights: Optional[Dict[str, float]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Post-process Whisper segments {"start", "end", "text"} (times in seconds)
+    Word timings (compact or Whisper form) are used when present.
+    """
+    return [
+        {"start": cue.start / 1000, "end": cue.end / 1000, "text": cue.text}
+        for cue in process_cues(map(segment_cue, segments), min_chars, max_chars, gap_ms, weights)
+    ]
+
+
+def process_srt_file(
+    input_path: Union[str, Path],
+    output_path: Union[str, Path],
+    min_chars: int = MIN_CHARS,
+    max_chars: int = MAX_CHARS,
+    gap_ms: int = SUBTITLE_GAP_MS,
+    weights: Optional[Dict[str, float]] = None,
+    encoding: str = "utf-8",
+    progress: Optional[Callable[[int, int], None]] = None
+) -> Tuple[int, int]:
+    """Post-process an SRT file in streaming mode; return (cues in, cues out)"""
+    counted = [0]
+
+    def counting(cues: Iterable[Cue]) -> Iterator[Cue]:
+        for cue in cues:
+            counted[0] += 1
+            yield cue
+
+    cues = read_srt(input_path, encoding, progress)
+    written = write_srt(output_path, process_cues(counting(cues), min_chars, max_chars, gap_ms, weights))
+    return counted[0], written
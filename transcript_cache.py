@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Content-addressed transcription cache
+Raw Whisper segments are stored under a key built from a fast content hash of
+the media plus the model, language and decode options, so renamed, moved or
+re-queued files skip decoding and inference entirely.
+
+Usage: python3 transcript_cache.py [--dir DIR] stats|list|prune|clear
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "video-to-text" / "transcripts"
+DEFAULT_MAX_MB = 1024
+
+# Content hash: small files are hashed whole, large ones by evenly spaced blocks
+_FULL_HASH_LIMIT = 8 * 1024 * 1024
+_SAMPLE_BLOCKS = 32
+_BLOCK_SIZE = 64 * 1024
+
+_SEGMENT_KEYS = ("start", "end", "text", "words", "word_text", "word_ms")
+
+# Hashes already computed in this process, keyed by (path, size, mtime)
+_HASH_MEMO_SIZE = 4096
+_hash_memo: Dict[Tuple[str, int, int], str] = {}
+
+# Full directory scan after this many puts; in between the size is kept as a running total
+_RESCAN_EVERY = 200
+# Eviction from put() goes down to this share of the limit, so a full cache isn't rescanned on every put
+_LOW_WATER = 0.9
+
+
+def content_hash(path: Union[str, Path]) -> str:
+    """Fast fingerprint of a media file (size + whole or sampled content, BLAKE2b)
+
+    Sampled blocks miss an in-place edit between them, so for large files the
+    modification time is part of the hash too. An unchanged file (same path,
+    size and mtime) is not read again in the same process.
+    """
+    path = Path(path)
+    st = path.stat()
+    memo_key = (str(path.resolve()), st.st_size, st.st_mtime_ns)
+    cached = _hash_memo.get(memo_key)
+    if cached is not None:
+        return cached
+    size = st.st_size
+    h = hashlib.blake2b(digest_size=20)
+    h.update(f"size={size};".encode())
+    with open(path, "rb") as f:
+        if size <= _FULL_HASH_LIMIT:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                h.update(block)
+        else:
+            h.update(f"mtime={st.st_mtime_ns};".encode())
+            step = (size - _BLOCK_SIZE) // (_SAMPLE_BLOCKS - 1)
+            for i in range(_SAMPLE_BLOCKS):
+                f.seek(i * step)
+                h.update(f.read(_BLOCK_SIZE))
+    if len(_hash_memo) >= _HASH_MEMO_SIZE:
+        _hash_memo.clear()
+    _hash_memo[memo_key] = digest = h.hexdigest()
+    return digest
+
+
+def cache_key(media_hash: str, model: str, language: Optional[str], options: Dict[str, Any]) -> str:
+    """Key for one (content, model, language, decode options) combination"""
+    payload = json.dumps(
+        {"media": media_hash, "model": model, "language": language, "options": options},
+        sort_keys=True, default=str
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def compact_segments(segments: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Keep only what post-processing needs from Whisper segments"""
+    return [{k: seg[k] for k in _SEGMENT_KEYS if k in seg} for seg in segments]
+
+
+class _DirUsage:
+    """Running byte total of one cache directory, shared by every TranscriptCache on it"""
+
+    _all: Dict[str, "_DirUsage"] = {}
+    _all_lock = threading.Lock()
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.total: Optional[int] = None  # unknown until the first scan
+        self.puts = 0
+
+    @classmethod
+    def of(cls, directory: Path) -> "_DirUsage":
+        with cls._all_lock:
+            return cls._all.setdefault(str(directory.resolve()), cls())
+
+
+class TranscriptCache:
+    """On-disk cache of raw segments with size-based LRU eviction
+
+    The directory is scanned once to learn its size and then only every
+    _RESCAN_EVERY puts (other processes may write to it too); in between a
+    put just adds its own bytes and scans only when over the limit.
+    """
+
+    def __init__(self, cache_dir: Union[str, Path, None] = None, max_mb: float = DEFAULT_MAX_MB):
+        self.dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+        self.max_bytes = int(max_mb * 1024 * 1024) if max_mb else 0
+        self._usage = _DirUsage.of(self.dir)
+
+    def _path(self, key: str) -> Path:
+        return self.dir / key[:2] / f"{key}.json.gz"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Cached entry for key, or None; a hit refreshes its LRU position"""
+        p = self._path(key)
+        try:
+            with gzip.open(p, "rt", encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Dropping unreadable cache entry {p.name}: {e}")
+            self._remove(p)
+            return None
+        try:
+            os.utime(p)
+        except OSError:
+            pass
+        return entry
+
+    def put(self, key: str, result: Dict[str, Any], meta: Optional[Dict[str, Any]] = None):
+        """Store a Whisper result (segments + language) atomically"""
+        entry = dict(meta or {})
+        entry.update({
+            "key": key,
+            "created": time.time(),
+            "language": result.get("language"),
+            "segments": compact_segments(result.get("segments", [])),
+        })
+        p = self._path(key)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        tmp = p.with_suffix(f".tmp{os.getpid()}")
+        with gzip.open(tmp, "wt", encoding="utf-8", compresslevel=5) as f:
+            json.dump(entry, f, ensure_ascii=False)
+        added = tmp.stat().st_size - self._size_of(p)
+        os.replace(tmp, p)
+        if not self.max_bytes:
+            return
+        usage = self._usage
+        with usage.lock:
+            usage.puts += 1
+            if usage.total is not None:
+                usage.total += added
+            scan = usage.total is None or usage.total > self.max_bytes or usage.puts >= _RESCAN_EVERY
+        if scan:
+            over = usage.total is not None and usage.total > self.max_bytes
+            self.prune(int(self.max_bytes * _LOW_WATER) if over else self.max_bytes)
+
+    @staticmethod
+    def _size_of(p: Path) -> int:
+        try:
+            return p.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    def _remove(self, p: Path):
+        size = self._size_of(p)
+        p.unlink(missing_ok=True)
+        with self._usage.lock:
+            if self._usage.total is not None:
+                self._usage.total -= size
+
+    def entries(self) -> List[Tuple[Path, int, float]]:
+        """(path, size, last use) of every entry, least recently used first"""
+        if not self.dir.exists():
+            return []
+        out = []
+        for p in self.dir.glob("*/*.json.gz"):
+            try:
+                st = p.stat()
+            except FileNotFoundError:
+                continue
+            out.append((p, st.st_size, st.st_mtime))
+        out.sort(key=lambda e: e[2])
+        return out
+
+    def size_bytes(self) -> int:
+        return sum(size for _, size, _ in self.entries())
+
+    def prune(self, max_bytes: Optional[int] = None, older_than_s: Optional[float] = None) -> Tuple[int, int]:
+        """Evict entries (oldest use first) until under max_bytes; return (count, bytes)"""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        now = time.time()
+        removed = freed = 0
+        for p, size, mtime in entries:
+            too_old = older_than_s is not None and now - mtime > older_than_s
+            too_big = max_bytes is not None and total > max_bytes
+            if not (too_old or too_big):
+                continue
+            p.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+            freed += size
+        with self._usage.lock:
+            self._usage.total = total
+            self._usage.puts = 0
+        return removed, freed
+
+    def clear(self) -> Tuple[int, int]:
+        return self.prune(max_bytes=0)
+
+
+def _fmt_mb(n: int) -> str:
+    return f"{n / (1024 * 1024):.1f} MB"
+
+
+def main():
+    """Inspect and prune the cache"""
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    parser = argparse.ArgumentParser(description="Inspect and prune the transcription cache")
+    parser.add_argument("--dir", default=None, help=f"Cache directory (default: {DEFAULT_CACHE_DIR})")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("stats", help="Entry count and total size")
+    sub.add_parser("list", help="List entries, least recently used first")
+    prune = sub.add_parser("prune", help="Evict least recently used entries")
+    prune.add_argument("--max-mb", type=float, default=DEFAULT_MAX_MB,
+                       help=f"Target size in MB (default: {DEFAULT_MAX_MB})")
+    prune.add_argument("--older-than-days", type=float, default=None,
+                       help="Also drop entries not used for this many days")
+    sub.add_parser("clear", help="Remove every entry")
+    args = parser.parse_args()
+
+    cache = TranscriptCache(args.dir)
+    if args.command == "stats":
+        entries = cache.entries()
+        print(f"Cache: {cache.dir}")
+        print(f"Entries: {len(entries)}")
+        print(f"Size: {_fmt_mb(sum(size for _, size, _ in entries))}")
+    elif args.command == "list":
+        for p, size, mtime in cache.entries():
+            try:
+                with gzip.open(p, "rt", encoding="utf-8") as f:
+                    entry = json.load(f)
+            except (OSError, ValueError):
+                entry = {}
+            last = time.strftime("%Y-%m-%d %H:%M", time.localtime(mtime))
+            print(f"{last}  {size / 1024:8.1f} KB  {entry.get('model', '?'):>10}  "
+                  f"{entry.get('language') or '?':>3}  {len(entry.get('segments', [])):6d} seg  "
+                  f"{entry.get('source', p.name)}")
+    elif args.command == "prune":
+        older = args.older_than_days * 86400 if args.older_than_days is not None else None
+        removed, freed = cache.prune(int(args.max_mb * 1024 * 1024), older)
+        print(f"Removed {removed} entries ({_fmt_mb(freed)})")
+    elif args.command == "clear":
+        removed, freed = cache.clear()
+        print(f"Removed {removed} entries ({_fmt_mb(freed)})")
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
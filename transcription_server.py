@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Resident transcription server with a local HTTP job API
+Keeps Python, torch and the Whisper models warm between jobs. Jobs run one at
+a time through the processing function supplied by the caller
+(video-to-text.py --serve wires in process_file).
+
+  GET  /health               server status
+  POST /jobs                 submit {path, model, language, format, ...}
+  GET  /jobs                 list jobs
+  GET  /jobs/<id>            job status
+  GET  /jobs/<id>/srt|txt    job output
+"""
+
+import json
+import logging
+import queue
+import threading
+import time
+import uuid
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import parse_qs
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Finished jobs kept for status/output queries
+MAX_FINISHED_JOBS = 1000
+
+
+class Job:
+    """One submitted file and its lifecycle"""
+
+    def __init__(self, params: Dict[str, Any]):
+        self.id = uuid.uuid4().hex[:12]
+        self.params = params
+        self.status = "queued"
+        self.error: Optional[str] = None
+        self.outputs: Dict[str, str] = {}
+        self.submitted = time.time()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "status": self.status,
+            "params": self.params,
+            "error": self.error,
+            "outputs": dict(self.outputs),
+            "submitted": self.submitted,
+            "started": self.started,
+            "finished": self.finished,
+        }
+
+
+class JobServer:
+    """Job queue plus a single worker thread that owns the warm models
+
+    process_fn(params) returns a dict of output kind -> file path and raises
+    on failure. validate_fn(params), if given, runs on submit and raises
+    ValueError for parameters the job would fail on (answered with 400).
+    Job fields are only read and written under lock.
+    """
+
+    def __init__(
+        self,
+        process_fn: Callable[[Dict[str, Any]], Dict[str, str]],
+        version: str = "",
+        validate_fn: Optional[Callable[[Dict[str, Any]], None]] = None
+    ):
+        self.process_fn = process_fn
+        self.validate_fn = validate_fn
+        self.version = version
+        self.jobs: Dict[str, Job] = {}
+        self.order: List[str] = []
+        self.pending: "queue.Queue[Job]" = queue.Queue()
+        self.lock = threading.Lock()
+        self.worker = threading.Thread(target=self._work, daemon=True)
+
+    def submit(self, params: Dict[str, Any]) -> Job:
+        path = params.get("path")
+        if not path or not Path(path).is_file():
+            raise ValueError(f"Input file not found: {path}")
+        if self.validate_fn:
+            self.validate_fn(params)
+        job = Job(params)
+        with self.lock:
+            self.jobs[job.id] = job
+            self.order.append(job.id)
+            self._forget_old_jobs()
+        self.pending.put(job)
+        logger.info(f"Job {job.id} queued: {path}")
+        return job
+
+    def _forget_old_jobs(self):
+        finished = [j for j in self.order if self.jobs[j].finished is not None]
+        for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            self.order.remove(job_id)
+            del self.jobs[job_id]
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Snapshot of one job, consistent even while the worker updates it"""
+        with self.lock:
+            job = self.jobs.get(job_id)
+            return job.to_dict() if job else None
+
+    def list(self) -> List[Dict[str, Any]]:
+        with self.lock:
+            return [self.jobs[j].to_dict() for j in self.order]
+
+    def _work(self):
+        while True:
+            job = self.pending.get()
+            with self.lock:
+                job.status = "running"
+                job.started = time.time()
+            logger.info(f"Job {job.id} started: {job.params['path']}")
+            outputs: Dict[str, str] = {}
+            error: Optional[str] = None
+            try:
+                outputs = self.process_fn(job.params)
+            except Exception as e:
+                error = str(e)
+                logger.error(f"Job {job.id} failed: {e}")
+            with self.lock:
+                job.outputs = outputs
+                job.error = error
+                job.status = "failed" if error is not None else "done"
+                job.finished = time.time()
+            logger.info(f"Job {job.id} {job.status} in {job.finished - job.started:.1f}s")
+
+    def serve(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+        """Start the worker and block serving HTTP requests"""
+        self.worker.start()
+        httpd = ThreadingHTTPServer((host, port), _make_handler(self))
+        logger.info(f"Transcription server listening on http://{host}:{port}")
+        try:
+            httpd.serve_forever()
+        except KeyboardInterrupt:
+            logger.info("Shutting down transcription server")
+        finally:
+            httpd.server_close()
+
+
+def _make_handler(server: JobServer):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, fmt, *args):
+            logger.debug("%s - %s", self.address_string(), fmt % args)
+
+        def _send(self, status: int, body: Any, content_type: str = "application/json"):
+            data = body if isinstance(body, bytes) else json.dumps(body, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _read_params(self) -> Dict[str, Any]:
+            length = int(self.headers.get("Content-Length") or 0)
+            raw = self.rfile.read(length).decode("utf-8") if length else ""
+            if self.headers.get("Content-Type", "").startswith("application/json"):
+                return json.loads(raw or "{}")
+            # Form encoding keeps shell clients (curl --data-urlencode) simple
+            return {k: v[-1] for k, v in parse_qs(raw).items()}
+
+        def do_GET(self):
+            parts = [p for p in self.path.split("?")[0].split("/") if p]
+            if parts == ["health"]:
+                return self._send(HTTPStatus.OK, {
+                    "status": "ok",
+                    "version": server.version,
+                    "queued": server.pending.qsize(),
+                })
+            if parts == ["jobs"]:
+                return self._send(HTTPStatus.OK, server.list())
+            if len(parts) in (2, 3) and parts[0] == "jobs":
+                job = server.get(parts[1])
+                if job is None:
+                    return self._send(HTTPStatus.NOT_FOUND, {"error": "unknown job"})
+                if len(parts) == 2:
+                    return self._send(HTTPStatus.OK, job)
+                kind = parts[2]
+                if job["status"] != "done":
+                    return self._send(HTTPStatus.CONFLICT, {"error": f"job is {job['status']}"})
+                out = job["outputs"].get(kind)
+                if not out or not Path(out).exists():
+                    return self._send(HTTPStatus.NOT_FOUND, {"error": f"no {kind} output"})
+                return self._send(HTTPStatus.OK, Path(out).read_bytes(), "text/plain")
+            return self._send(HTTPStatus.NOT_FOUND, {"error": "not found"})
+
+        def do_POST(self):
+            if self.path.rstrip("/") != "/jobs":
+                return self._send(HTTPStatus.NOT_FOUND, {"error": "not found"})
+            try:
+                job = server.submit(self._read_params())
+            except (ValueError, json.JSONDecodeError) as e:
+                return self._send(HTTPStatus.BAD_REQUEST, {"error": str(e)})
+            return self._send(HTTPStatus.ACCEPTED, {"id": job.id, "status": job.status})
+
+    return Handler
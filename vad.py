@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Energy-based voice activity detection (CPU only)
+Finds speech regions so silence and music are never fed to Whisper, then
+maps segment timestamps from the compacted audio back to the original timeline.
+"""
+
+import logging
+from bisect import bisect_right
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from audio_io import SAMPLE_RATE
+
+logger = logging.getLogger(__name__)
+
+# Tunable thresholds (also accepted from the "vad" section of config.yaml)
+VAD_DEFAULTS = {
+    "frame_ms": 30,          # analysis frame length
+    "margin_db": 12.0,       # speech must be this far above the noise floor
+    "floor_db": -55.0,       # ... and never below this absolute level
+    "min_speech_ms": 250,    # shorter bursts are treated as noise
+    "min_silence_ms": 400,   # shorter pauses stay inside the speech region
+    "pad_ms": 200,           # context kept around every region
+}
+
+Region = Tuple[int, int]              # sample range [start, end)
+TimeMap = List[Tuple[float, float]]   # (compact start s, original start s)
+
+
+def frame_energy_db(audio: np.ndarray, frame: int) -> np.ndarray:
+    """RMS level of each frame in dBFS, without copying the signal"""
+    n = len(audio) // frame
+    frames = audio[:n * frame].reshape(n, frame)
+    power = np.einsum("ij,ij->i", frames, frames) / frame
+    return 10.0 * np.log10(power + 1e-10)
+
+
+def _runs(mask: np.ndarray) -> List[List[int]]:
+    """[start, end) index pairs of consecutive True values"""
+    edges = np.diff(np.concatenate(([0], mask.view(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    return [[int(s), int(e)] for s, e in zip(starts, ends)]
+
+
+def detect_speech(
+    audio: np.ndarray,
+    sample_rate: int = SAMPLE_RATE,
+    **params: Any
+) -> List[Region]:
+    """Return speech regions as sample ranges"""
+    cfg = dict(VAD_DEFAULTS, **{k: v for k, v in params.items() if k in VAD_DEFAULTS})
+    frame = max(1, int(sample_rate * cfg["frame_ms"] / 1000))
+    if len(audio) < frame:
+        return []
+    energy = frame_energy_db(audio, frame)
+    noise_floor = float(np.percentile(energy, 10))
+    threshold = max(cfg["floor_db"], noise_floor + cfg["margin_db"])
+    runs = _runs(energy > threshold)
+
+    to_frames = lambda ms: int(ms / cfg["frame_ms"])
+    # Bridge short pauses, then drop short bursts
+    merged: List[List[int]] = []
+    for run in runs:
+        if merged and run[0] - merged[-1][1] < to_frames(cfg["min_silence_ms"]):
+            merged[-1][1] = run[1]
+        else:
+            merged.append(run)
+    merged = [r for r in merged if r[1] - r[0] >= to_frames(cfg["min_speech_ms"])]
+
+    pad = int(sample_rate * cfg["pad_ms"] / 1000)
+    regions: List[Region] = []
+    for start, end in merged:
+        s = max(0, start * frame - pad)
+        e = min(len(audio), end * frame + pad)
+        if regions and s <= regions[-1][1]:
+            regions[-1] = (regions[-1][0], e)
+        else:
+            regions.append((s, e))
+    return regions
+
+
+def compact_speech(
+    audio: np.ndarray,
+    regions: List[Region],
+    sample_rate: int = SAMPLE_RATE
+) -> Tuple[np.ndarray, TimeMap]:
+    """Concatenate speech regions and remember where each one came from"""
+    total = sum(e - s for s, e in regions)
+    compact = np.empty(total, dtype=audio.dtype)
+    time_map: TimeMap = []
+    pos = 0
+    for s, e in regions:
+        compact[pos:pos + e - s] = audio[s:e]
+        time_map.append((pos / sample_rate, s / sample_rate))
+        pos += e - s
+    return compact, time_map
+
+
+def map_time(t: float, time_map: TimeMap, is_end: bool = False) -> float:
+    """Convert a time on the compacted audio to the original timeline"""
+    starts = [c for c, _ in time_map]
+    # An end time that lands exactly on a boundary belongs to the earlier region
+    idx = bisect_right(starts, t - 1e-6 if is_end else t) - 1
+    idx = max(0, idx)
+    compact_start, orig_start = time_map[idx]
+    return orig_start + (t - compact_start)
+
+
+def map_segments(segments: List[Dict[str, Any]], time_map: TimeMap) -> List[Dict[str, Any]]:
+    """Rewrite segment (and word) timestamps onto the original timeline"""
+    for seg in segments:
+        seg["start"] = map_time(seg["start"], time_map)
+        seg["end"] = map_time(seg["end"], time_map, is_end=True)
+        for word in seg.get("words") or []:
+            word["start"] = map_time(word["start"], time_map)
+            word["end"] = map_time(word["end"], time_map, is_end=True)
+    return segments
+
+
+def transcribe_speech_only(
+    model: Any,
+    audio: np.ndarray,
+    vad_params: Optional[Dict[str, Any]] = None,
+    sample_rate: int = SAMPLE_RATE,
+    **options: Any
+) -> Tuple[Dict[str, Any], Dict[str, float]]:
+    """Run model.transcribe on speech regions only
+
+    Returns the Whisper result (timestamps on the original timeline) and
+    VAD statistics: total_s, speech_s, speech_ratio, regions.
+    """
+    regions = detect_speech(audio, sample_rate, **(vad_params or {}))
+    total_s = len(audio) / sample_rate
+    speech_s = sum(e - s for s, e in regions) / sample_rate
+    stats = {
+        "total_s": total_s,
+        "speech_s": speech_s,
+        "speech_ratio": speech_s / total_s if total_s else 0.0,
+        "regions": len(regions),
+    }
+    if not regions:
+        return {"text": "", "segments": [], "language": options.get("language")}, stats
+
+    compact, time_map = compact_speech(audio, regions, sample_rate)
+    result = model.transcribe(compact, **options)
+    result["segments"] = map_segments(result.get("segments", []), time_map)
+    return result, stats
+
+
+def describe_stats(stats: Dict[str, float]) -> str:
+    """One log line with the speech ratio and the audio skipped"""
+    skipped = stats["total_s"] - stats["speech_s"]
+    return (f"VAD: speech {stats['speech_ratio'] * 100:.1f}% "
+            f"({stats['speech_s'] / 60:.1f} of {stats['total_s'] / 60:.1f} min, "
+            f"{stats['regions']} regions), skipped {skipped / 60:.1f} min")
@@ -11,6 +11,50 @@ CYAN='\033[0;36m'
 WHITE='\033[1;37m'
 NC='\033[0m' # No Color
 
+# Resident server (python3 video-to-text.py --serve) keeps models warm
+VTT_SERVER_URL="${VTT_SERVER_URL:-http://127.0.0.1:8765}"
+
+# Function to check if the transcription server is running
+server_available() {
+    command -v curl &> /dev/null && curl -sf "$VTT_SERVER_URL/health" &> /dev/null
+}
+
+# Function to submit a job to the server and wait for it
+submit_to_server() {
+    local file_path
+    file_path="$(realpath "$1")"
+    local model="$2"
+    local language="$3"
+    local output_format="$4"
+    
+    local response
+    response=$(curl -sf \
+        --data-urlencode "path=$file_path" \
+        --data-urlencode "model=$model" \
+        --data-urlencode "language=$language" \
+        --data-urlencode "format=$output_format" \
+        "$VTT_SERVER_URL/jobs")
+    local job_id
+    job_id=$(echo "$response" | sed -n 's/.*"id": *"\([^"]*\)".*/\1/p')
+    
+    if [ -z "$job_id" ]; then
+        echo -e "${RED}✗ Serverul a refuzat jobul${NC}"
+        return 1
+    fi
+    
+    echo -e "${CYAN}Job trimis la server: $job_id${NC}"
+    local status=""
+    while true; do
+        sleep 2
+        status=$(curl -sf "$VTT_SERVER_URL/jobs/$job_id" | sed -n 's/.*"status": *"\([^"]*\)".*/\1/p')
+        case "$status" in
+            done) return 0 ;;
+            failed|"") return 1 ;;
+            *) echo -ne "\r${CYAN}Stare job: $status...${NC}   " ;;
+        esac
+    done
+}
+
 # Function to display banner
 show_banner() {
     echo ""
@@ -322,9 +366,10 @@ select_language() {
     echo -e "${WHITE}  7. Portugheză (pt)${NC}"
     echo -e "${WHITE}  8. Rusă (ru)${NC}"
     echo -e "${WHITE}  9. Altă limbă (cod personalizat)${NC}"
+    echo -e "${WHITE}  0. Detectare automată (auto)${NC}"
     echo ""
     
-    read -p "Alegeți limba (1-9, default: 1): " choice
+    read -p "Alegeți limba (0-9, default: 1): " choice
     
     if [ -z "$choice" ]; then
         choice="1"
@@ -339,6 +384,7 @@ select_language() {
         6) echo "it" ;;
         7) echo "pt" ;;
         8) echo "ru" ;;
+        0) echo "auto" ;;
         9)
             read -p "Introduceți codul limbii (ex: pl, nl, uk): " custom_lang
             echo "$custom_lang"
@@ -420,8 +466,13 @@ process_transcription() {
     echo -e "${CYAN}  - Performanța calculatorului${NC}"
     echo ""
     
-    # Run Python script
-    python3 "$python_script" "$file_path" "$model" "$language" "$output_format"
+    # Use the resident server when it is running, otherwise start Python
+    if server_available; then
+        echo -e "${GREEN}Server de transcriere activ ($VTT_SERVER_URL) - modelul este deja încărcat${NC}"
+        submit_to_server "$file_path" "$model" "$language" "$output_format"
+    else
+        python3 "$python_script" "$file_path" "$model" "$language" "$output_format"
+    fi
     
     if [ $? -eq 0 ]; then
         echo ""
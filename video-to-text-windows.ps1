@@ -11,6 +11,61 @@ $InfoColor = "Cyan"
 $WarningColor = "Yellow"
 $PromptColor = "White"
 
+# Resident server (python video-to-text.py --serve) keeps models warm
+$ServerUrl = if ($env:VTT_SERVER_URL) { $env:VTT_SERVER_URL } else { "http://127.0.0.1:8765" }
+
+# Function to check if the transcription server is running
+function Test-TranscriptionServer {
+    try {
+        $health = Invoke-RestMethod -Uri "$ServerUrl/health" -TimeoutSec 2
+        return $health.status -eq "ok"
+    } catch {
+        return $false
+    }
+}
+
+# Function to submit a job to the server and wait for it
+function Submit-ServerJob {
+    param(
+        [string]$FilePath,
+        [string]$Model,
+        [string]$Language,
+        [string]$OutputFormat
+    )
+    
+    $body = @{
+        path     = (Resolve-Path $FilePath).Path
+        model    = $Model
+        language = $Language
+        format   = $OutputFormat
+    } | ConvertTo-Json
+    
+    try {
+        $job = Invoke-RestMethod -Uri "$ServerUrl/jobs" -Method Post -Body $body -ContentType "application/json"
+    } catch {
+        Write-Host "✗ Serverul a refuzat jobul: $_" -ForegroundColor $ErrorColor
+        return $false
+    }
+    
+    Write-Host "Job trimis la server: $($job.id)" -ForegroundColor $InfoColor
+    while ($true) {
+        Start-Sleep -Seconds 2
+        try {
+            $state = Invoke-RestMethod -Uri "$ServerUrl/jobs/$($job.id)"
+        } catch {
+            return $false
+        }
+        switch ($state.status) {
+            "done"   { return $true }
+            "failed" {
+                Write-Host "✗ $($state.error)" -ForegroundColor $ErrorColor
+                return $false
+            }
+            default  { Write-Host "`rStare job: $($state.status)...   " -NoNewline -ForegroundColor $InfoColor }
+        }
+    }
+}
+
 # Function to display banner
 function Show-Banner {
     Write-Host ""
@@ -203,9 +258,10 @@ function Select-Language {
     Write-Host "  7. Portugheză (pt)" -ForegroundColor $PromptColor
     Write-Host "  8. Rusă (ru)" -ForegroundColor $PromptColor
     Write-Host "  9. Altă limbă (cod personalizat)" -ForegroundColor $PromptColor
+    Write-Host "  0. Detectare automată (auto)" -ForegroundColor $PromptColor
     Write-Host ""
     
-    $choice = Read-Host "Alegeți limba (1-9, default: 1)"
+    $choice = Read-Host "Alegeți limba (0-9, default: 1)"
     
     if ([string]::IsNullOrWhiteSpace($choice)) {
         $choice = "1"
@@ -220,6 +276,7 @@ function Select-Language {
         "6" { return "it" }
         "7" { return "pt" }
         "8" { return "ru" }
+        "0" { return "auto" }
         "9" {
             $customLang = Read-Host "Introduceți codul limbii (ex: pl, nl, uk)"
             return $customLang
@@ -306,11 +363,17 @@ function Start-Transcription {
     Write-Host "  - Performanța calculatorului" -ForegroundColor $InfoColor
     Write-Host ""
     
-    # Run Python script
+    # Use the resident server when it is running, otherwise start Python
     try {
-        python $pythonScript $FilePath $Model $Language $OutputFormat
+        if (Test-TranscriptionServer) {
+            Write-Host "Server de transcriere activ ($ServerUrl) - modelul este deja încărcat" -ForegroundColor $SuccessColor
+            $ok = Submit-ServerJob -FilePath $FilePath -Model $Model -Language $Language -OutputFormat $OutputFormat
+        } else {
+            python $pythonScript $FilePath $Model $Language $OutputFormat
+            $ok = ($LASTEXITCODE -eq 0)
+        }
         
-        if ($LASTEXITCODE -eq 0) {
+        if ($ok) {
             Write-Host ""
             Write-Host "✓ TRANSCRIERE COMPLETĂ CU SUCCES!" -ForegroundColor $SuccessColor
             Write-Host ""
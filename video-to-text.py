@@ -7,11 +7,18 @@ Supports MP4, MKV, AVI, MOV, FLV, WMV, WebM and audio formats
 
 import os
 import sys
+import argparse
+import importlib.util
 import subprocess
 import warnings
 import logging
+import multiprocessing
+from datetime import timedelta
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import TYPE_CHECKING, Optional, Dict, Any, Union
+
+if TYPE_CHECKING:
+    import numpy as np
 
 # Suppress whisper warnings
 warnings.filterwarnings(
@@ -21,15 +28,19 @@ warnings.filterwarnings(
     module="whisper.transcribe"
 )
 
-# Core dependencies
-try:
-    import whisper
-    import srt
-    from datetime import timedelta
-except ImportError as e:
-    print(f"ERROR: Missing essential library: {e}")
-    print("Install with: pip install openai-whisper srt")
-    sys.exit(1)
+# Core dependencies are imported lazily: --help, argument validation and
+# subtitle post-processing must not pay for loading torch
+ESSENTIAL_MODULES = ["whisper", "srt", "numpy"]
+
+from model_registry import get_model, registry, backend_dtype, set_torch_threads, BACKENDS, DEFAULT_BACKEND
+from audio_io import load_audio, probe_duration, AudioDecodeError, SAMPLE_RATE
+from chunking import transcribe_chunked, DEFAULT_WINDOW_S, DEFAULT_OVERLAP_S
+from transcript_cache import TranscriptCache, cache_key, content_hash, DEFAULT_CACHE_DIR
+from transcription_server import JobServer, DEFAULT_HOST, DEFAULT_PORT
+from language_detect import AUTO, detect_file_language
+from instrumentation import RunReport, measure, record
+from progress import BatchProgress, whisper_progress
+from subtitle_engine import merge_segments, pack_words, MIN_CHARS, MAX_CHARS, SUBTITLE_GAP_MS
 
 VERSION = "2.0-video"
 
@@ -61,6 +72,16 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def check_dependencies() -> bool:
+    """Check that the ML stack is installed without importing it"""
+    missing = [m for m in ESSENTIAL_MODULES if importlib.util.find_spec(m) is None]
+    if missing:
+        print(f"ERROR: Missing essential library: {', '.join(missing)}")
+        print("Install with: pip install openai-whisper srt")
+        return False
+    return True
+
+
 def check_ffmpeg() -> bool:
     """Check if ffmpeg is available"""
     try:
@@ -73,61 +94,73 @@ def check_ffmpeg() -> bool:
         return False
 
 
-def extract_audio_from_video(video_path: Path, output_audio: Path) -> bool:
-    """Extract audio from video file using ffmpeg"""
-    logger.info(f"Extracting audio from video: {video_path.name}")
+def extract_audio_from_video(video_path: Path) -> Optional["np.ndarray"]:
+    """Decode the audio track of a media file to 16 kHz mono PCM in memory"""
+    logger.info(f"Extracting audio: {video_path.name}")
     
     try:
-        cmd = [
-            "ffmpeg", "-i", str(video_path),
-            "-vn",  # No video
-            "-acodec", "pcm_s16le",  # PCM audio codec
-            "-ar", "16000",  # Sample rate for Whisper
-            "-ac", "1",  # Mono
-            "-y",  # Overwrite output
-            str(output_audio)
-        ]
+        audio = load_audio(video_path)
+        logger.info(f"Audio extracted successfully: {len(audio) / SAMPLE_RATE:.1f}s")
+        return audio
         
-        result = subprocess.run(
-            cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            check=True
-        )
-        
-        logger.info(f"Audio extracted successfully: {output_audio.name}")
-        return True
-        
-    except subprocess.CalledProcessError as e:
-        logger.error(f"Failed to extract audio: {e.stderr.decode()}")
-        return False
+    except AudioDecodeError as e:
+        logger.error(f"Failed to extract audio: {e}")
+        return None
 
 
 def transcribe_with_whisper(
-    audio_path: Path,
+    audio: Union[Path, "np.ndarray"],
     model_type: str = "small",
-    language: str = "ro"
+    language: str = "ro",
+    label: str = "",
+    vad: bool = False,
+    word_timestamps: bool = False,
+    backend: str = DEFAULT_BACKEND
 ) -> Optional[Dict]:
-    """Transcribe audio using Whisper AI"""
+    """Transcribe audio using Whisper AI (speech regions only when vad is set)"""
     
-    logger.info(f"Loading Whisper model: {model_type}")
+    logger.info(f"Whisper model: {model_type} ({backend})")
     logger.info(f"Language: {language}")
     
     try:
-        # Load Whisper model
-        model = whisper.load_model(model_type)
+        # Load Whisper model (reused if already resident in this process)
+        model = get_model(MODEL_MAPPING[model_type], dtype=backend_dtype(backend))
         
-        logger.info(f"Transcribing: {audio_path.name}")
+        name = label or getattr(audio, 'name', 'audio')
+        logger.info(f"Transcribing: {name}")
         logger.info("This may take a few minutes depending on file length and model size...")
         
-        # Transcribe
-        result = model.transcribe(
-            str(audio_path),
-            language=language,
-            task="transcribe",
-            verbose=False
-        )
+        # Live progress with an ETA from the real-time factor measured so far
+        duration = probe_duration(audio) if isinstance(audio, (str, Path)) else len(audio) / SAMPLE_RATE
+        progress = BatchProgress({name: duration})
+        
+        def on_progress(fraction: float):
+            progress.update(name, fraction)
+            logger.info(f"Progress: {progress.percent()}% ({progress.describe()})")
         
+        # Transcribe (verbose=None: the progress lines above replace Whisper's bar)
+        with whisper_progress(on_progress):
+            if vad and not isinstance(audio, (str, Path)):
+                from vad import transcribe_speech_only, describe_stats
+                result, stats = transcribe_speech_only(
+                    model, audio,
+                    language=language,
+                    task="transcribe",
+                    verbose=None,
+                    word_timestamps=word_timestamps
+                )
+                logger.info(describe_stats(stats))
+            else:
+                result = model.transcribe(
+                    str(audio) if isinstance(audio, (str, Path)) else audio,
+                    language=language,
+                    task="transcribe",
+                    verbose=None,
+                    word_timestamps=word_timestamps
+                )
+        
+        # Word timings are kept in compact form (cache, subtitle splitting)
+        pack_words(result.get("segments", []))
         logger.info("Transcription completed successfully")
         return result
         
@@ -136,8 +169,44 @@ def transcribe_with_whisper(
         return None
 
 
+def transcribe_long_media(
+    input_file: Path,
+    model_type: str = "small",
+    language: str = "ro",
+    chunk_seconds: float = DEFAULT_WINDOW_S,
+    chunk_overlap: float = DEFAULT_OVERLAP_S,
+    workers: int = 1,
+    vad: bool = False,
+    word_timestamps: bool = False,
+    backend: str = DEFAULT_BACKEND
+) -> Optional[Dict]:
+    """Transcribe in overlapping windows, optionally across worker processes"""
+    logger.info(f"Chunked transcription: {chunk_seconds:.0f}s windows, "
+                f"{chunk_overlap:.0f}s overlap, {workers} worker(s)")
+    
+    try:
+        result = transcribe_chunked(
+            input_file,
+            MODEL_MAPPING[model_type],
+            language,
+            window_s=chunk_seconds,
+            overlap_s=chunk_overlap,
+            workers=workers,
+            vad_params={} if vad else None,
+            dtype=backend_dtype(backend),
+            word_timestamps=word_timestamps
+        )
+        logger.info(f"Transcription completed successfully ({len(result['segments'])} segments)")
+        return result
+        
+    except Exception as e:
+        logger.error(f"Transcription error: {e}")
+        return None
+
+
 def save_as_srt(segments: list, output_path: Path) -> bool:
     """Save transcription segments as SRT file"""
+    import srt
     try:
         srt_entries = []
         
@@ -181,65 +250,25 @@ def save_as_txt(segments: list, output_path: Path) -> bool:
         return False
 
 
-def optimize_subtitles(input_srt: Path, output_srt: Path, min_chars: int = 80, max_chars: int = 120) -> bool:
-    """Optimize subtitles by merging short ones and splitting long ones"""
+def optimize_subtitles(
+    segments: list,
+    output_srt: Path,
+    min_chars: int = MIN_CHARS,
+    max_chars: int = MAX_CHARS,
+    gap_ms: int = SUBTITLE_GAP_MS
+) -> bool:
+    """Merge short segments, split long ones and write the final SRT"""
     logger.info("Optimizing subtitles...")
     
     try:
-        # Try to use the existing merge_short_subs.py if available
-        merge_script = Path(__file__).parent / "merge_short_subs.py"
-        
-        if merge_script.exists():
-            logger.info("Using advanced subtitle optimizer (merge_short_subs.py)")
-            result = subprocess.run(
-                [sys.executable, str(merge_script), str(input_srt), str(output_srt)],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
-            )
-            
-            if result.returncode == 0:
-                logger.info("Subtitles optimized successfully")
-                return True
-            else:
-                logger.warning("Advanced optimizer failed, using basic optimization")
-        
-        # Basic optimization fallback
-        import pysrt
-        subs = pysrt.open(str(input_srt), encoding='utf-8')
-        
-        optimized = []
-        temp_text = ""
-        start_time = None
-        
-        for sub in subs:
-            if not temp_text:
-                start_time = sub.start
-            
-            temp_text += " " + sub.text.strip() if temp_text else sub.text.strip()
-            
-            if len(temp_text) >= min_chars or sub == subs[-1]:
-                # Save this subtitle
-                optimized.append(pysrt.SubRipItem(
-                    index=len(optimized) + 1,
-                    start=start_time,
-                    end=sub.end,
-                    text=temp_text[:max_chars] if len(temp_text) > max_chars else temp_text
-                ))
-                temp_text = ""
-                start_time = None
-        
-        result_file = pysrt.SubRipFile(optimized)
-        result_file.save(str(output_srt), encoding='utf-8')
-        
-        logger.info(f"Basic optimization complete: {len(subs)} -> {len(optimized)} subtitles")
-        return True
-        
+        optimized = merge_segments(segments, min_chars, max_chars, gap_ms)
+        logger.info(f"Subtitles optimized: {len(segments)} -> {len(optimized)} subtitles")
     except Exception as e:
+        # If optimization fails, keep the original segments
         logger.error(f"Subtitle optimization failed: {e}")
-        # If optimization fails, just copy the original
-        import shutil
-        shutil.copy(input_srt, output_srt)
-        return False
+        return save_as_srt(segments, output_srt)
+    
+    return save_as_srt(optimized, output_srt)
 
 
 def process_file(
@@ -247,9 +276,63 @@ def process_file(
     model_type: str = "small",
     language: str = "ro",
     output_format: str = "srt",
-    optimize: bool = True
+    optimize: bool = True,
+    chunk_seconds: float = 0,
+    chunk_overlap: float = DEFAULT_OVERLAP_S,
+    workers: int = 1,
+    vad: bool = False,
+    use_cache: bool = True,
+    cache_dir: Optional[Path] = None,
+    word_timestamps: bool = False,
+    backend: str = DEFAULT_BACKEND,
+    report_path: Optional[Path] = None
+) -> bool:
+    """Main processing function for video or audio file
+    
+    With report_path set, per-stage timings are written there (.json or .csv).
+    """
+    job: Dict[str, Any] = {"file": str(input_file)}
+    report = RunReport("video-to-text", {
+        "model": model_type, "language": language, "backend": backend, "vad": vad,
+        "chunk_seconds": chunk_seconds, "workers": workers, "word_timestamps": word_timestamps,
+    }) if report_path else None
+    
+    success = _process_file(
+        job, input_file, model_type, language, output_format, optimize,
+        chunk_seconds, chunk_overlap, workers, vad, use_cache, cache_dir,
+        word_timestamps, backend
+    )
+    
+    if report is not None:
+        if "audio_s" not in job and input_file.exists():
+            job["audio_s"] = probe_duration(input_file)
+        report.add_file(str(input_file), "completed" if success else "failed",
+                        job.get("metrics"), job.get("audio_s"))
+        report.add_model_loads(registry.load_log)
+        try:
+            logger.info(f"Run report saved: {report.write(report_path)}")
+        except OSError as e:
+            logger.warning(f"Could not write run report: {e}")
+    return success
+
+
+def _process_file(
+    job: Dict[str, Any],
+    input_file: Path,
+    model_type: str,
+    language: str,
+    output_format: str,
+    optimize: bool,
+    chunk_seconds: float,
+    chunk_overlap: float,
+    workers: int,
+    vad: bool,
+    use_cache: bool,
+    cache_dir: Optional[Path],
+    word_timestamps: bool,
+    backend: str
 ) -> bool:
-    """Main processing function for video or audio file"""
+    """process_file body; stage measurements are recorded on job"""
     
     if not input_file.exists():
         logger.error(f"Input file not found: {input_file}")
@@ -270,84 +353,263 @@ def process_file(
     output_dir = input_file.parent
     base_name = input_file.stem
     
-    # Extract audio if video file
-    if is_video:
-        if not check_ffmpeg():
-            logger.error("ffmpeg not found. Please install ffmpeg to process video files.")
-            return False
-        
-        audio_file = output_dir / f"{base_name}_audio.wav"
-        if not extract_audio_from_video(input_file, audio_file):
+    if not check_ffmpeg():
+        logger.error("ffmpeg not found. Please install ffmpeg to process media files.")
+        return False
+    
+    cache = TranscriptCache(cache_dir) if use_cache else None
+    if language == AUTO:
+        # Detected once on a short sample; the whole file is then decoded in that language
+        try:
+            with measure() as m:
+                language, prob = detect_file_language(
+                    input_file,
+                    lambda: get_model(MODEL_MAPPING[model_type], dtype=backend_dtype(backend)),
+                    MODEL_MAPPING[model_type],
+                    cache
+                )
+            record(job, "detect_language", m)
+        except Exception as e:
+            logger.error(f"Language detection failed: {e}")
             return False
-    else:
-        audio_file = input_file
+        logger.info(f"Detected language: {language} ({prob * 100:.0f}%)")
     
-    # Transcribe with Whisper
-    result = transcribe_with_whisper(audio_file, model_type, language)
+    # Identical media + settings were transcribed before: reuse raw segments
+    result = None
+    key = None
+    if cache is not None:
+        options = {"task": "transcribe", "vad": vad, "word_timestamps": word_timestamps}
+        if backend != DEFAULT_BACKEND:
+            options["backend"] = backend
+        if chunk_seconds > 0:
+            options.update(chunk_seconds=chunk_seconds, chunk_overlap=chunk_overlap)
+        try:
+            with measure() as m:
+                key = cache_key(content_hash(input_file), MODEL_MAPPING[model_type], language, options)
+                result = cache.get(key)
+            record(job, "cache_lookup", m)
+        except OSError as e:
+            logger.warning(f"Transcript cache unavailable: {e}")
+        if result is not None:
+            logger.info(f"Cache hit: reusing {len(result['segments'])} segments, "
+                        "skipping decoding and transcription")
     
-    if not result:
-        # Clean up temporary audio
-        if is_video and audio_file.exists():
-            audio_file.unlink()
-        return False
+    if result is None:
+        if chunk_seconds > 0:
+            # Long media: stream fixed windows so memory stays flat (decoding included)
+            with measure() as m:
+                result = transcribe_long_media(input_file, model_type, language,
+                                               chunk_seconds, chunk_overlap, workers, vad,
+                                               word_timestamps, backend)
+            record(job, "transcribe", m)
+        else:
+            # Decode audio straight into memory (no temporary WAV)
+            with measure() as m:
+                audio = extract_audio_from_video(input_file)
+            record(job, "decode", m)
+            if audio is None:
+                return False
+            job["audio_s"] = len(audio) / SAMPLE_RATE
+            
+            # Transcribe with Whisper (model load included on first use)
+            with measure() as m:
+                result = transcribe_with_whisper(audio, model_type, language,
+                                                 label=input_file.name, vad=vad,
+                                                 word_timestamps=word_timestamps, backend=backend)
+            record(job, "transcribe", m)
+            del audio
+        
+        if not result:
+            return False
+        
+        if key is not None:
+            try:
+                cache.put(key, result, {"source": str(input_file), "model": model_type, "language": language})
+            except OSError as e:
+                logger.warning(f"Could not store transcript in cache: {e}")
     
     # Save output
     success = False
     
     if output_format == "srt" or output_format == "all":
-        raw_srt = output_dir / f"{base_name}_raw.srt"
-        if save_as_srt(result['segments'], raw_srt):
+        # Optimized in memory: no intermediate _raw.srt, no extra process
+        final_srt = output_dir / f"{base_name}.srt"
+        with measure() as m:
             if optimize:
-                final_srt = output_dir / f"{base_name}.srt"
-                optimize_subtitles(raw_srt, final_srt)
-                # Remove raw file if optimization succeeded
-                if final_srt.exists():
-                    raw_srt.unlink()
+                saved = optimize_subtitles(result['segments'], final_srt)
+            else:
+                saved = save_as_srt(result['segments'], final_srt)
+        record(job, "postprocess_srt", m)
+        if saved:
             success = True
     
     if output_format == "txt" or output_format == "all":
         txt_file = output_dir / f"{base_name}.txt"
-        if save_as_txt(result['segments'], txt_file):
+        with measure() as m:
+            saved = save_as_txt(result['segments'], txt_file)
+        record(job, "write_txt", m)
+        if saved:
             success = True
     
-    # Clean up temporary audio file
-    if is_video and audio_file.exists():
-        audio_file.unlink()
-        logger.info("Temporary audio file removed")
-    
     return success
 
 
+def configure_threads(threads: int = 0, interop_threads: int = 0):
+    """Apply --threads/--interop-threads (0 leaves torch's defaults)"""
+    if threads > 0 or interop_threads > 0:
+        set_torch_threads(threads or (os.cpu_count() or 1), interop_threads)
+
+
+def check_language(language: str):
+    """Same rule for the CLI and the server: unlisted codes are passed to Whisper with a warning"""
+    if language != AUTO and language not in VALID_LANGUAGES:
+        logger.warning(f"Language '{language}' not in validated list, but will try anyway")
+
+
+def _flag(value: Any) -> bool:
+    """Boolean job parameter from JSON or form data"""
+    if isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "yes", "on")
+    return bool(value)
+
+
+def serve(
+    host: str,
+    port: int,
+    use_cache: bool = True,
+    cache_dir: Optional[Path] = None,
+    default_backend: str = DEFAULT_BACKEND
+):
+    """Resident mode: keep models warm and take jobs over a local HTTP API"""
+    
+    def validate_job(params: Dict[str, Any]):
+        """Reject bad parameters at submit time (HTTP 400) instead of failing the job later"""
+        model_type = params.get("model") or "small"
+        language = params.get("language") or "ro"
+        backend = params.get("backend") or default_backend
+        if model_type not in MODEL_MAPPING:
+            raise ValueError(f"Invalid model: {model_type}")
+        check_language(language)
+        if backend not in BACKENDS:
+            raise ValueError(f"Invalid backend: {backend}")
+    
+    def run_job(params: Dict[str, Any]) -> Dict[str, str]:
+        # Already checked by validate_job on submit
+        input_file = Path(params["path"])
+        model_type = params.get("model") or "small"
+        language = params.get("language") or "ro"
+        output_format = params.get("format") or "srt"
+        backend = params.get("backend") or default_backend
+        
+        ok = process_file(
+            input_file, model_type, language, output_format, optimize=True,
+            chunk_seconds=float(params.get("chunk_seconds") or 0),
+            chunk_overlap=float(params.get("chunk_overlap") or DEFAULT_OVERLAP_S),
+            workers=int(params.get("workers") or 1),
+            vad=_flag(params.get("vad", False)),
+            use_cache=use_cache,
+            cache_dir=cache_dir,
+            word_timestamps=_flag(params.get("word_timestamps", False)),
+            backend=backend
+        )
+        if not ok:
+            raise RuntimeError("Processing failed, see server log")
+        
+        outputs = {}
+        for kind in ("srt", "txt"):
+            out = input_file.parent / f"{input_file.stem}.{kind}"
+            if output_format in (kind, "all") and out.exists():
+                outputs[kind] = str(out)
+        return outputs
+    
+    JobServer(run_job, VERSION, validate_fn=validate_job).serve(host, port)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Command line arguments (positional order kept for the shell wrappers)"""
+    parser = argparse.ArgumentParser(
+        prog="video-to-text.py",
+        description=f"Video/Audio to Text Transcription {VERSION} - Powered by Whisper AI",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="\n".join([
+            "Examples:",
+            "  python video-to-text.py video.mp4",
+            "  python video-to-text.py video.mp4 small ro srt",
+            "  python video-to-text.py audio.mp3 base en txt",
+            "  python video-to-text.py conference.mkv small en srt --chunk-seconds 300 --workers 4",
+            "  python video-to-text.py --serve --port 8765",
+            "",
+            "Supported video formats:",
+            "  " + ", ".join(VIDEO_EXTENSIONS),
+            "",
+            "Supported audio formats:",
+            "  " + ", ".join(AUDIO_EXTENSIONS),
+        ])
+    )
+    parser.add_argument("input_file", type=Path, nargs="?", help="Video or audio file path")
+    parser.add_argument("model", nargs="?", default="small",
+                        help="tiny, base, small, medium, large-v3, turbo (default: small)")
+    parser.add_argument("language", nargs="?", default="ro",
+                        help="ro, en, fr, de, es, it, pt, etc. or auto to detect it (default: ro)")
+    parser.add_argument("format", nargs="?", default="srt",
+                        help="srt, txt, all (default: srt)")
+    parser.add_argument("--chunk-seconds", type=float, default=0,
+                        help="Transcribe in windows of this many seconds to keep memory flat "
+                             f"on long media, e.g. {DEFAULT_WINDOW_S:.0f} (default: off)")
+    parser.add_argument("--chunk-overlap", type=float, default=DEFAULT_OVERLAP_S,
+                        help=f"Overlap between windows in seconds (default: {DEFAULT_OVERLAP_S:.0f})")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes for chunked mode (default: 1)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Always re-transcribe, ignoring the transcript cache")
+    parser.add_argument("--cache-dir", type=Path, default=None,
+                        help=f"Transcript cache directory (default: {DEFAULT_CACHE_DIR})")
+    parser.add_argument("--serve", action="store_true",
+                        help="Run as a resident server with warm models and a local HTTP job API")
+    parser.add_argument("--host", default=DEFAULT_HOST,
+                        help=f"Server bind address (default: {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT,
+                        help=f"Server port (default: {DEFAULT_PORT})")
+    parser.add_argument("--vad", action="store_true",
+                        help="Skip silence and music: only transcribe detected speech regions")
+    parser.add_argument("--word-timestamps", action="store_true",
+                        help="Ask Whisper for word timings and split subtitles on real word "
+                             "boundaries (slower inference, tighter sync)")
+    parser.add_argument("--report", type=Path, default=None,
+                        help="Write per-stage timings (wall, CPU, peak RSS, real-time factor) "
+                             "to this .json or .csv file")
+    parser.add_argument("--backend", choices=list(BACKENDS), default=DEFAULT_BACKEND,
+                        help="Inference backend: torch (fp32) or torch-int8 "
+                             f"(dynamically quantized, CPU only) (default: {DEFAULT_BACKEND})")
+    parser.add_argument("--threads", type=int, default=0,
+                        help="Torch intra-op threads (default: torch's own choice)")
+    parser.add_argument("--interop-threads", type=int, default=0,
+                        help="Torch inter-op threads (default: torch's own choice)")
+    return parser
+
+
 def main():
     """Command line interface"""
+    parser = build_parser()
     if len(sys.argv) < 2:
-        print(f"Video/Audio to Text Transcription {VERSION}")
-        print("Powered by Whisper AI")
-        print()
-        print("Usage: python video-to-text.py <input_file> [model] [language] [format]")
-        print()
-        print("Arguments:")
-        print("  input_file : Video or audio file path")
-        print("  model      : tiny, base, small, medium, large-v3, turbo (default: small)")
-        print("  language   : ro, en, fr, de, es, it, pt, etc. (default: ro)")
-        print("  format     : srt, txt, all (default: srt)")
-        print()
-        print("Examples:")
-        print("  python video-to-text.py video.mp4")
-        print("  python video-to-text.py video.mp4 small ro srt")
-        print("  python video-to-text.py audio.mp3 base en txt")
-        print()
-        print("Supported video formats:")
-        print(" ", ", ".join(VIDEO_EXTENSIONS))
-        print()
-        print("Supported audio formats:")
-        print(" ", ", ".join(AUDIO_EXTENSIONS))
+        parser.print_help()
         sys.exit(1)
     
-    input_file = Path(sys.argv[1])
-    model_type = sys.argv[2] if len(sys.argv) > 2 else "small"
-    language = sys.argv[3] if len(sys.argv) > 3 else "ro"
-    output_format = sys.argv[4] if len(sys.argv) > 4 else "srt"
+    args = parser.parse_args()
+    if args.serve:
+        if not check_dependencies():
+            sys.exit(1)
+        configure_threads(args.threads, args.interop_threads)
+        serve(args.host, args.port, use_cache=not args.no_cache, cache_dir=args.cache_dir,
+              default_backend=args.backend)
+        sys.exit(0)
+    if args.input_file is None:
+        parser.error("input_file is required")
+    
+    input_file = args.input_file
+    model_type = args.model
+    language = args.language
+    output_format = args.format
     
     # Validate inputs
     if model_type not in MODEL_MAPPING:
@@ -355,8 +617,11 @@ def main():
         logger.error(f"Valid models: {', '.join(MODEL_MAPPING.keys())}")
         sys.exit(1)
     
-    if language not in VALID_LANGUAGES:
-        logger.warning(f"Language '{language}' not in validated list, but will try anyway")
+    check_language(language)
+    
+    if not check_dependencies():
+        sys.exit(1)
+    configure_threads(args.threads, args.interop_threads)
     
     logger.info("=" * 60)
     logger.info(f"Video/Audio to Text Transcription {VERSION}")
@@ -365,9 +630,21 @@ def main():
     logger.info(f"Model: {model_type}")
     logger.info(f"Language: {language}")
     logger.info(f"Output format: {output_format}")
+    logger.info(f"Backend: {args.backend}")
     logger.info("=" * 60)
     
-    success = process_file(input_file, model_type, language, output_format, optimize=True)
+    success = process_file(
+        input_file, model_type, language, output_format, optimize=True,
+        chunk_seconds=args.chunk_seconds,
+        chunk_overlap=args.chunk_overlap,
+        workers=args.workers,
+        vad=args.vad,
+        use_cache=not args.no_cache,
+        cache_dir=args.cache_dir,
+        word_timestamps=args.word_timestamps,
+        backend=args.backend,
+        report_path=args.report
+    )
     
     if success:
         logger.info("=" * 60)
@@ -382,4 +659,5 @@ def main():
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     main()